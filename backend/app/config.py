@@ -0,0 +1,146 @@
+"""
+Runtime configuration for the backend.
+
+Values are read from environment variables (see ``config/.env.*``) so the same
+image can be tuned per deployment without code changes.
+"""
+import os
+import tempfile
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back to ``default``."""
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to ``default``."""
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable (1/true/yes/on), falling back to ``default``."""
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Micro-batching: concurrent requests are collected for up to BATCH_MAX_WAIT_MS
+# (or until BATCH_MAX_SIZE requests are queued) and run as a single forward pass.
+BATCHING_ENABLED = _env_bool("BATCHING_ENABLED", True)
+BATCH_MAX_SIZE = _env_int("BATCH_MAX_SIZE", 8)
+BATCH_MAX_WAIT_MS = _env_float("BATCH_MAX_WAIT_MS", 5.0)
+
+# Inference executor: the blocking prediction pipeline runs on a bounded thread
+# pool. Keep INFERENCE_WORKERS >= BATCH_MAX_SIZE so batches can actually fill;
+# requests beyond INFERENCE_MAX_PENDING are rejected with 503.
+INFERENCE_WORKERS = _env_int("INFERENCE_WORKERS", BATCH_MAX_SIZE)
+INFERENCE_MAX_PENDING = _env_int("INFERENCE_MAX_PENDING", 64)
+
+# Compiled inference: a traced tf.function with a fixed input signature is built
+# per batch size at load time (optionally XLA-compiled) and used instead of
+# model.predict. Batches are padded up to the nearest compiled size.
+COMPILED_INFERENCE = _env_bool("COMPILED_INFERENCE", True)
+XLA_COMPILE = _env_bool("XLA_COMPILE", False)
+INFERENCE_BATCH_SIZES = tuple(
+    int(size) for size in os.getenv("INFERENCE_BATCH_SIZES", "1,2,4,8").split(",") if size.strip()
+)
+
+# Model loading: "background" binds the port immediately and loads the model on
+# a background thread at startup, "lazy" loads on the first inference request,
+# "eager" loads before the app starts serving. Inference requests wait up to
+# MODEL_READY_TIMEOUT seconds for the model (0 rejects them immediately).
+MODEL_LOAD_MODE = os.getenv("MODEL_LOAD_MODE", "background")
+MODEL_READY_TIMEOUT = _env_float("MODEL_READY_TIMEOUT", 30.0)
+
+# Health: a background thread runs the dummy-image probe every
+# HEALTH_CHECK_INTERVAL seconds and /health serves the cached result.
+HEALTH_CHECK_INTERVAL = _env_float("HEALTH_CHECK_INTERVAL", 30.0)
+
+# Model registry: models named in requests are loaded on demand from the model
+# directory and kept resident under MODEL_MEMORY_BUDGET_MB (LRU eviction).
+MODEL_MEMORY_BUDGET_MB = _env_float("MODEL_MEMORY_BUDGET_MB", 2048.0)
+
+# Hot reload: poll MODEL_PATH every MODEL_WATCH_INTERVAL seconds (0 disables) and
+# swap in a changed model without downtime. POST /admin/model/reload triggers a
+# reload on demand; admin endpoints require the X-Admin-Token header to match
+# ADMIN_TOKEN and are disabled when it is unset.
+MODEL_WATCH_INTERVAL = _env_float("MODEL_WATCH_INTERVAL", 0.0)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Inference backend: "keras" (default), "tflite" or "onnx" to serve a model
+# exported by scripts/utilities/export_tflite.py or export_onnx.py. The TFLite
+# and ONNX backends do not import TensorFlow (TFLite needs ai_edge_litert or
+# tflite_runtime for that). Model paths default to <model>_float16.tflite and
+# <model>.onnx next to MODEL_PATH; a thread count of 0 uses all cores.
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "keras")
+TFLITE_MODEL_PATH = os.getenv("TFLITE_MODEL_PATH") or None
+TFLITE_NUM_THREADS = _env_int("TFLITE_NUM_THREADS", 0)
+ONNX_MODEL_PATH = os.getenv("ONNX_MODEL_PATH") or None
+ONNX_NUM_THREADS = _env_int("ONNX_NUM_THREADS", 0)
+
+# Inference mode: "resize" squashes the whole image to the model input size,
+# "tiled" runs overlapping TILE_SIZE tiles at native resolution (0 uses the
+# model input size, the only other accepted value) in batches of up to
+# TILE_BATCH_SIZE and blends them into a full-resolution mask. Requests can override the mode with inference_mode.
+INFERENCE_MODE = os.getenv("INFERENCE_MODE", "resize")
+TILE_SIZE = _env_int("TILE_SIZE", 0)
+TILE_OVERLAP = _env_int("TILE_OVERLAP", 32)
+TILE_BATCH_SIZE = _env_int("TILE_BATCH_SIZE", 16)
+
+# Eye-region pre-screen: locate the exposed eye from downsampled colour
+# statistics and run inference only on that crop (padded by EYE_CROP_MARGIN of
+# its size); the mask is zero outside it. Requests can override with eye_crop.
+EYE_CROP_ENABLED = _env_bool("EYE_CROP_ENABLED", False)
+EYE_CROP_MARGIN = _env_float("EYE_CROP_MARGIN", 0.1)
+
+# Result cache: encoded predictions are cached by a hash of the decoded pixels,
+# the model (name, version, reload generation) and the inference settings, up to
+# RESULT_CACHE_MAX_MB (LRU eviction, 0 disables) for RESULT_CACHE_TTL seconds.
+RESULT_CACHE_MAX_MB = _env_float("RESULT_CACHE_MAX_MB", 64.0)
+RESULT_CACHE_TTL = _env_float("RESULT_CACHE_TTL", 600.0)
+
+# Single-flight: concurrent requests for the same image and settings attach to
+# the inference already running instead of starting their own.
+SINGLE_FLIGHT_ENABLED = _env_bool("SINGLE_FLIGHT_ENABLED", True)
+
+# Request profiling: admins can send profile=true (with X-Admin-Token) on the
+# prediction endpoints to run that request under cProfile and, with the Keras
+# backend, the TensorFlow profiler (PROFILE_TF_TRACE). Profiles are stored in
+# PROFILE_DIR; one profiled request runs at a time, and only the newest
+# PROFILE_MAX_RUNS profiles are kept (0 keeps all).
+PROFILE_DIR = os.getenv("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "vessel-profiles")
+PROFILE_TF_TRACE = _env_bool("PROFILE_TF_TRACE", True)
+PROFILE_MAX_RUNS = _env_int("PROFILE_MAX_RUNS", 20)
+
+# Reduced-resolution decoding: in resize mode (without eye_crop) JPEG uploads are
+# decoded with DCT scaling at the smallest 1/2, 1/4 or 1/8 size that still covers
+# the model input, instead of decoding every pixel only to downsample it. Masks
+# are still returned at the original resolution.
+REDUCED_DECODE_ENABLED = _env_bool("REDUCED_DECODE_ENABLED", True)
+
+# Mask format: default wire format of returned masks ("png", "png_fast",
+# "png_1bit", "rle", "packbits" or "geojson"; see app.utils.mask_encoding).
+# Requests can override it with mask_format. GeoJSON outlines are simplified
+# with Douglas-Peucker at MASK_GEOJSON_TOLERANCE pixels (0 keeps every vertex).
+MASK_FORMAT = os.getenv("MASK_FORMAT", "png")
+MASK_GEOJSON_TOLERANCE = _env_float("MASK_GEOJSON_TOLERANCE", 1.0)
+
+# Buffer pool: the per-request arrays of the pipeline (resized input, model
+# tensor, thresholded and full-resolution masks) are reused across requests,
+# keyed by shape and dtype. Up to BUFFER_POOL_MAX_MB of idle buffers are kept,
+# least recently used shapes dropped first (0 disables pooling).
+BUFFER_POOL_MAX_MB = _env_float("BUFFER_POOL_MAX_MB", 256.0)
+
+# Vessel analytics: opt-in morphology metrics (vessel length, branch and end
+# points, caliber, tortuosity; see app.utils.vessel_morphology) added to
+# vessel_metrics under "morphology". Requests can override with
+# vessel_analytics. Full-resolution analysis costs 70-100 ms per megapixel, so
+# masks above VESSEL_ANALYTICS_MAX_PIXELS are analysed at the smallest integer
+# downscale that fits. This is lossy (branch and end point counts drop; see
+# docs/api/endpoints/prediction.md); 0 always analyses full resolution.
+VESSEL_ANALYTICS_ENABLED = _env_bool("VESSEL_ANALYTICS_ENABLED", False)
+VESSEL_ANALYTICS_MAX_PIXELS = _env_int("VESSEL_ANALYTICS_MAX_PIXELS", 2_000_000)
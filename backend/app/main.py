@@ -1,18 +1,38 @@
-from fastapi import FastAPI, HTTPException, File, UploadFile
+from fastapi import FastAPI, HTTPException, File, UploadFile, Request, Response, Query, Header, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 import uvicorn
+import asyncio
+import json
 import logging
-from typing import Optional
+import secrets
+import time
+import uuid
+from typing import List, Optional
 
-from .models import PredictionRequest, PredictionResponse, HealthResponse, ErrorResponse
-from .services import model_service
+from .models import (
+    PredictionRequest, PredictionResponse, HealthResponse, LivenessResponse, ReadinessResponse, ErrorResponse,
+    InferenceMode, MaskFormat
+)
+from . import config
+from .services import (
+    model_service, model_registry, inference_executor, health_monitor, metrics_registry, request_profiler,
+    ExecutorSaturatedError, ModelNotReadyError, ProfilerBusyError, UnknownModelError
+)
+from .services.metrics import REQUEST_SECONDS, REQUESTS_IN_FLIGHT, StageTimer, server_timing_header
 from .utils.image_processing import encode_image_to_base64
+from .utils.mask_encoding import MASK_MEDIA_TYPES, encode_mask
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+INFERENCE_MODE_DESCRIPTION = "resize or tiled (defaults to the server's INFERENCE_MODE)"
+EYE_CROP_DESCRIPTION = "Crop to the eye region before inference (defaults to the server's EYE_CROP_ENABLED)"
+MASK_FORMAT_DESCRIPTION = "png, png_fast, png_1bit, rle, packbits or geojson (defaults to the server's MASK_FORMAT)"
+VESSEL_ANALYTICS_DESCRIPTION = "Add vessel length, branching, caliber and tortuosity to vessel_metrics (defaults to the server's VESSEL_ANALYTICS_ENABLED)"
+PROFILE_DESCRIPTION = "Profile this request under cProfile and the TF profiler (requires X-Admin-Token)"
+
 # Create FastAPI app
 app = FastAPI(
     title="Eye Vessel Segmentation API",
@@ -29,21 +49,57 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Confidence-Score", "X-Processing-Time", "X-Queue-Time",
+        "X-Inference-Time", "X-Vessel-Metrics", "X-Mask-Shape", "Server-Timing", "X-Profile-Id"
+    ],
 )
 
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Track in-flight requests and per-endpoint latency for ``/metrics``."""
+    REQUESTS_IN_FLIGHT.inc()
+    start_time = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        REQUESTS_IN_FLIGHT.dec()
+        # Label by route template, so path parameters and unknown paths cannot explode cardinality
+        route = request.scope.get("route")
+        endpoint = getattr(route, "path", "unmatched")
+        REQUEST_SECONDS.observe(time.perf_counter() - start_time, request.method, endpoint, str(status))
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application on startup."""
     logger.info("Starting Eye Vessel Segmentation API")
-    logger.info("Checking model service...")
     
-    health = model_service.health_check()
-    if health["status"] == "healthy":
-        logger.info("Model service is ready")
-    else:
-        logger.warning("Model service health check failed")
-        logger.warning(f"Health status: {health}")
+    # Load the model in the background so the port binds immediately;
+    # readiness is reported by /health/ready
+    if model_service.load_mode == "background":
+        logger.info("Loading model in the background")
+        model_service.start_loading()
+    elif model_service.load_mode == "lazy":
+        logger.info("Model will be loaded on the first inference request")
+    
+    # Health is probed in the background and served from cache
+    health_monitor.start()
+    
+    # Hot-reload the default model when its file changes
+    model_service.start_watching(config.MODEL_WATCH_INTERVAL)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release background resources on shutdown."""
+    model_service.stop_watching()
+    health_monitor.stop()
+    inference_executor.shutdown(wait=False)
 
 
 @app.get("/", response_model=dict)
@@ -55,8 +111,13 @@ async def root():
         "description": "API for segmenting blood vessels in slit-lamp eye images",
         "endpoints": {
             "health": "/health",
+            "live": "/health/live",
+            "ready": "/health/ready",
             "predict": "/predict",
             "predict_file": "/predict/file",
+            "predict_binary": "/predict/binary",
+            "predict_batch": "/predict/batch",
+            "metrics": "/metrics",
             "docs": "/docs",
             "redoc": "/redoc"
         }
@@ -65,27 +126,96 @@ async def root():
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint, served from the background monitor's cached probe."""
     try:
-        health_status = model_service.health_check()
+        health_status = health_monitor.get_status()
         
         return HealthResponse(
             status=health_status["status"],
             model_loaded=health_status["model_loaded"],
-            version="1.0.0"
+            version="1.0.0",
+            test_prediction=health_status.get("test_prediction"),
+            checked_at=health_status["checked_at"],
+            probe_latency=health_status["probe_latency"]
         )
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
 
+@app.get("/health/live", response_model=LivenessResponse)
+async def liveness_check():
+    """Liveness endpoint; answers from the event loop without touching the model."""
+    return LivenessResponse(status="alive")
+
+
+@app.get("/health/ready", response_model=ReadinessResponse, responses={503: {"model": ReadinessResponse}})
+async def readiness_check():
+    """Readiness endpoint reporting model load progress (503 until the model is ready)."""
+    readiness = model_service.get_readiness()
+    
+    # A loaded model whose last background probe failed is not ready for traffic
+    health_status = health_monitor.get_status()
+    if readiness["ready"] and health_status.get("test_prediction") == "failed":
+        readiness["ready"] = False
+        readiness["error"] = f"Health probe failed: {health_status.get('test_error')}"
+    return JSONResponse(
+        status_code=200 if readiness["ready"] else 503,
+        content=ReadinessResponse(**readiness).model_dump()
+    )
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Dependency guarding admin endpoints with the ADMIN_TOKEN shared secret."""
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN is not set)")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, config.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+def _predict_and_encode(image_input, model_name: Optional[str] = None, **options) -> dict:
+    """Route a prediction to the named model (loading it if needed) and encode the mask."""
+    return model_registry.get(model_name).predict_and_encode(image_input, **options)
+
+
+async def _run_prediction(fn, image_input, model_name: Optional[str], profile: bool = False, **options) -> dict:
+    """
+    Run a prediction function on the inference executor.
+    
+    With ``profile`` the request runs isolated (no micro-batching, cache or
+    coalescing) under the request profiler, and the profile summary is added
+    to the result under ``profile``.
+    """
+    if not profile:
+        return await inference_executor.run(fn, image_input, model_name, **options)
+    
+    # Profile the request, not the model loading it may otherwise wait for
+    service = await inference_executor.run(model_registry.get, model_name)
+    await inference_executor.run(service.wait_until_ready)
+    result, summary = await inference_executor.run(
+        request_profiler.run, fn, image_input, model_name, isolated=True, **options
+    )
+    result["profile"] = summary
+    return result
+
+
+def _server_timing(result: dict) -> str:
+    """``Server-Timing`` header value for a prediction result's stage timings."""
+    return server_timing_header(result["timings"] or {}, result["processing_time"] * 1000.0)
+
+
 @app.post("/predict", response_model=PredictionResponse)
-async def predict_vessels(request: PredictionRequest):
+async def predict_vessels(request: PredictionRequest, response: Response,
+                          profile: bool = Query(False, description=PROFILE_DESCRIPTION),
+                          x_admin_token: Optional[str] = Header(None)):
     """
     Predict blood vessel segmentation from base64 encoded image.
     
     Args:
         request: Prediction request containing base64 encoded image
+        response: Outgoing response, used to set the ``Server-Timing`` header
+        profile: Profile this request (admin only)
+        x_admin_token: Admin token, required when ``profile`` is set
         
     Returns:
         Prediction response with segmentation mask and metrics
@@ -96,16 +226,34 @@ async def predict_vessels(request: PredictionRequest):
         # Validate input
         if not request.image:
             raise HTTPException(status_code=400, detail="No image provided")
+        if profile:
+            require_admin(x_admin_token)
         
-        # Perform prediction
-        result = model_service.predict_and_encode(request.image)
+        # Perform prediction off the event loop
+        result = await _run_prediction(
+            _predict_and_encode, request.image, request.model_name, profile,
+            inference_mode=request.inference_mode, eye_crop=request.eye_crop, mask_format=request.mask_format,
+            vessel_analytics=request.vessel_analytics
+        )
         
         if result["success"]:
+            response.headers["Server-Timing"] = _server_timing(result)
             return PredictionResponse(
                 success=True,
                 segmentation_mask=result["segmentation_mask"],
+                mask_format=result["mask_format"],
+                mask_shape=result["mask_shape"],
                 confidence_score=result["confidence_score"],
                 processing_time=result["processing_time"],
+                queue_time=result["queue_time"],
+                inference_time=result["inference_time"],
+                crop_box=result["crop_box"],
+                prescreen_time=result["prescreen_time"],
+                decode_scale=result["decode_scale"],
+                vessel_metrics=result["vessel_metrics"],
+                cached=result["cached"],
+                timings=result["timings"],
+                profile=result.get("profile"),
                 message=result["message"]
             )
         else:
@@ -113,18 +261,40 @@ async def predict_vessels(request: PredictionRequest):
             
     except HTTPException:
         raise
+    except UnknownModelError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except (ExecutorSaturatedError, ModelNotReadyError) as e:
+        logger.warning(f"Rejecting request: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Prediction failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
 @app.post("/predict/file", response_model=PredictionResponse)
-async def predict_vessels_from_file(file: UploadFile = File(...)):
+async def predict_vessels_from_file(response: Response, file: UploadFile = File(...),
+                                    model_name: Optional[str] = Query(None, description="Model name to use"),
+                                    inference_mode: Optional[InferenceMode] = Query(None, description=INFERENCE_MODE_DESCRIPTION),
+                                    eye_crop: Optional[bool] = Query(None, description=EYE_CROP_DESCRIPTION),
+                                    mask_format: Optional[MaskFormat] = Query(None, description=MASK_FORMAT_DESCRIPTION),
+                                    vessel_analytics: Optional[bool] = Query(None, description=VESSEL_ANALYTICS_DESCRIPTION),
+                                    profile: bool = Query(False, description=PROFILE_DESCRIPTION),
+                                    x_admin_token: Optional[str] = Header(None)):
     """
     Predict blood vessel segmentation from uploaded image file.
     
     Args:
+        response: Outgoing response, used to set the ``Server-Timing`` header
         file: Uploaded image file
+        model_name: Optional ``name`` or ``name@version`` of the model to use
+        inference_mode: Optional ``resize`` or ``tiled`` override of the configured mode
+        eye_crop: Optional override of the eye-region pre-screen
+        mask_format: Optional encoding of the returned mask
+        vessel_analytics: Optional override of the vessel morphology metrics
+        profile: Profile this request (admin only)
+        x_admin_token: Admin token, required when ``profile`` is set
         
     Returns:
         Prediction response with segmentation mask and metrics
@@ -135,27 +305,37 @@ async def predict_vessels_from_file(file: UploadFile = File(...)):
         # Validate file type
         if not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail="File must be an image")
+        if profile:
+            require_admin(x_admin_token)
         
         # Read file content
         image_bytes = await file.read()
         
-        # Convert to base64
-        import base64
-        base64_string = base64.b64encode(image_bytes).decode('utf-8')
-        
-        # Add data URI prefix
-        mime_type = file.content_type
-        base64_image = f"data:{mime_type};base64,{base64_string}"
-        
-        # Perform prediction
-        result = model_service.predict_and_encode(base64_image)
+        # Perform prediction on the raw bytes off the event loop
+        result = await _run_prediction(
+            _predict_and_encode, image_bytes, model_name, profile,
+            inference_mode=inference_mode, eye_crop=eye_crop, mask_format=mask_format,
+            vessel_analytics=vessel_analytics
+        )
         
         if result["success"]:
+            response.headers["Server-Timing"] = _server_timing(result)
             return PredictionResponse(
                 success=True,
                 segmentation_mask=result["segmentation_mask"],
+                mask_format=result["mask_format"],
+                mask_shape=result["mask_shape"],
                 confidence_score=result["confidence_score"],
                 processing_time=result["processing_time"],
+                queue_time=result["queue_time"],
+                inference_time=result["inference_time"],
+                crop_box=result["crop_box"],
+                prescreen_time=result["prescreen_time"],
+                decode_scale=result["decode_scale"],
+                vessel_metrics=result["vessel_metrics"],
+                cached=result["cached"],
+                timings=result["timings"],
+                profile=result.get("profile"),
                 message=result["message"]
             )
         else:
@@ -163,22 +343,339 @@ async def predict_vessels_from_file(file: UploadFile = File(...)):
             
     except HTTPException:
         raise
+    except UnknownModelError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except (ExecutorSaturatedError, ModelNotReadyError) as e:
+        logger.warning(f"Rejecting request: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"File prediction failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"File prediction failed: {str(e)}")
 
 
+def _predict_binary(image_bytes: bytes, model_name: Optional[str] = None,
+                    mask_format: Optional[str] = None, **options) -> dict:
+    """Run prediction on raw image bytes and encode the mask straight to bytes (no base64)."""
+    service = model_registry.get(model_name)
+    mask_format = mask_format or service.mask_format
+    timer = StageTimer(service.model_key)
+    result = service.predict(image_bytes, timer=timer, **options)
+    mask = result.pop("mask")
+    with timer.stage("mask_encode"):
+        encoded = encode_mask(mask, mask_format, service.geojson_tolerance)
+        if isinstance(encoded, dict):
+            encoded = json.dumps(encoded, separators=(",", ":")).encode()
+    result["mask_bytes"] = encoded
+    result["mask_format"] = mask_format
+    result["mask_shape"] = list(mask.shape)
+    service.buffer_pool.release(mask)
+    result["timings"] = timer.milliseconds()
+    return result
+
+
+@app.post(
+    "/predict/binary",
+    response_class=Response,
+    responses={200: {"content": {
+        "image/png": {}, "application/json": {}, "application/geo+json": {}, "application/octet-stream": {},
+        "multipart/mixed": {}
+    }}}
+)
+async def predict_vessels_binary(request: Request,
+                                 model_name: Optional[str] = Query(None, description="Model name to use"),
+                                 inference_mode: Optional[InferenceMode] = Query(None, description=INFERENCE_MODE_DESCRIPTION),
+                                 eye_crop: Optional[bool] = Query(None, description=EYE_CROP_DESCRIPTION),
+                                 mask_format: Optional[MaskFormat] = Query(None, description=MASK_FORMAT_DESCRIPTION),
+                                 vessel_analytics: Optional[bool] = Query(None, description=VESSEL_ANALYTICS_DESCRIPTION),
+                                 profile: bool = Query(False, description=PROFILE_DESCRIPTION),
+                                 x_admin_token: Optional[str] = Header(None)):
+    """
+    Predict blood vessel segmentation from raw image bytes.
+    
+    Accepts either the encoded image as the request body (``Content-Type: image/*``)
+    or a multipart upload with a ``file`` field, and returns the encoded mask
+    (``image/png``, RLE as ``application/json``, GeoJSON as
+    ``application/geo+json`` or packed bits as ``application/octet-stream``)
+    without any base64 round trip. Metrics are
+    returned in ``X-*`` headers, or as a JSON part when the client sends
+    ``Accept: multipart/mixed``.
+    
+    Args:
+        request: Raw HTTP request
+        model_name: Optional ``name`` or ``name@version`` of the model to use
+        inference_mode: Optional ``resize`` or ``tiled`` override of the configured mode
+        eye_crop: Optional override of the eye-region pre-screen
+        mask_format: Optional encoding of the returned mask
+        vessel_analytics: Optional override of the vessel morphology metrics
+        profile: Profile this request (admin only)
+        x_admin_token: Admin token, required when ``profile`` is set
+        
+    Returns:
+        Encoded mask bytes, or a multipart/mixed body with JSON metadata and the mask
+    """
+    try:
+        if profile:
+            require_admin(x_admin_token)
+        content_type = request.headers.get("content-type", "")
+        
+        if content_type.startswith("multipart/form-data"):
+            form = await request.form()
+            upload = form.get("file")
+            if upload is None or isinstance(upload, str):
+                raise HTTPException(status_code=400, detail="Multipart upload must contain a 'file' field")
+            if not (upload.content_type or "").startswith("image/"):
+                raise HTTPException(status_code=400, detail="File must be an image")
+            image_bytes = await upload.read()
+        elif content_type.startswith("image/") or content_type.startswith("application/octet-stream"):
+            image_bytes = await request.body()
+        else:
+            raise HTTPException(status_code=415, detail="Send an image/* body or a multipart/form-data upload")
+        
+        if not image_bytes:
+            raise HTTPException(status_code=400, detail="No image provided")
+        
+        logger.info(f"Received binary prediction request ({len(image_bytes)} bytes)")
+        
+        try:
+            result = await _run_prediction(
+                _predict_binary, image_bytes, model_name, profile,
+                inference_mode=inference_mode, eye_crop=eye_crop, mask_format=mask_format,
+                vessel_analytics=vessel_analytics
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        media_type = MASK_MEDIA_TYPES[result["mask_format"]]
+        metadata = {
+            "success": True,
+            "mask_format": result["mask_format"],
+            "mask_shape": result["mask_shape"],
+            "confidence_score": result["confidence"],
+            "processing_time": result["processing_time"],
+            "queue_time": result["queue_time"],
+            "inference_time": result["inference_time"],
+            "crop_box": result["crop_box"],
+            "prescreen_time": result["prescreen_time"],
+            "decode_scale": result["decode_scale"],
+            "vessel_metrics": result["vessel_metrics"],
+            "timings": result["timings"],
+            "profile": result.get("profile"),
+            "message": result["message"]
+        }
+        
+        if "multipart/mixed" in request.headers.get("accept", ""):
+            boundary = uuid.uuid4().hex
+            body = b"".join([
+                f"--{boundary}\r\nContent-Type: application/json\r\n\r\n".encode(),
+                json.dumps(metadata).encode(),
+                f"\r\n--{boundary}\r\nContent-Type: {media_type}\r\n\r\n".encode(),
+                result["mask_bytes"],
+                f"\r\n--{boundary}--\r\n".encode()
+            ])
+            return Response(
+                content=body, media_type=f"multipart/mixed; boundary={boundary}",
+                headers={"Server-Timing": _server_timing(result)}
+            )
+        
+        headers = {
+            "X-Confidence-Score": f"{result['confidence']:.6f}",
+            "X-Processing-Time": f"{result['processing_time']:.6f}",
+            "X-Queue-Time": f"{result['queue_time']:.6f}",
+            "X-Inference-Time": f"{result['inference_time']:.6f}",
+            "X-Vessel-Metrics": json.dumps(result["vessel_metrics"], separators=(",", ":")),
+            "X-Mask-Shape": ",".join(str(side) for side in result["mask_shape"]),
+            "Server-Timing": _server_timing(result)
+        }
+        if profile:
+            headers["X-Profile-Id"] = result["profile"]["profile_id"]
+        return Response(content=result["mask_bytes"], media_type=media_type, headers=headers)
+        
+    except HTTPException:
+        raise
+    except UnknownModelError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except (ExecutorSaturatedError, ModelNotReadyError) as e:
+        logger.warning(f"Rejecting request: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Binary prediction failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Binary prediction failed: {str(e)}")
+
+
+def _failed_result(message: str) -> dict:
+    """Build a failed prediction result with the same keys as a successful one."""
+    return {
+        "success": False,
+        "segmentation_mask": None,
+        "mask_format": None,
+        "mask_shape": None,
+        "confidence_score": None,
+        "processing_time": None,
+        "queue_time": None,
+        "inference_time": None,
+        "crop_box": None,
+        "prescreen_time": None,
+        "decode_scale": None,
+        "vessel_metrics": None,
+        "timings": None,
+        "cached": False,
+        "message": message
+    }
+
+
+@app.post("/predict/batch")
+async def predict_vessels_batch(files: List[UploadFile] = File(...),
+                                model_name: Optional[str] = Query(None, description="Model name to use"),
+                                inference_mode: Optional[InferenceMode] = Query(None, description=INFERENCE_MODE_DESCRIPTION),
+                                eye_crop: Optional[bool] = Query(None, description=EYE_CROP_DESCRIPTION),
+                                mask_format: Optional[MaskFormat] = Query(None, description=MASK_FORMAT_DESCRIPTION),
+                                vessel_analytics: Optional[bool] = Query(None, description=VESSEL_ANALYTICS_DESCRIPTION)):
+    """
+    Predict blood vessel segmentation for many uploaded images.
+    
+    The uploads are read up front; decoding and inference then run in a
+    sliding window of one model batch of the selected model service, so
+    concurrent items share forward passes through the micro-batcher while
+    only a batch worth of decoded images is held in memory. One NDJSON line is streamed per image as soon as it completes,
+    carrying its ``index`` in the upload so clients can reorder.
+    
+    Args:
+        files: Uploaded image files
+        model_name: Optional ``name`` or ``name@version`` of the model to use
+        inference_mode: Optional ``resize`` or ``tiled`` override of the configured mode
+        eye_crop: Optional override of the eye-region pre-screen
+        mask_format: Optional encoding of the returned masks
+        vessel_analytics: Optional override of the vessel morphology metrics
+        
+    Returns:
+        ``application/x-ndjson`` stream of per-image prediction results
+    """
+    if not files:
+        raise HTTPException(status_code=400, detail="No images provided")
+    
+    logger.info(f"Received batch upload of {len(files)} images")
+    try:
+        service = await inference_executor.run(model_registry.get, model_name)
+    except UnknownModelError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except (ExecutorSaturatedError, ModelNotReadyError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    window = service.batcher.max_batch_size if service.batcher is not None else config.BATCH_MAX_SIZE
+    
+    # FastAPI closes form uploads once the endpoint returns, before the
+    # streaming body runs, so the (compressed) bytes are read up front and
+    # only decoding and inference are windowed
+    uploads = []
+    for upload in files:
+        image_bytes = await upload.read() if (upload.content_type or "").startswith("image/") else None
+        await upload.close()
+        uploads.append((upload.filename, image_bytes))
+    
+    async def _predict_upload(index: int, filename: Optional[str], image_bytes: Optional[bytes]) -> dict:
+        line = {"index": index, "filename": filename}
+        if image_bytes is None:
+            line.update(_failed_result("File must be an image"))
+            return line
+        try:
+            line.update(await inference_executor.run(
+                _predict_and_encode, image_bytes, model_name,
+                inference_mode=inference_mode, eye_crop=eye_crop, mask_format=mask_format,
+                vessel_analytics=vessel_analytics
+            ))
+        except UnknownModelError as e:
+            line.update(_failed_result(e.args[0]))
+        except (ExecutorSaturatedError, ModelNotReadyError) as e:
+            line.update(_failed_result(str(e)))
+        except Exception as e:
+            logger.error(f"Batch item {index} failed: {str(e)}")
+            line.update(_failed_result(f"Prediction failed: {str(e)}"))
+        return line
+    
+    async def _stream():
+        items = ((index, *upload) for index, upload in enumerate(uploads))
+        pending = set()
+        try:
+            for item in items:
+                pending.add(asyncio.ensure_future(_predict_upload(*item)))
+                if len(pending) >= window:
+                    break
+            
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield (json.dumps(task.result()) + "\n").encode()
+                    next_item = next(items, None)
+                    if next_item is not None:
+                        pending.add(asyncio.ensure_future(_predict_upload(*next_item)))
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    return StreamingResponse(_stream(), media_type="application/x-ndjson")
+
+
 @app.get("/model/info")
 async def get_model_info():
     """Get information about the loaded model."""
     try:
         model_info = model_service.get_model_info()
+        model_info["executor"] = inference_executor.get_stats()
+        model_info["registry"] = model_registry.get_info()
+        model_info["profiler"] = request_profiler.get_stats()
         return model_info
     except Exception as e:
         logger.error(f"Failed to get model info: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get model info: {str(e)}")
 
 
+@app.get("/metrics")
+async def get_metrics():
+    """
+    Prometheus metrics in text exposition format.
+    
+    Per-stage and per-endpoint latency histograms, batch and image size
+    distributions, plus queue depths and cache counters read at scrape time.
+    """
+    return Response(content=metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.post("/admin/model/reload", status_code=202, dependencies=[Depends(require_admin)])
+async def reload_model(model_name: Optional[str] = Query(None, description="Model to reload (default model if omitted)")):
+    """
+    Hot-reload a model from its file without downtime.
+    
+    The new model is loaded and warmed up in the background, validated with
+    the health probe image and swapped in atomically; poll ``/model/info``
+    for the ``reload`` status.
+    """
+    try:
+        service = await inference_executor.run(model_registry.get, model_name)
+        return service.reload()
+    except UnknownModelError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except (ExecutorSaturatedError, ModelNotReadyError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def download_profile(profile_id: str):
+    """
+    Download the cProfile stats of a profiled request.
+    
+    Load it with ``pstats.Stats(path)`` or visualize it with snakeviz or
+    flameprof. The TensorFlow trace stays in ``PROFILE_DIR/<profile_id>/tf_trace``
+    for TensorBoard.
+    """
+    path = request_profiler.pstats_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profile: {profile_id}")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.pstats")
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Custom HTTP exception handler."""
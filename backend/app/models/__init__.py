@@ -1,12 +1,23 @@
-from typing import Optional
+from typing import Any, Dict, List, Literal, Optional, Union
 from pydantic import BaseModel, Field
 import base64
 
 
+# "resize" squashes the image to the model input size, "tiled" runs native-resolution tiles
+InferenceMode = Literal["resize", "tiled"]
+
+# Mask wire formats (see app.utils.mask_encoding)
+MaskFormat = Literal["png", "png_fast", "png_1bit", "rle", "packbits", "geojson"]
+
+
 class PredictionRequest(BaseModel):
     """Request model for image prediction"""
     image: str = Field(..., description="Base64 encoded image")
-    model_name: Optional[str] = Field(default="unet_eye_segmentation", description="Model name to use")
+    model_name: Optional[str] = Field(default="unet_eye_segmentation", description="Model name to use (name or name@version)")
+    inference_mode: Optional[InferenceMode] = Field(None, description="resize or tiled (defaults to the server's INFERENCE_MODE)")
+    eye_crop: Optional[bool] = Field(None, description="Crop to the eye region before inference (defaults to the server's EYE_CROP_ENABLED)")
+    mask_format: Optional[MaskFormat] = Field(None, description="Encoding of the returned mask (defaults to the server's MASK_FORMAT)")
+    vessel_analytics: Optional[bool] = Field(None, description="Add vessel length, branching, caliber and tortuosity to vessel_metrics (defaults to the server's VESSEL_ANALYTICS_ENABLED)")
     
     class Config:
         json_schema_extra = {
@@ -17,12 +28,60 @@ class PredictionRequest(BaseModel):
         }
 
 
+class CropBox(BaseModel):
+    """Eye-region crop in original image pixels"""
+    x: int = Field(..., description="Left edge")
+    y: int = Field(..., description="Top edge")
+    width: int = Field(..., description="Crop width")
+    height: int = Field(..., description="Crop height")
+
+
+class MaskRLE(BaseModel):
+    """COCO-style uncompressed run-length encoded mask"""
+    size: List[int] = Field(..., description="Mask [height, width]")
+    counts: List[int] = Field(..., description="Alternating background/vessel run lengths in column-major order, starting with background")
+
+
+class MaskGeoJSON(BaseModel):
+    """Vessel outlines as a GeoJSON FeatureCollection in original-image pixel coordinates"""
+    type: Literal["FeatureCollection"] = Field(..., description="Always FeatureCollection")
+    features: List[Dict[str, Any]] = Field(..., description="Polygon (outline and holes) and LineString (thin vessel) features")
+
+
+class ProfiledFunction(BaseModel):
+    """One row of a request profile, sorted by cumulative time"""
+    function: str = Field(..., description="file:line(function)")
+    calls: int = Field(..., description="Number of calls")
+    total_time: float = Field(..., description="Time spent in the function itself in seconds")
+    cumulative_time: float = Field(..., description="Time including callees in seconds")
+
+
+class ProfileSummary(BaseModel):
+    """Summary of a profiled request; the full profile is stored on the server"""
+    profile_id: str = Field(..., description="Profile identifier (download via /admin/profiles/{profile_id})")
+    wall_time: float = Field(..., description="Profiled wall time in seconds")
+    pstats_file: str = Field(..., description="cProfile stats file name in the profile directory")
+    tf_trace: bool = Field(..., description="Whether a TensorFlow profiler trace was captured")
+    top_functions: List[ProfiledFunction] = Field(..., description="Functions with the most cumulative time")
+
+
 class PredictionResponse(BaseModel):
     """Response model for image prediction"""
     success: bool = Field(..., description="Whether prediction was successful")
-    segmentation_mask: Optional[str] = Field(None, description="Base64 encoded segmentation mask")
+    segmentation_mask: Optional[Union[str, MaskRLE, MaskGeoJSON]] = Field(None, description="Segmentation mask: base64 data URI, or an RLE / GeoJSON object for mask_format=rle / geojson")
+    mask_format: Optional[MaskFormat] = Field(None, description="Encoding of segmentation_mask")
+    mask_shape: Optional[List[int]] = Field(None, description="Mask [height, width] (needed to unpack packbits masks)")
     confidence_score: Optional[float] = Field(None, description="Average confidence score")
     processing_time: Optional[float] = Field(None, description="Processing time in seconds")
+    queue_time: Optional[float] = Field(None, description="Time spent waiting for a batched inference slot in seconds")
+    inference_time: Optional[float] = Field(None, description="Model forward pass time in seconds")
+    crop_box: Optional[CropBox] = Field(None, description="Eye region the model ran on (null when the whole frame was used)")
+    prescreen_time: Optional[float] = Field(None, description="Eye-region pre-screen time in seconds (null when disabled)")
+    decode_scale: Optional[int] = Field(None, description="Decode downscale denominator (1 = full resolution, 2/4/8 = JPEG reduced-resolution decode)")
+    vessel_metrics: Optional[Dict[str, Any]] = Field(None, description="Vessel coverage and region metrics, with morphology when vessel_analytics is on")
+    cached: Optional[bool] = Field(None, description="Whether the result was served from the result cache")
+    timings: Optional[Dict[str, float]] = Field(None, description="Per-stage durations in milliseconds, in pipeline order")
+    profile: Optional[ProfileSummary] = Field(None, description="Profile summary (only for admin requests with profile=true)")
     message: Optional[str] = Field(None, description="Status message or error description")
     
     class Config:
@@ -30,8 +89,21 @@ class PredictionResponse(BaseModel):
             "example": {
                 "success": True,
                 "segmentation_mask": "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8/5+hHgAHggJ/PchI7wAAAABJRU5ErkJggg==",
+                "mask_format": "png",
+                "mask_shape": [3000, 4000],
                 "confidence_score": 0.89,
                 "processing_time": 1.23,
+                "queue_time": 0.004,
+                "inference_time": 0.31,
+                "crop_box": {"x": 1040, "y": 1040, "width": 2139, "height": 1014},
+                "prescreen_time": 0.002,
+                "decode_scale": 1,
+                "cached": False,
+                "timings": {
+                    "base64_decode": 2.1, "image_decode": 38.4, "prescreen": 2.0, "preprocess": 3.2,
+                    "queue_wait": 4.0, "model": 310.5, "postprocess_mask": 21.7, "morphology": 9.8,
+                    "vessel_metrics": 6.1, "mask_encode": 25.3
+                },
                 "message": "Segmentation completed successfully"
             }
         }
@@ -39,9 +111,26 @@ class PredictionResponse(BaseModel):
 
 class HealthResponse(BaseModel):
     """Health check response model"""
-    status: str = Field(..., description="Service status")
+    status: str = Field(..., description="Service status (healthy, starting or unhealthy)")
     model_loaded: bool = Field(..., description="Whether the model is loaded")
     version: str = Field(..., description="API version")
+    test_prediction: Optional[str] = Field(None, description="Result of the last background probe (passed or failed)")
+    checked_at: Optional[float] = Field(None, description="Unix timestamp of the last background probe")
+    probe_latency: Optional[float] = Field(None, description="Latency of the last background probe in seconds")
+
+
+class LivenessResponse(BaseModel):
+    """Liveness check response model"""
+    status: str = Field(..., description="Always 'alive' while the process serves requests")
+
+
+class ReadinessResponse(BaseModel):
+    """Readiness check response model"""
+    ready: bool = Field(..., description="Whether the model is loaded and accepting inference requests")
+    state: str = Field(..., description="Model load state (pending, importing_tensorflow, loading_model, compiling, ready, failed)")
+    progress: float = Field(..., description="Approximate load progress from 0.0 to 1.0")
+    elapsed_seconds: Optional[float] = Field(None, description="Time spent loading so far (or total load time once ready)")
+    error: Optional[str] = Field(None, description="Load error if the state is failed")
 
 
 class ErrorResponse(BaseModel):
@@ -1,5 +1,87 @@
 # Services module
-from .model_service import ModelService
+from .. import config
+from .buffer_pool import BufferPool
+from .executor import ExecutorSaturatedError, InferenceExecutor
+from .health_monitor import HealthMonitor
+from .metrics import Counter, Gauge, registry as metrics_registry
+from .model_registry import ModelRegistry, UnknownModelError
+from .model_service import ModelNotReadyError, ModelService
+from .profiler import ProfilerBusyError, RequestProfiler
+from .result_cache import ResultCache
+from .single_flight import SingleFlight
 
-# Initialize the model service instance
-model_service = ModelService()
+# Encoded results of re-submitted images, shared by all served models
+result_cache = ResultCache(
+    max_bytes=int(config.RESULT_CACHE_MAX_MB * 1024 * 1024),
+    ttl=config.RESULT_CACHE_TTL
+)
+
+# Identical in-flight requests share one inference
+single_flight = SingleFlight() if config.SINGLE_FLIGHT_ENABLED else None
+
+# Reusable pipeline arrays, shared by all served models
+buffer_pool = BufferPool(max_bytes=int(config.BUFFER_POOL_MAX_MB * 1024 * 1024))
+
+# Initialize the model service instance (the model itself loads per MODEL_LOAD_MODE)
+model_service = ModelService(
+    load_mode=config.MODEL_LOAD_MODE, buffer_pool=buffer_pool, result_cache=result_cache,
+    single_flight=single_flight
+)
+
+# Registry routing PredictionRequest.model_name to loaded models
+model_registry = ModelRegistry(model_service, memory_budget_mb=config.MODEL_MEMORY_BUDGET_MB)
+
+# Bounded executor that keeps blocking inference off the event loop
+inference_executor = InferenceExecutor(
+    max_workers=config.INFERENCE_WORKERS,
+    max_pending=config.INFERENCE_MAX_PENDING
+)
+
+# Background health prober; /health serves its cached result
+health_monitor = HealthMonitor(model_service, interval=config.HEALTH_CHECK_INTERVAL)
+
+# On-demand profiling of single admin requests
+request_profiler = RequestProfiler(
+    config.PROFILE_DIR, tf_trace=config.PROFILE_TF_TRACE, max_profiles=config.PROFILE_MAX_RUNS
+)
+
+# Live queue, cache and coalescing figures, read from the services at scrape time
+metrics_registry.register(Gauge(
+    "vessel_executor_jobs", "Prediction jobs queued or running on the inference executor",
+    callback=lambda: [((), inference_executor.pending)]
+))
+metrics_registry.register(Counter(
+    "vessel_executor_rejected_total", "Prediction jobs rejected because the executor was saturated",
+    callback=lambda: [((), inference_executor.rejected)]
+))
+metrics_registry.register(Gauge(
+    "vessel_batcher_queue_depth", "Preprocessed images waiting for the micro-batcher", ("model",),
+    callback=lambda: [((key,), service.batcher.get_stats()["queue_depth"])
+                      for key, service in model_registry.resident_services() if service.batcher is not None]
+))
+metrics_registry.register(Gauge(
+    "vessel_result_cache_bytes", "Bytes held by the result cache",
+    callback=lambda: [((), result_cache.current_bytes)]
+))
+metrics_registry.register(Counter(
+    "vessel_result_cache_lookups_total", "Result cache lookups by outcome", ("result",),
+    callback=lambda: [(("hit",), result_cache.hits), (("miss",), result_cache.misses)]
+))
+metrics_registry.register(Counter(
+    "vessel_buffer_pool_acquires_total", "Pipeline buffer requests by outcome (reuse of an idle buffer or new allocation)",
+    ("result",),
+    callback=lambda: [(("reuse",), buffer_pool.reuses), (("allocation",), buffer_pool.allocations)]
+))
+metrics_registry.register(Counter(
+    "vessel_buffer_pool_allocated_bytes_total", "Bytes allocated for pipeline buffers",
+    callback=lambda: [((), buffer_pool.allocated_bytes)]
+))
+metrics_registry.register(Gauge(
+    "vessel_buffer_pool_free_bytes", "Bytes held by idle pipeline buffers",
+    callback=lambda: [((), buffer_pool.free_bytes)]
+))
+if single_flight is not None:
+    metrics_registry.register(Counter(
+        "vessel_coalesced_requests_total", "Requests served from another in-flight identical request",
+        callback=lambda: [((), single_flight.coalesced)]
+    ))
@@ -0,0 +1,536 @@
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# TensorFlow is imported on first use (see _import_tensorflow) so the API can
+# bind its port without paying the multi-second import up front, and so the
+# TFLite and ONNX backends can serve without importing it at all.
+tf = None
+keras = None
+
+
+def _import_tensorflow():
+    """Import TensorFlow and Keras into the module namespace on first use."""
+    global tf, keras
+    if tf is None:
+        import tensorflow
+        from tensorflow import keras as tensorflow_keras
+        tf, keras = tensorflow, tensorflow_keras
+    return tf
+
+
+class InferenceBackend(ABC):
+    """
+    Runtime that executes the segmentation model's forward pass.
+
+    ``ModelService`` owns decoding, batching and postprocessing; a backend
+    only loads a model artifact, warms it up and maps a float32 batch of
+    shape (N, H, W, 3) in [0, 1] to float32 probabilities of shape
+    (N, H, W, 1).
+    """
+
+    name = "base"
+
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+        self.warmed_batch_sizes: List[int] = []
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def fixed_batch_sizes(self) -> bool:
+        """Whether ``run`` only accepts the warmed-up batch sizes (callers pad up to one)."""
+        return False
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate resident size of the model weights."""
+        try:
+            return os.path.getsize(self.model_path)
+        except OSError:
+            return 0
+
+    @abstractmethod
+    def load(self):
+        """Load the model artifact; raises if it cannot be served."""
+
+    def warm_up(self, batch_sizes: Sequence[int]):
+        """Run each batch size once so allocation and tracing happen before serving traffic."""
+        for batch_size in batch_sizes:
+            self.run(np.zeros((batch_size, *self.input_shape), dtype=np.float32))
+            self.warmed_batch_sizes.append(batch_size)
+
+    @property
+    @abstractmethod
+    def input_shape(self) -> Tuple[int, int, int]:
+        """Per-image input shape (H, W, C)."""
+
+    @abstractmethod
+    def run(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Run a forward pass.
+
+        Args:
+            batch: Float32 batch of shape (N, H, W, 3) scaled to [0, 1]
+
+        Returns:
+            Float32 probabilities of shape (N, H, W, 1)
+        """
+
+    def describe(self) -> dict:
+        """Return backend details for the ``inference`` section of model info."""
+        return {
+            "backend": self.name,
+            "model_path": self.model_path,
+            "batch_sizes": sorted(self.warmed_batch_sizes)
+        }
+
+    def model_details(self) -> dict:
+        """Return architecture details (shapes, parameter counts) for model info, if known."""
+        return {}
+
+
+class KerasBackend(InferenceBackend):
+    """
+    TensorFlow/Keras backend.
+
+    Loads the ``.keras`` file (falling back to a dummy model when allowed) and
+    serves it through a concrete fixed-input-signature ``tf.function`` per
+    batch size, optionally XLA-compiled, or ``model.predict`` when compiled
+    inference is disabled or tracing fails.
+    """
+
+    name = "keras"
+
+    def __init__(self, model_path: str, compiled: bool = True, xla_compile: bool = False,
+                 allow_dummy_fallback: bool = True):
+        super().__init__(model_path)
+        self.compiled = compiled
+        self.xla_compile = xla_compile
+        self.allow_dummy_fallback = allow_dummy_fallback
+        self.model = None
+        self._inference_functions: Dict[int, object] = {}
+
+    @property
+    def input_shape(self) -> Tuple[int, int, int]:
+        return tuple(int(dim) for dim in self.model.input_shape[1:])
+
+    @property
+    def fixed_batch_sizes(self) -> bool:
+        return bool(self._inference_functions)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated resident size of the model weights (float32 parameters)."""
+        if self.model is None:
+            return 0
+        try:
+            return int(self.model.count_params()) * 4
+        except Exception:
+            return 0
+
+    def load(self):
+        """
+        Load the U-Net model from file.
+
+        Raises:
+            RuntimeError: If the model cannot be loaded and dummy fallback is disabled
+        """
+        _import_tensorflow()
+        try:
+            if os.path.exists(self.model_path):
+                self.logger.info(f"Loading model from {self.model_path}")
+
+                # Try loading with different compatibility options
+                try:
+                    # First try standard loading
+                    self.model = keras.models.load_model(self.model_path)
+                    self.logger.info("Model loaded successfully with standard method")
+                    return
+                except Exception as std_error:
+                    self.logger.warning(f"Standard loading failed: {std_error}")
+
+                    # Try with custom objects and safe mode
+                    try:
+                        self.model = keras.models.load_model(
+                            self.model_path,
+                            custom_objects=None,
+                            compile=False,
+                            safe_mode=False
+                        )
+                        # Recompile the model with current Keras
+                        self.model.compile(
+                            optimizer='adam',
+                            loss='binary_crossentropy',
+                            metrics=['accuracy']
+                        )
+                        self.logger.info("Model loaded successfully with compatibility mode")
+                        return
+                    except Exception as compat_error:
+                        self.logger.warning(f"Compatibility loading failed: {compat_error}")
+
+                        # Try loading weights only approach
+                        try:
+                            self.logger.info("Attempting to create model architecture and load weights")
+                            self._create_unet_model()
+                            # Note: This would require extracting weights from the .keras file
+                            # For now, we'll fall back to dummy model
+                            self.logger.warning("Weight-only loading not implemented, using dummy model")
+                            self._fallback_to_dummy_model("weight-only loading is not implemented")
+                            return
+                        except Exception as weight_error:
+                            self.logger.error(f"Weight loading failed: {weight_error}")
+                            raise weight_error
+            else:
+                self.logger.warning(f"Model file not found at {self.model_path}")
+                # Create a dummy model for testing purposes
+                self._fallback_to_dummy_model(f"model file not found at {self.model_path}")
+        except Exception as e:
+            self.logger.error(f"Failed to load model: {str(e)}")
+            # Fall back to dummy model to keep service running
+            self.logger.info("Falling back to dummy model for continued operation")
+            self._fallback_to_dummy_model(str(e))
+
+    def _fallback_to_dummy_model(self, reason: str):
+        """Replace a model that failed to load with the dummy model, if fallback is allowed."""
+        if not self.allow_dummy_fallback:
+            raise RuntimeError(f"Could not load {self.model_path}: {reason}")
+        self._create_dummy_model()
+
+    def _create_unet_model(self):
+        """Create a U-Net model architecture matching the original trained model."""
+        self.logger.info("Creating U-Net model architecture")
+
+        inputs = keras.layers.Input(shape=(256, 256, 3))
+
+        # Encoder (Contracting Path)
+        c1 = keras.layers.Conv2D(64, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(inputs)
+        c1 = keras.layers.Dropout(0.1)(c1)
+        c1 = keras.layers.Conv2D(64, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c1)
+        p1 = keras.layers.MaxPooling2D((2, 2))(c1)
+
+        c2 = keras.layers.Conv2D(128, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(p1)
+        c2 = keras.layers.Dropout(0.1)(c2)
+        c2 = keras.layers.Conv2D(128, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c2)
+        p2 = keras.layers.MaxPooling2D((2, 2))(c2)
+
+        c3 = keras.layers.Conv2D(256, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(p2)
+        c3 = keras.layers.Dropout(0.2)(c3)
+        c3 = keras.layers.Conv2D(256, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c3)
+        p3 = keras.layers.MaxPooling2D((2, 2))(c3)
+
+        c4 = keras.layers.Conv2D(512, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(p3)
+        c4 = keras.layers.Dropout(0.2)(c4)
+        c4 = keras.layers.Conv2D(512, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c4)
+        p4 = keras.layers.MaxPooling2D(pool_size=(2, 2))(c4)
+
+        # Bottom
+        c5 = keras.layers.Conv2D(1024, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(p4)
+        c5 = keras.layers.Dropout(0.3)(c5)
+        c5 = keras.layers.Conv2D(1024, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c5)
+
+        # Decoder (Expansive Path)
+        u6 = keras.layers.Conv2DTranspose(512, (2, 2), strides=(2, 2), padding='same')(c5)
+        u6 = keras.layers.concatenate([u6, c4])
+        c6 = keras.layers.Conv2D(512, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(u6)
+        c6 = keras.layers.Dropout(0.2)(c6)
+        c6 = keras.layers.Conv2D(512, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c6)
+
+        u7 = keras.layers.Conv2DTranspose(256, (2, 2), strides=(2, 2), padding='same')(c6)
+        u7 = keras.layers.concatenate([u7, c3])
+        c7 = keras.layers.Conv2D(256, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(u7)
+        c7 = keras.layers.Dropout(0.2)(c7)
+        c7 = keras.layers.Conv2D(256, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c7)
+
+        u8 = keras.layers.Conv2DTranspose(128, (2, 2), strides=(2, 2), padding='same')(c7)
+        u8 = keras.layers.concatenate([u8, c2])
+        c8 = keras.layers.Conv2D(128, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(u8)
+        c8 = keras.layers.Dropout(0.1)(c8)
+        c8 = keras.layers.Conv2D(128, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c8)
+
+        u9 = keras.layers.Conv2DTranspose(64, (2, 2), strides=(2, 2), padding='same')(c8)
+        u9 = keras.layers.concatenate([u9, c1], axis=3)
+        c9 = keras.layers.Conv2D(64, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(u9)
+        c9 = keras.layers.Dropout(0.1)(c9)
+        c9 = keras.layers.Conv2D(64, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c9)
+
+        # Output
+        outputs = keras.layers.Conv2D(1, (1, 1), activation='sigmoid')(c9)
+
+        self.model = keras.Model(inputs=[inputs], outputs=[outputs])
+
+        # Compile the model
+        self.model.compile(
+            optimizer='adam',
+            loss='binary_crossentropy',
+            metrics=['accuracy', 'precision', 'recall']
+        )
+
+        self.logger.info("U-Net model architecture created successfully")
+
+    def _create_dummy_model(self):
+        """Create a dummy model for testing when the actual model is not available."""
+        self.logger.info("Creating dummy model for testing")
+
+        # Simple dummy U-Net architecture
+        inputs = keras.layers.Input(shape=(256, 256, 3))
+
+        # Encoder
+        x = keras.layers.Conv2D(64, 3, activation='relu', padding='same')(inputs)
+        x = keras.layers.Conv2D(64, 3, activation='relu', padding='same')(x)
+        x = keras.layers.MaxPooling2D(2)(x)
+
+        x = keras.layers.Conv2D(128, 3, activation='relu', padding='same')(x)
+        x = keras.layers.Conv2D(128, 3, activation='relu', padding='same')(x)
+        x = keras.layers.MaxPooling2D(2)(x)
+
+        # Bottom
+        x = keras.layers.Conv2D(256, 3, activation='relu', padding='same')(x)
+        x = keras.layers.Conv2D(256, 3, activation='relu', padding='same')(x)
+
+        # Decoder
+        x = keras.layers.UpSampling2D(2)(x)
+        x = keras.layers.Conv2D(128, 3, activation='relu', padding='same')(x)
+        x = keras.layers.Conv2D(128, 3, activation='relu', padding='same')(x)
+
+        x = keras.layers.UpSampling2D(2)(x)
+        x = keras.layers.Conv2D(64, 3, activation='relu', padding='same')(x)
+        x = keras.layers.Conv2D(64, 3, activation='relu', padding='same')(x)
+
+        # Output
+        outputs = keras.layers.Conv2D(1, 1, activation='sigmoid', padding='same')(x)
+
+        self.model = keras.Model(inputs, outputs)
+
+        self.logger.info("Dummy model created successfully")
+
+    def warm_up(self, batch_sizes: Sequence[int]):
+        """
+        Trace a fixed-input-signature inference function for each batch size.
+
+        ``model.predict`` builds a data adapter and iterator on every call; a
+        concrete ``tf.function`` skips that fixed overhead. Each function is
+        warmed up here so the first request does not pay for tracing (or XLA
+        compilation). Falls back to ``model.predict`` if tracing fails.
+        """
+        self._inference_functions = {}
+        if not self.compiled or self.model is None:
+            return
+
+        model = self.model
+        height, width, channels = self.input_shape
+
+        def forward(batch):
+            return model(batch, training=False)
+
+        try:
+            for batch_size in batch_sizes:
+                start_time = time.perf_counter()
+                function = tf.function(
+                    forward,
+                    input_signature=[tf.TensorSpec((batch_size, height, width, channels), tf.float32)],
+                    jit_compile=self.xla_compile
+                ).get_concrete_function()
+
+                # Warm up so tracing/compilation happens before serving traffic
+                function(tf.zeros((batch_size, height, width, channels), tf.float32))
+                self._inference_functions[batch_size] = function
+                self.warmed_batch_sizes.append(batch_size)
+
+                self.logger.info(
+                    f"Compiled inference function for batch size {batch_size} "
+                    f"in {time.perf_counter() - start_time:.2f} seconds"
+                )
+        except Exception as e:
+            self.logger.warning(f"Compiled inference unavailable, falling back to model.predict: {str(e)}")
+            self._inference_functions = {}
+            self.warmed_batch_sizes = []
+
+    def run(self, batch: np.ndarray) -> np.ndarray:
+        function = self._inference_functions.get(len(batch))
+        if function is None:
+            return self.model.predict(batch, verbose=0)
+        return function(tf.constant(batch, dtype=tf.float32)).numpy()
+
+    def describe(self) -> dict:
+        return {
+            **super().describe(),
+            "compiled": bool(self._inference_functions),
+            "xla_compile": self.xla_compile
+        }
+
+    def model_details(self) -> dict:
+        if self.model is None:
+            return {}
+        try:
+            return {
+                "model_type": "U-Net",
+                "input_shape": str(self.model.input_shape),
+                "output_shape": str(self.model.output_shape),
+                "total_params": int(self.model.count_params()),
+                "trainable_params": int(sum(keras.backend.count_params(w) for w in self.model.trainable_weights))
+            }
+        except Exception as e:
+            self.logger.warning(f"Could not get detailed model info: {str(e)}")
+            return {}
+
+
+def _load_tflite_interpreter_class():
+    """
+    Return the TFLite Interpreter class from the lightest available runtime.
+
+    ``ai_edge_litert`` and ``tflite_runtime`` avoid importing TensorFlow; the
+    bundled ``tf.lite`` interpreter is the fallback.
+    """
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    return _import_tensorflow().lite.Interpreter
+
+
+class TFLiteBackend(InferenceBackend):
+    """
+    TensorFlow Lite inference backend.
+
+    Runs float16 or full-integer (int8/uint8) models exported by
+    ``scripts/utilities/export_tflite.py`` with the multithreaded XNNPACK CPU
+    delegate. One interpreter is kept per batch size because resizing the
+    input tensor reallocates the whole arena; interpreters are not
+    thread-safe, so invocations are serialized.
+    """
+
+    name = "tflite"
+
+    def __init__(self, model_path: str, num_threads: Optional[int] = None):
+        super().__init__(model_path)
+        self.num_threads = num_threads or os.cpu_count() or 1
+
+        self._interpreter_class = None
+        self._interpreters: Dict[int, object] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def input_shape(self) -> Tuple[int, int, int]:
+        return self._input_shape
+
+    @property
+    def fixed_batch_sizes(self) -> bool:
+        return True
+
+    def load(self):
+        self._interpreter_class = _load_tflite_interpreter_class()
+
+        # Allocate the batch-size-1 interpreter now so a missing or corrupt file fails at load time
+        interpreter = self._get_interpreter(1)
+        input_details = interpreter.get_input_details()[0]
+        output_details = interpreter.get_output_details()[0]
+        self._input_shape = tuple(int(dim) for dim in input_details["shape"][1:])
+        self.input_dtype = np.dtype(input_details["dtype"])
+        self.input_quantization = input_details["quantization"]
+        self.output_dtype = np.dtype(output_details["dtype"])
+        self.output_quantization = output_details["quantization"]
+
+    def _get_interpreter(self, batch_size: int):
+        """Return (creating on first use) the interpreter allocated for ``batch_size``."""
+        interpreter = self._interpreters.get(batch_size)
+        if interpreter is None:
+            interpreter = self._interpreter_class(model_path=self.model_path, num_threads=self.num_threads)
+            input_details = interpreter.get_input_details()[0]
+            if int(input_details["shape"][0]) != batch_size:
+                shape = (batch_size, *(int(dim) for dim in input_details["shape"][1:]))
+                interpreter.resize_tensor_input(input_details["index"], shape)
+            interpreter.allocate_tensors()
+            self._interpreters[batch_size] = interpreter
+        return interpreter
+
+    def _quantize_input(self, batch: np.ndarray) -> np.ndarray:
+        """Convert a float [0, 1] batch to the model's input dtype."""
+        if self.input_dtype == np.float32:
+            return batch.astype(np.float32, copy=False)
+        scale, zero_point = self.input_quantization
+        info = np.iinfo(self.input_dtype)
+        quantized = np.rint(batch / scale + zero_point)
+        return np.clip(quantized, info.min, info.max).astype(self.input_dtype)
+
+    def _dequantize_output(self, output: np.ndarray) -> np.ndarray:
+        """Convert model output to float32 probabilities."""
+        if self.output_dtype == np.float32:
+            return output
+        scale, zero_point = self.output_quantization
+        return (output.astype(np.float32) - zero_point) * scale
+
+    def run(self, batch: np.ndarray) -> np.ndarray:
+        with self._lock:
+            interpreter = self._get_interpreter(len(batch))
+            input_index = interpreter.get_input_details()[0]["index"]
+            output_index = interpreter.get_output_details()[0]["index"]
+            interpreter.set_tensor(input_index, self._quantize_input(batch))
+            interpreter.invoke()
+            output = interpreter.get_tensor(output_index)
+        return self._dequantize_output(output)
+
+    def describe(self) -> dict:
+        return {
+            **super().describe(),
+            "num_threads": self.num_threads,
+            "input_dtype": str(self.input_dtype),
+            "output_dtype": str(self.output_dtype)
+        }
+
+
+class OnnxBackend(InferenceBackend):
+    """
+    ONNX Runtime CPU backend.
+
+    Serves a model converted by ``scripts/utilities/export_onnx.py`` without
+    importing TensorFlow. The exported graph has a dynamic batch dimension,
+    so batches run at their actual size without padding; ``InferenceSession``
+    is thread-safe and runs concurrent batches in parallel.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_path: str, num_threads: Optional[int] = None):
+        super().__init__(model_path)
+        self.num_threads = num_threads or os.cpu_count() or 1
+        self._session = None
+
+    @property
+    def input_shape(self) -> Tuple[int, int, int]:
+        return self._input_shape
+
+    def load(self):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = self.num_threads
+        self._session = ort.InferenceSession(
+            self.model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+
+        model_input = self._session.get_inputs()[0]
+        self._input_name = model_input.name
+        self._input_shape = tuple(int(dim) for dim in model_input.shape[1:])
+
+    def run(self, batch: np.ndarray) -> np.ndarray:
+        output = self._session.run(None, {self._input_name: batch.astype(np.float32, copy=False)})[0]
+        return output.astype(np.float32, copy=False)
+
+    def describe(self) -> dict:
+        return {
+            **super().describe(),
+            "num_threads": self.num_threads,
+            "providers": self._session.get_providers() if self._session is not None else []
+        }
@@ -0,0 +1,137 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+BufferKey = Tuple[Tuple[int, ...], str]
+
+
+class BufferPool:
+    """
+    Shape- and dtype-keyed pool of reusable numpy arrays.
+
+    The per-request arrays of the pipeline (resized input, model tensor,
+    thresholded and full-resolution masks) are acquired here and released
+    once the request is done with them, so a steady stream of same-sized
+    images runs without allocating. Released buffers are kept up to
+    ``max_bytes``; beyond that the least recently used shapes are dropped
+    first. Buffers that are never released are simply garbage collected, so
+    releasing is an optimization, not an obligation. A budget of 0 disables
+    pooling (every acquire allocates).
+
+    Acquired buffers are uninitialized.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max(0, int(max_bytes))
+
+        # key -> idle buffers, in least-recently-released order
+        self._free: "OrderedDict[BufferKey, List[np.ndarray]]" = OrderedDict()
+        self._free_ids: Dict[int, BufferKey] = {}
+        self._lock = threading.Lock()
+        self.free_bytes = 0
+        self.allocations = 0
+        self.allocated_bytes = 0
+        self.reuses = 0
+        self.releases = 0
+        self.evictions = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether released buffers are kept at all."""
+        return self.max_bytes > 0
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """
+        Take an idle buffer of ``shape`` and ``dtype``, allocating one if none is free.
+
+        Args:
+            shape: Array shape
+            dtype: Array dtype
+
+        Returns:
+            Uninitialized C-contiguous array owned by the caller until released
+        """
+        dtype = np.dtype(dtype)
+        key = (tuple(int(side) for side in shape), dtype.str)
+        with self._lock:
+            buffers = self._free.get(key)
+            if buffers:
+                buffer = buffers.pop()
+                if not buffers:
+                    del self._free[key]
+                del self._free_ids[id(buffer)]
+                self.free_bytes -= buffer.nbytes
+                self.reuses += 1
+                return buffer
+
+        buffer = np.empty(key[0], dtype=dtype)
+        with self._lock:
+            self.allocations += 1
+            self.allocated_bytes += buffer.nbytes
+        return buffer
+
+    def release(self, buffer: np.ndarray):
+        """
+        Return a buffer for reuse; the caller must not touch it afterwards.
+
+        Views, non-contiguous arrays and buffers that are already idle are
+        ignored, so a stray double release cannot hand one array to two callers.
+
+        Args:
+            buffer: Array obtained from ``acquire`` (any owned C-contiguous array is accepted)
+        """
+        if not self.enabled or buffer.base is not None or not buffer.flags.c_contiguous:
+            return
+        if buffer.nbytes > self.max_bytes:
+            return
+
+        key = (buffer.shape, buffer.dtype.str)
+        with self._lock:
+            if id(buffer) in self._free_ids:
+                self.logger.warning(f"Ignoring double release of a {buffer.shape} {buffer.dtype} buffer")
+                return
+
+            self._free.setdefault(key, []).append(buffer)
+            self._free.move_to_end(key)
+            self._free_ids[id(buffer)] = key
+            self.free_bytes += buffer.nbytes
+            self.releases += 1
+
+            while self.free_bytes > self.max_bytes:
+                oldest_key, buffers = next(iter(self._free.items()))
+                evicted = buffers.pop(0)
+                if not buffers:
+                    del self._free[oldest_key]
+                del self._free_ids[id(evicted)]
+                self.free_bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all idle buffers (counters are kept)."""
+        with self._lock:
+            self._free.clear()
+            self._free_ids.clear()
+            self.free_bytes = 0
+
+    def get_stats(self) -> dict:
+        """Return pool configuration and counters."""
+        with self._lock:
+            acquires = self.allocations + self.reuses
+            return {
+                "enabled": self.enabled,
+                "max_bytes": self.max_bytes,
+                "free_buffers": len(self._free_ids),
+                "free_bytes": self.free_bytes,
+                "shapes": len(self._free),
+                "allocations": self.allocations,
+                "allocated_bytes": self.allocated_bytes,
+                "reuses": self.reuses,
+                "reuse_ratio": self.reuses / acquires if acquires else None,
+                "releases": self.releases,
+                "evictions": self.evictions
+            }
@@ -0,0 +1,92 @@
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when the inference executor already holds its maximum number of jobs."""
+
+
+class InferenceExecutor:
+    """
+    Size-bounded executor for the blocking prediction pipeline.
+
+    The decode -> preprocess -> infer -> postprocess -> encode chain runs on a
+    dedicated thread pool so the asyncio event loop stays free to serve cheap
+    endpoints. TensorFlow, OpenCV and PIL release the GIL in their heavy
+    kernels, so threads give real parallelism without pickling multi-megabyte
+    images across process boundaries.
+    """
+
+    def __init__(self, max_workers: int = 8, max_pending: int = 64):
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(self.max_workers, max_pending)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="inference"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rejected = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs currently queued or running."""
+        return self._pending
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on the executor and await its result.
+
+        Args:
+            fn: Blocking callable to run
+            *args: Positional arguments for ``fn``
+            **kwargs: Keyword arguments for ``fn``
+
+        Returns:
+            The callable's return value
+
+        Raises:
+            ExecutorSaturatedError: If ``max_pending`` jobs are already queued or running
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise ExecutorSaturatedError(
+                    f"Inference queue is full ({self.max_pending} pending requests)"
+                )
+            self._pending += 1
+
+        # A cancelled caller stops waiting, but a job already running keeps its
+        # thread until it returns, so the slot is released when the job is done
+        try:
+            future = self._executor.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future=None):
+        """Free a pending slot once its job has finished, failed or been cancelled."""
+        with self._lock:
+            self._pending -= 1
+
+    def get_stats(self) -> dict:
+        """Return executor configuration and counters."""
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the underlying thread pool."""
+        self.logger.info("Shutting down inference executor")
+        self._executor.shutdown(wait=wait)
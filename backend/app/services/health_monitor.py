@@ -0,0 +1,77 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+
+class HealthMonitor:
+    """
+    Background health prober for a ModelService.
+
+    Runs the service's dummy-image probe every ``interval`` seconds on its own
+    thread and caches the result, so health endpoints are served from memory
+    and container probes never trigger TensorFlow work.
+    """
+
+    def __init__(self, service, interval: float = 30.0):
+        self.service = service
+        self.interval = max(1.0, interval)
+
+        self._status: Optional[dict] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.logger = logging.getLogger(__name__)
+
+    def start(self):
+        """Start the probe thread if it is not already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the probe thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        self._thread = None
+
+    def probe(self) -> dict:
+        """Run one health check now and cache its result."""
+        probe_with_inference = self.service.is_ready
+        start_time = time.perf_counter()
+        status = self.service.health_check(probe=probe_with_inference)
+        status["checked_at"] = time.time()
+        status["probe_latency"] = time.perf_counter() - start_time if probe_with_inference else None
+
+        with self._lock:
+            self._status = status
+
+        if status.get("test_prediction") == "failed":
+            self.logger.warning(f"Health probe failed: {status.get('test_error')}")
+        return status
+
+    def get_status(self) -> dict:
+        """
+        Return the cached health status.
+
+        Falls back to a probe-free status (no inference) if no probe has run yet.
+        """
+        with self._lock:
+            status = self._status
+        if status is None:
+            status = self.service.health_check(probe=False)
+            status.update({"checked_at": None, "probe_latency": None})
+        return dict(status)
+
+    def _run(self):
+        """Probe on the configured interval; poll faster until the model is ready."""
+        while not self._stop.is_set():
+            try:
+                self.probe()
+            except Exception as e:
+                self.logger.error(f"Health monitor probe raised: {str(e)}")
+            self._stop.wait(self.interval if self.service.is_ready else min(1.0, self.interval))
@@ -0,0 +1,237 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Latency buckets (seconds) from sub-millisecond stages to multi-second tiled requests
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base class: a named metric family with a fixed set of label names."""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        """Render the family in Prometheus text exposition format."""
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """
+    Monotonic counter, optionally labelled.
+
+    Instead of being incremented, a counter can be given a callback returning
+    ``(label_values, value)`` pairs that is read at scrape time; this suits
+    totals already kept elsewhere (cache hits, rejected jobs) and costs
+    nothing on the request path.
+    """
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 callback: Optional[Callable[[], Iterable[Tuple[Tuple[str, ...], float]]]] = None):
+        super().__init__(name, documentation, label_names)
+        self.callback = callback
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        """Increment the series for ``label_values`` by ``amount``."""
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        if self.callback is not None:
+            values = list(self.callback())
+        else:
+            with self._lock:
+                values = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+                for labels, value in values]
+
+
+class Gauge(Counter):
+    """Value that can go up and down; like ``Counter`` it may be read from a callback instead."""
+
+    metric_type = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1.0):
+        """Decrement the series for ``label_values`` by ``amount``."""
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(_Metric):
+    """
+    Bucketed histogram, optionally labelled.
+
+    ``observe`` is a bisect and three additions under a lock; cumulative
+    bucket counts are only computed at scrape time.
+    """
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str):
+        """Record one observation for ``label_values``."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, *label_values: str):
+        """Observe the wall-clock duration of the ``with`` block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            series = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._series.items()]
+
+        lines = []
+        for labels, counts, total, count in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.label_names, labels, ('le', _format_value(bound)))} "
+                    f"{cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metric families rendered together on ``/metrics``."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric family (replacing one with the same name) and return it."""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render every family in Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class StageTimer:
+    """
+    Per-request stage durations.
+
+    Every recorded stage is also observed in ``STAGE_SECONDS``, so the
+    breakdown returned to a client comes from the same measurements as the
+    ``/metrics`` histograms.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        self.durations: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the ``with`` block as stage ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        """Add ``seconds`` to stage ``name`` (repeated stages accumulate)."""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+        STAGE_SECONDS.observe(seconds, name, self.model)
+
+    def milliseconds(self) -> Dict[str, float]:
+        """Return the recorded stages in milliseconds, in the order they ran."""
+        return {name: round(seconds * 1000.0, 3) for name, seconds in self.durations.items()}
+
+
+def server_timing_header(timings: Dict[str, float], total_ms: Optional[float] = None) -> str:
+    """
+    Format stage timings (milliseconds) as a ``Server-Timing`` header value.
+
+    Args:
+        timings: Stage name to duration in milliseconds
+        total_ms: Optional end-to-end duration appended as ``total``
+
+    Returns:
+        Header value such as ``image_decode;dur=3.1, model;dur=42.0``
+    """
+    entries = [f"{name};dur={duration:.3f}" for name, duration in timings.items()]
+    if total_ms is not None:
+        entries.append(f"total;dur={total_ms:.3f}")
+    return ", ".join(entries)
+
+
+# Process-wide registry and the metrics recorded on the request path
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.register(Histogram(
+    "vessel_stage_duration_seconds", "Time spent in each prediction pipeline stage", ("stage", "model")
+))
+REQUEST_SECONDS = registry.register(Histogram(
+    "vessel_http_request_duration_seconds", "HTTP request latency by endpoint", ("method", "endpoint", "status")
+))
+BATCH_SIZE = registry.register(Histogram(
+    "vessel_inference_batch_size", "Images per model forward pass", ("model",),
+    buckets=(1, 2, 4, 8, 16, 32, 64)
+))
+IMAGE_MEGAPIXELS = registry.register(Histogram(
+    "vessel_image_megapixels", "Decoded input image size in megapixels", ("model",),
+    buckets=(0.07, 0.25, 0.5, 1, 2, 4, 8, 12, 16, 24, 50)
+))
+REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "vessel_http_requests_in_flight", "HTTP requests currently being served"
+))
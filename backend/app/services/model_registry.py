@@ -0,0 +1,199 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from .model_service import ModelNotReadyError, ModelService
+
+
+class UnknownModelError(KeyError):
+    """Raised when a request names a model that is not available in the model directory."""
+
+
+class ModelRegistry:
+    """
+    Registry of segmentation models served side by side.
+
+    Models are ``.keras`` files in ``model_dir``: ``<name>.keras`` is served
+    as ``<name>`` (version ``latest``) and ``<name>@<version>.keras`` as
+    ``<name>@<version>``, so fine-tuned variants can sit next to the base
+    model. Non-default models are loaded on first use, each behind its own
+    lock so a load never blocks requests for other models, and kept resident
+    under a memory budget with least-recently-used eviction. The default
+    service is always resident.
+    """
+
+    def __init__(self, default_service: ModelService, model_dir: Optional[str] = None,
+                 memory_budget_mb: float = 2048.0):
+        self.default_service = default_service
+        self.model_dir = model_dir or os.path.dirname(os.path.abspath(default_service.model_path))
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+
+        # Resident non-default models in least-recently-used order
+        self._resident: "OrderedDict[str, ModelService]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self.evictions = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def default_key(self) -> str:
+        """Registry key of the default model."""
+        return self.default_service.model_key
+
+    def available_models(self) -> Dict[str, str]:
+        """
+        Scan the model directory.
+
+        Returns:
+            Mapping of ``name@version`` keys to model file paths
+        """
+        models = {}
+        if os.path.isdir(self.model_dir):
+            for filename in sorted(os.listdir(self.model_dir)):
+                stem, extension = os.path.splitext(filename)
+                if extension != ".keras":
+                    continue
+                name, _, version = stem.partition("@")
+                models[f"{name}@{version or 'latest'}"] = os.path.join(self.model_dir, filename)
+        return models
+
+    def resolve(self, model_name: Optional[str]) -> Tuple[str, Optional[str]]:
+        """
+        Resolve a requested model name to a registry key and file path.
+
+        Args:
+            model_name: ``name`` or ``name@version``; None selects the default model
+
+        Returns:
+            Tuple of (key, path); path is None for the default model
+
+        Raises:
+            UnknownModelError: If no matching model file exists
+        """
+        default_name = self.default_service.model_name
+        if not model_name or model_name in (default_name, self.default_key):
+            return self.default_key, None
+
+        name, _, version = model_name.partition("@")
+        candidates = {
+            key.partition("@")[2]: path
+            for key, path in self.available_models().items()
+            if key.partition("@")[0] == name
+        }
+        if version:
+            if version not in candidates:
+                raise UnknownModelError(f"Unknown model: {model_name}")
+            return f"{name}@{version}", candidates[version]
+        if not candidates:
+            raise UnknownModelError(f"Unknown model: {model_name}")
+
+        # Unversioned file wins, otherwise the highest version
+        version = "latest" if "latest" in candidates else sorted(candidates)[-1]
+        return f"{name}@{version}", candidates[version]
+
+    def get(self, model_name: Optional[str] = None) -> ModelService:
+        """
+        Return the service for a model, loading it on demand.
+
+        Args:
+            model_name: ``name`` or ``name@version``; None selects the default model
+
+        Returns:
+            ModelService for the requested model
+
+        Raises:
+            UnknownModelError: If the model does not exist
+            ModelNotReadyError: If the model failed to load
+        """
+        key, path = self.resolve(model_name)
+        if path is None:
+            return self.default_service
+
+        with self._lock:
+            service = self._resident.get(key)
+            if service is not None:
+                self._resident.move_to_end(key)
+                return service
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Only requests for this model wait while it loads
+        with load_lock:
+            with self._lock:
+                service = self._resident.get(key)
+                if service is not None:
+                    self._resident.move_to_end(key)
+                    return service
+
+            name, _, version = key.partition("@")
+            self.logger.info(f"Loading model {key} from {path}")
+            service = ModelService(
+                model_path=path,
+                model_name=name,
+                model_version=version,
+                load_mode="eager",
+                allow_dummy_fallback=False,
+                buffer_pool=self.default_service.buffer_pool,
+                result_cache=self.default_service.result_cache,
+                single_flight=self.default_service.single_flight
+            )
+            if not service.is_ready:
+                raise ModelNotReadyError(f"Model {key} failed to load: {service.load_error}")
+
+            with self._lock:
+                self._resident[key] = service
+                evicted = self._evict_over_budget(keep=key)
+
+        # In-flight requests keep their reference and finish on the evicted services
+        for evicted_service in evicted:
+            evicted_service.close()
+        return service
+
+    def _evict_over_budget(self, keep: str) -> list:
+        """Drop least-recently-used models until the budget is met (caller holds the lock)."""
+        evicted = []
+        used = self.default_service.memory_bytes + sum(s.memory_bytes for s in self._resident.values())
+        for key in list(self._resident):
+            if used <= self.memory_budget:
+                break
+            if key == keep:
+                continue
+            service = self._resident.pop(key)
+            used -= service.memory_bytes
+            self.evictions += 1
+            self.logger.info(f"Evicting model {key} ({service.memory_bytes / 1e6:.1f} MB) to stay within budget")
+            evicted.append(service)
+        return evicted
+
+    def resident_services(self) -> List[Tuple[str, ModelService]]:
+        """Return ``(key, service)`` pairs for every resident model, default first."""
+        with self._lock:
+            return [(self.default_key, self.default_service)] + list(self._resident.items())
+
+    def get_info(self) -> dict:
+        """
+        Describe resident and available models.
+
+        Returns:
+            Dictionary with the memory budget, usage and per-model load time and memory
+        """
+        resident = self.resident_services()
+
+        return {
+            "default_model": self.default_key,
+            "memory_budget_bytes": self.memory_budget,
+            "memory_used_bytes": sum(service.memory_bytes for _, service in resident),
+            "evictions": self.evictions,
+            "resident": [
+                {
+                    "model": key,
+                    "ready": service.is_ready,
+                    "load_time": service.load_time,
+                    "memory_bytes": service.memory_bytes
+                }
+                for key, service in resident
+            ],
+            "available": sorted(self.available_models())
+        }
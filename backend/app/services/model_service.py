@@ -1,264 +1,887 @@
+import gc
 import os
+import sys
 import time
+import queue
 import logging
-from typing import Optional, Tuple
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence, Tuple
 import numpy as np
-import tensorflow as tf
-from tensorflow import keras
 
+from .. import config
+from .buffer_pool import BufferPool
+from .backends import InferenceBackend, KerasBackend, OnnxBackend, TFLiteBackend, _import_tensorflow
+from .metrics import BATCH_SIZE, IMAGE_MEGAPIXELS, StageTimer
+from .result_cache import ResultCache, hash_pixels
+from .single_flight import SingleFlight
 from ..utils.image_processing import (
-    decode_base64_image, 
+    decode_base64_bytes, 
+    decode_image_bytes,
+    decode_image_bytes_reduced,
     encode_image_to_base64,
     preprocess_image,
     postprocess_mask,
     apply_morphological_operations,
-    calculate_vessel_metrics
+    calculate_vessel_metrics,
+    locate_eye_region
 )
+from ..utils.mask_encoding import MASK_FORMATS, encode_mask, estimate_json_size, mask_to_json
+from ..utils.tiling import count_tiles, tiled_predict
+from ..utils.vessel_morphology import calculate_vessel_morphology
+
+
+class ModelNotReadyError(RuntimeError):
+    """Raised when inference is requested before the model has finished loading."""
+
+
+@dataclass
+class BatchResult:
+    """Result of a single request that was served as part of a micro-batch."""
+    prediction: np.ndarray
+    queue_wait: float
+    compute_time: float
+    batch_size: int
+
+
+@dataclass
+class DecodedImage:
+    """Decoded input pixels, possibly at a reduced resolution, and the size of the original image."""
+    pixels: np.ndarray
+    original_size: Tuple[int, int]
+    scale: int = 1
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching scheduler in front of a model forward pass.
+
+    Requests submitted from any thread are queued; a single worker thread
+    collects them for up to ``max_wait_ms`` (or until ``max_batch_size`` are
+    waiting), stacks the tensors into one batch, runs ``infer_fn`` once and
+    fans the per-item predictions back to the waiting callers.
+    """
+
+    _STOP = object()
+
+    def __init__(self, infer_fn: Callable[[np.ndarray], np.ndarray],
+                 max_batch_size: int = 8, max_wait_ms: float = 5.0):
+        self.infer_fn = infer_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.batches_run = 0
+        self.items_run = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def start(self):
+        """Start the worker thread if it is not already running (no-op once stopped)."""
+        with self._lock:
+            self._start_worker()
+
+    def _start_worker(self):
+        """Start the worker thread; callers hold ``_lock``."""
+        if self._closed:
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._worker, name="micro-batcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stop the worker thread after the already queued requests are served; later submits run inline."""
+        with self._lock:
+            self._closed = True
+            if self._thread is not None and self._thread.is_alive():
+                self._queue.put(self._STOP)
+                self._thread.join()
+            self._thread = None
+
+        # Nothing is queued once closed, but the worker may have left requests
+        # behind its stop marker; serve them here so no caller waits forever
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not self._STOP:
+                leftover.append(item)
+        for start in range(0, len(leftover), self.max_batch_size):
+            self._run_batch(leftover[start:start + self.max_batch_size])
+
+    def submit(self, tensor: np.ndarray) -> Future:
+        """
+        Queue a preprocessed tensor for inference.
+
+        Args:
+            tensor: Model input with a leading batch dimension of 1
+
+        Returns:
+            Future resolving to a BatchResult
+        """
+        future: Future = Future()
+        item = (tensor, future, time.perf_counter())
+        # Checked and queued under the lock stop() takes, so nothing lands behind the stop marker
+        with self._lock:
+            if not self._closed:
+                self._start_worker()
+                self._queue.put(item)
+                return future
+
+        # After stop() late requests run inline instead of restarting the worker
+        self._run_batch([item])
+        return future
+
+    def get_stats(self) -> dict:
+        """Return batching configuration and counters."""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batches_run": self.batches_run,
+            "items_run": self.items_run,
+            "average_batch_size": self.items_run / self.batches_run if self.batches_run else 0.0,
+            "queue_depth": self._queue.qsize()
+        }
+
+    def _worker(self):
+        """Collect queued requests into batches and run them until stopped."""
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+
+            batch = [item]
+            stop_requested = False
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop_requested = True
+                    break
+                batch.append(item)
+
+            self._run_batch(batch)
+            if stop_requested:
+                return
+
+    def _run_batch(self, batch: list):
+        """Run one forward pass for the collected requests and resolve their futures."""
+        start = time.perf_counter()
+        try:
+            stacked = np.concatenate([tensor for tensor, _, _ in batch], axis=0)
+            predictions = self.infer_fn(stacked)
+        except Exception as e:
+            self.logger.error(f"Batched inference failed: {str(e)}")
+            for _, future, _ in batch:
+                if not future.cancelled():
+                    future.set_exception(e)
+            return
+
+        compute_time = time.perf_counter() - start
+        self.batches_run += 1
+        self.items_run += len(batch)
+
+        for index, (_, future, enqueued_at) in enumerate(batch):
+            if not future.cancelled():
+                future.set_result(BatchResult(
+                    prediction=predictions[index:index + 1],
+                    queue_wait=start - enqueued_at,
+                    compute_time=compute_time,
+                    batch_size=len(batch)
+                ))
 
 
 class ModelService:
     """Service for handling U-Net model inference for eye vessel segmentation."""
     
-    def __init__(self, model_path: Optional[str] = None):
-        self.model = None
+    INFERENCE_MODES = ("resize", "tiled")
+    
+    def __init__(self, model_path: Optional[str] = None,
+                 batching_enabled: bool = config.BATCHING_ENABLED,
+                 max_batch_size: int = config.BATCH_MAX_SIZE,
+                 max_wait_ms: float = config.BATCH_MAX_WAIT_MS,
+                 compiled_inference: bool = config.COMPILED_INFERENCE,
+                 xla_compile: bool = config.XLA_COMPILE,
+                 inference_batch_sizes: Sequence[int] = config.INFERENCE_BATCH_SIZES,
+                 load_mode: str = "eager",
+                 ready_timeout: float = config.MODEL_READY_TIMEOUT,
+                 model_name: Optional[str] = None,
+                 model_version: str = "latest",
+                 allow_dummy_fallback: bool = True,
+                 inference_backend: str = config.INFERENCE_BACKEND,
+                 tflite_model_path: Optional[str] = config.TFLITE_MODEL_PATH,
+                 tflite_num_threads: int = config.TFLITE_NUM_THREADS,
+                 onnx_model_path: Optional[str] = config.ONNX_MODEL_PATH,
+                 onnx_num_threads: int = config.ONNX_NUM_THREADS,
+                 inference_mode: str = config.INFERENCE_MODE,
+                 tile_size: int = config.TILE_SIZE,
+                 tile_overlap: int = config.TILE_OVERLAP,
+                 tile_batch_size: int = config.TILE_BATCH_SIZE,
+                 eye_crop: bool = config.EYE_CROP_ENABLED,
+                 eye_crop_margin: float = config.EYE_CROP_MARGIN,
+                 reduced_decode: bool = config.REDUCED_DECODE_ENABLED,
+                 mask_format: str = config.MASK_FORMAT,
+                 geojson_tolerance: float = config.MASK_GEOJSON_TOLERANCE,
+                 vessel_analytics: bool = config.VESSEL_ANALYTICS_ENABLED,
+                 vessel_analytics_max_pixels: int = config.VESSEL_ANALYTICS_MAX_PIXELS,
+                 buffer_pool: Optional[BufferPool] = None,
+                 result_cache: Optional[ResultCache] = None,
+                 single_flight: Optional[SingleFlight] = None):
         self.model_loaded = False
         self.model_path = model_path or os.path.join(
             os.path.dirname(__file__), '../../../data/models/unet_eye_segmentation.keras'
         )
+        self.model_name = model_name or os.path.splitext(os.path.basename(self.model_path))[0]
+        self.model_version = model_version
+        self.allow_dummy_fallback = allow_dummy_fallback
         self.input_size = (256, 256)  # Match the trained model input size
         
+        # Batch sizes the backend is warmed up for (compiled functions, TFLite interpreters)
+        self.max_batch_size = max_batch_size
+        self.compiled_inference = compiled_inference
+        self.xla_compile = xla_compile
+        self.inference_batch_sizes = tuple(sorted({
+            size for size in (*inference_batch_sizes, max_batch_size) if size > 0
+        }))
+        
+        # Inference backend: "keras" runs the Keras model, "tflite" and "onnx"
+        # run artifacts exported from it (see scripts/utilities/)
+        if inference_backend not in ("keras", "tflite", "onnx"):
+            raise ValueError(f"Unknown inference backend: {inference_backend}")
+        self.inference_backend = inference_backend
+        self.tflite_model_path = tflite_model_path or os.path.splitext(self.model_path)[0] + "_float16.tflite"
+        self.tflite_num_threads = tflite_num_threads
+        self.onnx_model_path = onnx_model_path or os.path.splitext(self.model_path)[0] + ".onnx"
+        self.onnx_num_threads = onnx_num_threads
+        self._backend: Optional[InferenceBackend] = None
+        
+        # Tiled inference at native resolution (see app.utils.tiling)
+        if inference_mode not in self.INFERENCE_MODES:
+            raise ValueError(f"Unknown inference mode: {inference_mode}")
+        self.inference_mode = inference_mode
+        # Tiles are fed to the model as they are, and every backend has a fixed input size
+        if tile_size and tile_size != self.input_size[0]:
+            raise ValueError(
+                f"TILE_SIZE must be 0 or the model input size ({self.input_size[0]}), got {tile_size}"
+            )
+        self.tile_size = tile_size or self.input_size[0]
+        self.tile_overlap = min(max(0, tile_overlap), self.tile_size - 1)
+        self.tile_batch_size = max(1, tile_batch_size)
+        
+        # Eye-region pre-screen: crop to the exposed eye before inference
+        self.eye_crop = eye_crop
+        self.eye_crop_margin = eye_crop_margin
+        
+        # JPEG DCT-domain downscaling at decode time when only the model input size is needed
+        self.reduced_decode = reduced_decode
+        
+        # Default wire format of encoded masks (see app.utils.mask_encoding)
+        if mask_format not in MASK_FORMATS:
+            raise ValueError(f"Unknown mask format: {mask_format}")
+        self.mask_format = mask_format
+        self.geojson_tolerance = max(0.0, geojson_tolerance)
+        
+        # Opt-in vessel morphology (length, branching, caliber, tortuosity) in the metrics
+        self.vessel_analytics = vessel_analytics
+        self.vessel_analytics_max_pixels = max(0, vessel_analytics_max_pixels)
+        
+        # Reusable per-request arrays (model tensors, masks), shared across models;
+        # without a pool every request allocates its own
+        self.buffer_pool = buffer_pool if buffer_pool is not None else BufferPool(max_bytes=0)
+        
+        # Encoded results of repeated images and coalescing of identical in-flight
+        # requests, both shared across models (keys include the model)
+        self.result_cache = result_cache
+        self.single_flight = single_flight
+        
         # Configure logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
-        # Load model on initialization
-        self.load_model()
+        # Concurrent requests share forward passes through the micro-batcher
+        self.batcher = MicroBatcher(
+            self._run_inference, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms
+        ) if batching_enabled else None
+        
+        # Load state for the readiness gate
+        self.load_mode = load_mode
+        self.ready_timeout = ready_timeout
+        self.load_state = "pending"
+        self.load_error: Optional[str] = None
+        self.load_started_at: Optional[float] = None
+        self.load_time: Optional[float] = None
+        self._ready = threading.Event()
+        self._load_lock = threading.Lock()
+        self._load_thread: Optional[threading.Thread] = None
+        
+        # Hot reload: a new model is staged, validated and swapped in atomically
+        self.generation = 0
+        self.reload_state = "idle"
+        self.reload_error: Optional[str] = None
+        self.last_reload_at: Optional[float] = None
+        self.last_reload_time: Optional[float] = None
+        self._swap_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._watch_stop = threading.Event()
+        self._watch_thread: Optional[threading.Thread] = None
+        
+        # "eager" loads now, "background" waits for start_loading(),
+        # "lazy" loads on the first inference request
+        if load_mode == "eager":
+            self.load_model()
+        elif load_mode not in ("background", "lazy"):
+            raise ValueError(f"Unknown model load mode: {load_mode}")
+    
+    @property
+    def is_ready(self) -> bool:
+        """Whether the model is loaded and its inference functions are warmed up."""
+        return self._ready.is_set()
+    
+    def start_loading(self):
+        """Load the model on a background thread if it is not loaded or loading already."""
+        with self._load_lock:
+            if self.is_ready or (self._load_thread is not None and self._load_thread.is_alive()):
+                return
+            self._load_thread = threading.Thread(target=self.load_model, name="model-loader", daemon=True)
+            self._load_thread.start()
+    
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the model is ready, starting a load if none is in progress.
+        
+        Args:
+            timeout: Seconds to wait (defaults to ``ready_timeout``)
+            
+        Returns:
+            True if the model is ready, False on timeout
+        """
+        if self.is_ready:
+            return True
+        self.start_loading()
+        return self._ready.wait(self.ready_timeout if timeout is None else timeout)
+    
+    @property
+    def model(self):
+        """The Keras model when serving with the Keras backend, otherwise None."""
+        return getattr(self._backend, "model", None)
+    
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated resident size of the model weights."""
+        return self._backend.memory_bytes if self._backend is not None else 0
+    
+    def close(self):
+        """Stop background work for this model so its memory can be reclaimed once in-flight requests finish."""
+        self.stop_watching()
+        if self.batcher is not None:
+            self.batcher.stop()
+    
+    def reload(self, wait: bool = False) -> dict:
+        """
+        Reload the model file without downtime.
+        
+        The new model is loaded, compiled and warmed up on a background thread,
+        validated with the health probe image and then swapped in atomically.
+        Batches already running finish on the old model, whose memory is
+        released once they drop their references.
+        
+        Args:
+            wait: Block until the reload has finished
+            
+        Returns:
+            Reload status dictionary
+        """
+        with self._reload_lock:
+            if self.reload_state in ("loading", "validating"):
+                return self.get_reload_status()
+            if not self.is_ready:
+                raise ModelNotReadyError(f"Model is not ready yet (state: {self.load_state})")
+            
+            self.reload_state = "loading"
+            self.reload_error = None
+            thread = threading.Thread(target=self._reload, name="model-reloader", daemon=True)
+            thread.start()
+        
+        if wait:
+            thread.join()
+        return self.get_reload_status()
+    
+    def _reload(self):
+        """Stage, validate and swap in a freshly loaded model."""
+        start_time = time.time()
+        try:
+            self.logger.info(f"Reloading model from {self.served_model_path}")
+            staging = ModelService(
+                model_path=self.model_path,
+                batching_enabled=False,
+                max_batch_size=self.max_batch_size,
+                compiled_inference=self.compiled_inference,
+                xla_compile=self.xla_compile,
+                inference_batch_sizes=self.inference_batch_sizes,
+                model_name=self.model_name,
+                model_version=self.model_version,
+                allow_dummy_fallback=False,
+                inference_backend=self.inference_backend,
+                tflite_model_path=self.tflite_model_path,
+                tflite_num_threads=self.tflite_num_threads,
+                onnx_model_path=self.onnx_model_path,
+                onnx_num_threads=self.onnx_num_threads
+            )
+            if not staging.is_ready:
+                raise RuntimeError(staging.load_error or "staged model did not load")
+            
+            self.reload_state = "validating"
+            staging.run_probe()
+            
+            with self._swap_lock:
+                old_backend = self._backend
+                self._backend = staging._backend
+                self.generation += 1
+            
+            # Drop the last service-held references to the old model
+            del old_backend, staging
+            gc.collect()
+            
+            self.last_reload_at = time.time()
+            self.last_reload_time = self.last_reload_at - start_time
+            self.reload_state = "idle"
+            self.logger.info(
+                f"Model reloaded in {self.last_reload_time:.2f} seconds (generation {self.generation})"
+            )
+        except Exception as e:
+            self.logger.error(f"Model reload failed, keeping current model: {str(e)}")
+            self.reload_error = str(e)
+            self.reload_state = "failed"
+    
+    def get_reload_status(self) -> dict:
+        """Return the hot-reload state and the current model generation."""
+        return {
+            "state": self.reload_state,
+            "generation": self.generation,
+            "last_reload_at": self.last_reload_at,
+            "last_reload_time": self.last_reload_time,
+            "error": self.reload_error,
+            "watching": self._watch_thread is not None and self._watch_thread.is_alive()
+        }
+    
+    @property
+    def model_key(self) -> str:
+        """Registry key (``name@version``), also used to label this model's metrics."""
+        return f"{self.model_name}@{self.model_version}"
+    
+    @property
+    def served_model_path(self) -> str:
+        """Path of the model file the active backend serves."""
+        return {
+            "tflite": self.tflite_model_path,
+            "onnx": self.onnx_model_path
+        }.get(self.inference_backend, self.model_path)
+    
+    def _model_file_signature(self) -> Optional[Tuple[float, int]]:
+        """Modification time and size of the served model file, or None if it does not exist."""
+        try:
+            stat = os.stat(self.served_model_path)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size
+    
+    def start_watching(self, interval: float):
+        """
+        Poll the served model file and hot-reload when it changes.
+        
+        A change is only acted on once the file has been stable for one more
+        interval, so a model that is still being copied is not picked up.
+        
+        Args:
+            interval: Poll interval in seconds
+        """
+        if interval <= 0 or (self._watch_thread is not None and self._watch_thread.is_alive()):
+            return
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(
+            target=self._watch, args=(interval,), name="model-watcher", daemon=True
+        )
+        self._watch_thread.start()
+    
+    def stop_watching(self):
+        """Stop polling the model file."""
+        self._watch_stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join(timeout=5.0)
+        self._watch_thread = None
+    
+    def _watch(self, interval: float):
+        """Watcher loop started by start_watching."""
+        current = self._model_file_signature()
+        candidate = None
+        while not self._watch_stop.wait(interval):
+            signature = self._model_file_signature()
+            if signature is None or signature == current:
+                candidate = None
+                continue
+            if signature != candidate:
+                candidate = signature
+                continue
+            if self.is_ready:
+                self.logger.info(f"Model file {self.served_model_path} changed, reloading")
+                self.reload(wait=True)
+            current, candidate = signature, None
+    
+    def get_readiness(self) -> dict:
+        """
+        Report model load progress for the readiness endpoint.
+        
+        Returns:
+            Dictionary with the load state, progress and timings
+        """
+        stages = ["pending", "importing_tensorflow", "loading_model", "compiling", "ready"]
+        progress = stages.index(self.load_state) / (len(stages) - 1) if self.load_state in stages else 0.0
+        if self.load_state == "compiling" and self._backend is not None:
+            progress += len(self._backend.warmed_batch_sizes) / len(self.inference_batch_sizes) / (len(stages) - 1)
+        
+        elapsed = None
+        if self.load_started_at is not None:
+            elapsed = self.load_time if self.load_time is not None else time.time() - self.load_started_at
+        
+        return {
+            "ready": self.is_ready,
+            "state": self.load_state,
+            "progress": round(progress, 3),
+            "elapsed_seconds": elapsed,
+            "error": self.load_error
+        }
     
     def load_model(self) -> bool:
         """
-        Load the U-Net model from file.
+        Load the U-Net model and prepare its hot-path inference functions.
         
         Returns:
             True if model loaded successfully, False otherwise
         """
+        self.load_started_at = time.time()
+        self.load_time = None
+        self.load_error = None
         try:
-            if os.path.exists(self.model_path):
-                self.logger.info(f"Loading model from {self.model_path}")
-                
-                # Try loading with different compatibility options
-                try:
-                    # First try standard loading
-                    self.model = keras.models.load_model(self.model_path)
-                    self.model_loaded = True
-                    self.logger.info("Model loaded successfully with standard method")
-                    return True
-                except Exception as std_error:
-                    self.logger.warning(f"Standard loading failed: {std_error}")
-                    
-                    # Try with custom objects and safe mode
-                    try:
-                        self.model = keras.models.load_model(
-                            self.model_path, 
-                            custom_objects=None,
-                            compile=False,
-                            safe_mode=False
-                        )
-                        # Recompile the model with current Keras
-                        self.model.compile(
-                            optimizer='adam',
-                            loss='binary_crossentropy',
-                            metrics=['accuracy']
-                        )
-                        self.model_loaded = True
-                        self.logger.info("Model loaded successfully with compatibility mode")
-                        return True
-                    except Exception as compat_error:
-                        self.logger.warning(f"Compatibility loading failed: {compat_error}")
-                        
-                        # Try loading weights only approach
-                        try:
-                            self.logger.info("Attempting to create model architecture and load weights")
-                            self._create_unet_model()
-                            # Note: This would require extracting weights from the .keras file
-                            # For now, we'll fall back to dummy model
-                            self.logger.warning("Weight-only loading not implemented, using dummy model")
-                            self._create_dummy_model()
-                            return True
-                        except Exception as weight_error:
-                            self.logger.error(f"Weight loading failed: {weight_error}")
-                            raise weight_error
-            else:
-                self.logger.warning(f"Model file not found at {self.model_path}")
-                # Create a dummy model for testing purposes
-                self._create_dummy_model()
-                return True
+            if self.inference_backend == "keras":
+                self.load_state = "importing_tensorflow"
+                _import_tensorflow()
+            
+            self.load_state = "loading_model"
+            self._backend = self._create_backend()
+            self._backend.load()
+            self.model_loaded = True
+            
+            self.load_state = "compiling"
+            self._backend.warm_up(self.inference_batch_sizes)
         except Exception as e:
-            self.logger.error(f"Failed to load model: {str(e)}")
-            # Fall back to dummy model to keep service running
-            self.logger.info("Falling back to dummy model for continued operation")
-            self._create_dummy_model()
-            return True
+            self.logger.error(f"Model load failed: {str(e)}")
+            self.load_state = "failed"
+            self.load_error = str(e)
+            self.load_time = time.time() - self.load_started_at
+            return False
+        
+        self.load_state = "ready"
+        self.load_time = time.time() - self.load_started_at
+        self._ready.set()
+        self.logger.info(f"Model ready after {self.load_time:.2f} seconds")
+        return True
     
-    def _create_unet_model(self):
-        """Create a U-Net model architecture matching the original trained model."""
-        self.logger.info("Creating U-Net model architecture")
-        
-        inputs = keras.layers.Input(shape=(256, 256, 3))
-        
-        # Encoder (Contracting Path)
-        c1 = keras.layers.Conv2D(64, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(inputs)
-        c1 = keras.layers.Dropout(0.1)(c1)
-        c1 = keras.layers.Conv2D(64, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c1)
-        p1 = keras.layers.MaxPooling2D((2, 2))(c1)
-        
-        c2 = keras.layers.Conv2D(128, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(p1)
-        c2 = keras.layers.Dropout(0.1)(c2)
-        c2 = keras.layers.Conv2D(128, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c2)
-        p2 = keras.layers.MaxPooling2D((2, 2))(c2)
-        
-        c3 = keras.layers.Conv2D(256, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(p2)
-        c3 = keras.layers.Dropout(0.2)(c3)
-        c3 = keras.layers.Conv2D(256, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c3)
-        p3 = keras.layers.MaxPooling2D((2, 2))(c3)
-        
-        c4 = keras.layers.Conv2D(512, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(p3)
-        c4 = keras.layers.Dropout(0.2)(c4)
-        c4 = keras.layers.Conv2D(512, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c4)
-        p4 = keras.layers.MaxPooling2D(pool_size=(2, 2))(c4)
-        
-        # Bottom
-        c5 = keras.layers.Conv2D(1024, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(p4)
-        c5 = keras.layers.Dropout(0.3)(c5)
-        c5 = keras.layers.Conv2D(1024, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c5)
-        
-        # Decoder (Expansive Path)
-        u6 = keras.layers.Conv2DTranspose(512, (2, 2), strides=(2, 2), padding='same')(c5)
-        u6 = keras.layers.concatenate([u6, c4])
-        c6 = keras.layers.Conv2D(512, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(u6)
-        c6 = keras.layers.Dropout(0.2)(c6)
-        c6 = keras.layers.Conv2D(512, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c6)
-        
-        u7 = keras.layers.Conv2DTranspose(256, (2, 2), strides=(2, 2), padding='same')(c6)
-        u7 = keras.layers.concatenate([u7, c3])
-        c7 = keras.layers.Conv2D(256, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(u7)
-        c7 = keras.layers.Dropout(0.2)(c7)
-        c7 = keras.layers.Conv2D(256, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c7)
-        
-        u8 = keras.layers.Conv2DTranspose(128, (2, 2), strides=(2, 2), padding='same')(c7)
-        u8 = keras.layers.concatenate([u8, c2])
-        c8 = keras.layers.Conv2D(128, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(u8)
-        c8 = keras.layers.Dropout(0.1)(c8)
-        c8 = keras.layers.Conv2D(128, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c8)
-        
-        u9 = keras.layers.Conv2DTranspose(64, (2, 2), strides=(2, 2), padding='same')(c8)
-        u9 = keras.layers.concatenate([u9, c1], axis=3)
-        c9 = keras.layers.Conv2D(64, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(u9)
-        c9 = keras.layers.Dropout(0.1)(c9)
-        c9 = keras.layers.Conv2D(64, (3, 3), activation='relu', kernel_initializer='he_normal', padding='same')(c9)
-        
-        # Output
-        outputs = keras.layers.Conv2D(1, (1, 1), activation='sigmoid')(c9)
-        
-        self.model = keras.Model(inputs=[inputs], outputs=[outputs])
-        
-        # Compile the model
-        self.model.compile(
-            optimizer='adam',
-            loss='binary_crossentropy',
-            metrics=['accuracy', 'precision', 'recall']
+    def _create_backend(self) -> InferenceBackend:
+        """Create the configured inference backend for this service's model."""
+        if self.inference_backend == "tflite":
+            self.logger.info(f"Loading TFLite model from {self.tflite_model_path}")
+            return TFLiteBackend(self.tflite_model_path, num_threads=self.tflite_num_threads)
+        if self.inference_backend == "onnx":
+            self.logger.info(f"Loading ONNX model from {self.onnx_model_path}")
+            return OnnxBackend(self.onnx_model_path, num_threads=self.onnx_num_threads)
+        return KerasBackend(
+            self.model_path,
+            compiled=self.compiled_inference,
+            xla_compile=self.xla_compile,
+            allow_dummy_fallback=self.allow_dummy_fallback
         )
+    
+    def _run_inference(self, batch: np.ndarray, backend: Optional[InferenceBackend] = None) -> np.ndarray:
+        """Run a single forward pass over a batch of preprocessed images."""
+        # Snapshot so a concurrent hot reload swaps between batches, never within one
+        if backend is None:
+            with self._swap_lock:
+                backend = self._backend
+        BATCH_SIZE.observe(len(batch), self.model_key)
         
-        self.model_loaded = True
-        self.logger.info("U-Net model architecture created successfully")
-
-    def _create_dummy_model(self):
-        """Create a dummy model for testing when the actual model is not available."""
-        self.logger.info("Creating dummy model for testing")
+        if not backend.fixed_batch_sizes:
+            return backend.run(batch)
         
-        # Simple dummy U-Net architecture
-        inputs = keras.layers.Input(shape=(256, 256, 3))
+        max_size = self.inference_batch_sizes[-1]
+        outputs = []
+        for offset in range(0, len(batch), max_size):
+            chunk = batch[offset:offset + max_size]
+            count = len(chunk)
+            
+            # Pad up to the nearest compiled batch size
+            padded_size = next(size for size in self.inference_batch_sizes if size >= count)
+            if padded_size != count:
+                padding = np.zeros((padded_size - count, *chunk.shape[1:]), dtype=np.float32)
+                chunk = np.concatenate([chunk, padding], axis=0)
+            
+            outputs.append(backend.run(chunk)[:count])
         
-        # Encoder
-        x = keras.layers.Conv2D(64, 3, activation='relu', padding='same')(inputs)
-        x = keras.layers.Conv2D(64, 3, activation='relu', padding='same')(x)
-        x = keras.layers.MaxPooling2D(2)(x)
+        return outputs[0] if len(outputs) == 1 else np.concatenate(outputs, axis=0)
+    
+    def infer(self, preprocessed_image: np.ndarray, batched: bool = True) -> BatchResult:
+        """
+        Run inference for one preprocessed image.
         
-        x = keras.layers.Conv2D(128, 3, activation='relu', padding='same')(x)
-        x = keras.layers.Conv2D(128, 3, activation='relu', padding='same')(x)
-        x = keras.layers.MaxPooling2D(2)(x)
+        Goes through the micro-batcher when batching is enabled so that
+        concurrent callers share a forward pass.
+        
+        Args:
+            preprocessed_image: Model input with a leading batch dimension of 1
+            batched: Use the micro-batcher if enabled; False runs on the calling thread
+            
+        Returns:
+            BatchResult with the prediction, queue wait and compute time
+        """
+        if batched and self.batcher is not None:
+            return self.batcher.submit(preprocessed_image).result()
         
-        # Bottom
-        x = keras.layers.Conv2D(256, 3, activation='relu', padding='same')(x)
-        x = keras.layers.Conv2D(256, 3, activation='relu', padding='same')(x)
+        start_time = time.perf_counter()
+        prediction = self._run_inference(preprocessed_image)
+        return BatchResult(
+            prediction=prediction,
+            queue_wait=0.0,
+            compute_time=time.perf_counter() - start_time,
+            batch_size=1
+        )
+    
+    def infer_tiled(self, image: np.ndarray) -> BatchResult:
+        """
+        Run tiled inference over a full-resolution image.
         
-        # Decoder
-        x = keras.layers.UpSampling2D(2)(x)
-        x = keras.layers.Conv2D(128, 3, activation='relu', padding='same')(x)
-        x = keras.layers.Conv2D(128, 3, activation='relu', padding='same')(x)
+        Tiles bypass the micro-batcher since they already arrive in batches
+        of up to ``tile_batch_size``; all tiles of an image run on the same
+        model even if a hot reload happens meanwhile.
         
-        x = keras.layers.UpSampling2D(2)(x)
-        x = keras.layers.Conv2D(64, 3, activation='relu', padding='same')(x)
-        x = keras.layers.Conv2D(64, 3, activation='relu', padding='same')(x)
+        Args:
+            image: RGB image of shape (H, W, 3)
+            
+        Returns:
+            BatchResult whose prediction is the (H, W) probability map
+        """
+        with self._swap_lock:
+            backend = self._backend
         
-        # Output
-        outputs = keras.layers.Conv2D(1, 1, activation='sigmoid', padding='same')(x)
+        compute_time = 0.0
         
-        self.model = keras.Model(inputs, outputs)
-        self.model_loaded = True
+        def forward(batch: np.ndarray) -> np.ndarray:
+            nonlocal compute_time
+            start = time.perf_counter()
+            output = self._run_inference(batch, backend)
+            compute_time += time.perf_counter() - start
+            return output
         
-        self.logger.info("Dummy model created successfully")
+        probabilities = tiled_predict(
+            image, forward, tile_size=self.tile_size, overlap=self.tile_overlap, batch_size=self.tile_batch_size
+        )
+        return BatchResult(
+            prediction=probabilities,
+            queue_wait=0.0,
+            compute_time=compute_time,
+            batch_size=min(self.tile_batch_size, count_tiles(image.shape, self.tile_size, self.tile_overlap))
+        )
     
-    def predict(self, image_input) -> dict:
+    def _decode_input(self, image_input, timer: StageTimer, reduced: bool = False) -> DecodedImage:
+        """
+        Decode base64 strings and raw encoded bytes; numpy arrays and decoded images pass through.
+        
+        With ``reduced``, JPEGs are decoded at the smallest power-of-two reduction
+        that still covers the model input (see ``decode_image_bytes_reduced``).
+        """
+        if isinstance(image_input, DecodedImage):
+            return image_input
+        if isinstance(image_input, np.ndarray):
+            return DecodedImage(image_input, image_input.shape[:2])
+        if isinstance(image_input, str):
+            with timer.stage("base64_decode"):
+                image_input = decode_base64_bytes(image_input)
+        if not isinstance(image_input, (bytes, bytearray, memoryview)):
+            raise ValueError("Input must be a base64 string, encoded image bytes or numpy array")
+        
+        with timer.stage("image_decode"):
+            if reduced:
+                pixels, original_size, scale = decode_image_bytes_reduced(image_input, self.input_size)
+                decoded = DecodedImage(pixels, original_size, scale)
+            else:
+                pixels = decode_image_bytes(image_input)
+                decoded = DecodedImage(pixels, pixels.shape[:2])
+        height, width = decoded.original_size
+        IMAGE_MEGAPIXELS.observe(height * width / 1e6, self.model_key)
+        return decoded
+    
+    def _use_reduced_decode(self, inference_mode: str, eye_crop: bool) -> bool:
+        """Reduced decoding only applies where the image is squashed to the model input anyway."""
+        return self.reduced_decode and inference_mode == "resize" and not eye_crop
+    
+    def _request_key(self, image: DecodedImage, inference_mode: str, eye_crop: bool, mask_format: str,
+                     vessel_analytics: bool) -> tuple:
+        """Request identity: pixel hash, model (including hot-reload generation) and every output-affecting setting."""
+        return (
+            hash_pixels(image.pixels),
+            image.original_size,
+            self.model_name,
+            self.model_version,
+            self.generation,
+            self.inference_backend,
+            inference_mode,
+            (bool(eye_crop), self.eye_crop_margin if eye_crop else None),
+            inference_mode == "tiled" and (self.tile_size, self.tile_overlap),
+            mask_format,
+            mask_format == "geojson" and self.geojson_tolerance,
+            vessel_analytics and (self.vessel_analytics_max_pixels,)
+        )
+    
+    def predict(self, image_input, inference_mode: Optional[str] = None,
+                eye_crop: Optional[bool] = None, vessel_analytics: Optional[bool] = None,
+                timer: Optional[StageTimer] = None, isolated: bool = False) -> dict:
         """
         Perform vessel segmentation on the input image.
         
         Args:
-            image_input: Either base64 encoded string or numpy array image
+            image_input: Base64 encoded string, encoded image bytes, numpy array image or DecodedImage
+            inference_mode: "resize" or "tiled" (defaults to the service's mode)
+            eye_crop: Crop to the located eye region before inference (defaults to the service's setting)
+            vessel_analytics: Add vessel morphology metrics (defaults to the service's setting)
+            timer: Stage timer to record into (a new one is created if omitted)
+            isolated: Bypass the micro-batcher so the whole pipeline runs on the calling thread
             
         Returns:
-            Dictionary with mask, confidence, and metrics
+            Dictionary with mask, confidence, metrics and per-stage timings in milliseconds.
+            The mask comes from ``buffer_pool``; callers that are done with it can hand
+            it back with ``buffer_pool.release``.
         """
-        if not self.model_loaded:
-            raise RuntimeError("Model not loaded. Please load the model first.")
+        inference_mode = inference_mode or self.inference_mode
+        eye_crop = self.eye_crop if eye_crop is None else eye_crop
+        vessel_analytics = self.vessel_analytics if vessel_analytics is None else vessel_analytics
+        if inference_mode not in self.INFERENCE_MODES:
+            raise ValueError(f"Unknown inference mode: {inference_mode}")
+        
+        if not self.wait_until_ready():
+            raise ModelNotReadyError(f"Model is not ready yet (state: {self.load_state})")
         
         start_time = time.time()
+        timer = timer or StageTimer(self.model_key)
         
         try:
-            # Handle both base64 strings and numpy arrays
-            if isinstance(image_input, str):
-                original_image = decode_base64_image(image_input)
-            elif isinstance(image_input, np.ndarray):
-                original_image = image_input
-            else:
-                raise ValueError("Input must be either base64 string or numpy array")
-                
-            original_size = original_image.shape[:2]
+            decoded = self._decode_input(image_input, timer, self._use_reduced_decode(inference_mode, eye_crop))
+            original_image = decoded.pixels
+            original_size = decoded.original_size
+            
+            self.logger.info(f"Processing image of size: {original_size} (decoded at 1/{decoded.scale})")
             
-            self.logger.info(f"Processing image of size: {original_size}")
+            # Pre-screen: spend the model input on the exposed eye, not lids and background
+            crop_box = None
+            prescreen_time = None
+            region = original_image
+            if eye_crop:
+                prescreen_start = time.perf_counter()
+                crop_box = locate_eye_region(original_image, margin=self.eye_crop_margin)
+                prescreen_time = time.perf_counter() - prescreen_start
+                timer.record("prescreen", prescreen_time)
+                if crop_box is not None:
+                    x, y, width, height = crop_box
+                    region = original_image[y:y + height, x:x + width]
+                    self.logger.info(f"Cropped to eye region {crop_box} in {prescreen_time * 1000:.1f} ms")
+            # A reduced decode still yields a mask at the original resolution
+            region_size = region.shape[:2] if crop_box is not None else original_size
             
-            # Preprocess for model
-            preprocessed_image = preprocess_image(original_image, self.input_size)
+            if inference_mode == "tiled":
+                # Native-resolution tiles blended into a full-size probability map
+                self.logger.info(f"Running tiled inference ({self.tile_size}px tiles, {self.tile_overlap}px overlap)")
+                inference = self.infer_tiled(region)
+            else:
+                # Preprocess for model into pooled buffers
+                pool = self.buffer_pool
+                with timer.stage("preprocess"):
+                    resized = pool.acquire((*self.input_size, region.shape[2]), np.uint8)
+                    preprocessed_image = preprocess_image(
+                        region, self.input_size,
+                        out=pool.acquire((1, *self.input_size, region.shape[2]), np.float32), resized=resized
+                    )
+                    pool.release(resized)
+                
+                # Run inference; the tensor has been consumed (batched or not) once it returns
+                self.logger.info("Running model inference")
+                inference = self.infer(preprocessed_image, batched=not isolated)
+                pool.release(preprocessed_image)
+            prediction = inference.prediction
+            timer.record("queue_wait", inference.queue_wait)
+            timer.record("model", inference.compute_time)
             
-            # Run inference
-            self.logger.info("Running model inference")
-            prediction = self.model.predict(preprocessed_image, verbose=0)
+            # Postprocess the prediction (threshold, resize) into a pooled full-size mask
+            with timer.stage("postprocess_mask"):
+                thresholded = self.buffer_pool.acquire(self.input_size, np.uint8) if inference_mode == "resize" else None
+                segmentation_mask = postprocess_mask(
+                    prediction, region_size, out=self.buffer_pool.acquire(region_size, np.uint8),
+                    thresholded=thresholded
+                )
+                if thresholded is not None:
+                    self.buffer_pool.release(thresholded)
             
-            # Postprocess the prediction
-            segmentation_mask = postprocess_mask(prediction, original_size)
+            # Apply morphological operations to clean up the mask, in place
+            with timer.stage("morphology"):
+                cleaned_mask = apply_morphological_operations(segmentation_mask, dst=segmentation_mask)
             
-            # Apply morphological operations to clean up the mask
-            cleaned_mask = apply_morphological_operations(segmentation_mask)
+            # Map a cropped mask back into the original frame (no vessels outside the crop)
+            if crop_box is not None:
+                frame_mask = self.buffer_pool.acquire(original_size, np.uint8)
+                frame_mask.fill(0)
+                frame_mask[y:y + height, x:x + width] = cleaned_mask
+                self.buffer_pool.release(cleaned_mask)
+                cleaned_mask = frame_mask
             
             # Calculate confidence score (average prediction confidence)
             confidence_score = float(np.mean(prediction))
             
             # Calculate vessel metrics
-            metrics = calculate_vessel_metrics(cleaned_mask)
+            with timer.stage("vessel_metrics"):
+                metrics = calculate_vessel_metrics(cleaned_mask)
+            if vessel_analytics:
+                with timer.stage("vessel_analytics"):
+                    metrics['morphology'] = calculate_vessel_morphology(
+                        cleaned_mask, max_pixels=self.vessel_analytics_max_pixels
+                    )
             
             processing_time = time.time() - start_time
             metrics['processing_time'] = processing_time
+            metrics['queue_time'] = inference.queue_wait
+            metrics['inference_time'] = inference.compute_time
+            metrics['batch_size'] = inference.batch_size
+            metrics['inference_mode'] = inference_mode
+            metrics['decode_scale'] = decoded.scale
+            if inference_mode == "tiled":
+                metrics['tile_count'] = count_tiles(region_size, self.tile_size, self.tile_overlap)
+            crop = dict(zip(("x", "y", "width", "height"), crop_box)) if crop_box is not None else None
+            metrics['crop_box'] = crop
+            metrics['prescreen_time'] = prescreen_time
             
-            self.logger.info(f"Inference completed in {processing_time:.2f} seconds")
+            self.logger.info(
+                f"Inference completed in {processing_time:.2f} seconds "
+                f"(queue {inference.queue_wait * 1000:.1f} ms, model {inference.compute_time * 1000:.1f} ms, "
+                f"batch of {inference.batch_size})"
+            )
             self.logger.info(f"Vessel coverage: {metrics['vessel_percentage']:.2f}%")
             
             return {
@@ -266,7 +889,15 @@ class ModelService:
                 "mask": cleaned_mask,
                 "confidence": confidence_score,
                 "processing_time": processing_time,
+                "queue_time": inference.queue_wait,
+                "inference_time": inference.compute_time,
+                "batch_size": inference.batch_size,
+                "inference_mode": inference_mode,
+                "decode_scale": decoded.scale,
+                "crop_box": crop,
+                "prescreen_time": prescreen_time,
                 "vessel_metrics": metrics,
+                "timings": timer.milliseconds(),
                 "message": "Segmentation completed successfully"
             }
             
@@ -274,43 +905,141 @@ class ModelService:
             self.logger.error(f"Prediction failed: {str(e)}")
             raise
     
-    def predict_and_encode(self, image_input) -> dict:
+    def predict_and_encode(self, image_input, inference_mode: Optional[str] = None,
+                           eye_crop: Optional[bool] = None, mask_format: Optional[str] = None,
+                           vessel_analytics: Optional[bool] = None, isolated: bool = False) -> dict:
         """
-        Perform prediction and return results with base64 encoded mask.
+        Perform prediction and return results with the mask encoded for JSON.
         
         Args:
-            image_input: Either base64 encoded string or numpy array image
+            image_input: Base64 encoded string, encoded image bytes or numpy array image
+            inference_mode: "resize" or "tiled" (defaults to the service's mode)
+            eye_crop: Crop to the located eye region before inference (defaults to the service's setting)
+            mask_format: One of ``MASK_FORMATS`` (defaults to the service's format); RLE and GeoJSON
+                masks are returned as dictionaries, the others as base64 data URIs
+            vessel_analytics: Add vessel morphology metrics (defaults to the service's setting)
+            isolated: Run the full pipeline on the calling thread, bypassing the micro-batcher,
+                result cache and request coalescing (used for profiling)
             
         Returns:
-            Dictionary containing prediction results with base64 encoded mask
+            Dictionary containing prediction results with the encoded mask
         """
+        if not self.wait_until_ready():
+            raise ModelNotReadyError(f"Model is not ready yet (state: {self.load_state})")
+        
         try:
-            # Get prediction
-            result = self.predict(image_input)
+            start_time = time.time()
+            timer = StageTimer(self.model_key)
+            inference_mode = inference_mode or self.inference_mode
+            eye_crop = self.eye_crop if eye_crop is None else eye_crop
+            mask_format = mask_format or self.mask_format
+            if mask_format not in MASK_FORMATS:
+                raise ValueError(f"Unknown mask format: {mask_format}")
+            vessel_analytics = self.vessel_analytics if vessel_analytics is None else vessel_analytics
+            original_image = self._decode_input(image_input, timer, self._use_reduced_decode(inference_mode, eye_crop))
             
-            # Encode mask to base64
-            mask_base64 = encode_image_to_base64(result['mask'], format="PNG")
+            cache = self.result_cache if self.result_cache is not None and self.result_cache.enabled else None
+            if isolated or (cache is None and self.single_flight is None):
+                result = self._predict_encoded(
+                    original_image, inference_mode, eye_crop, mask_format, vessel_analytics, timer, isolated=isolated
+                )
+                result["processing_time"] = time.time() - start_time
+                return result
+            request_key = self._request_key(original_image, inference_mode, eye_crop, mask_format, vessel_analytics)
             
-            return {
-                "success": True,
-                "segmentation_mask": mask_base64,
-                "confidence_score": result['confidence'],
-                "processing_time": result['processing_time'],
-                "vessel_metrics": result['vessel_metrics'],
-                "message": "Segmentation completed successfully"
-            }
+            # Serve repeated images from the result cache
+            if cache is not None:
+                cached = cache.get(request_key)
+                if cached is not None:
+                    cached.update({
+                        "processing_time": time.time() - start_time,
+                        "queue_time": 0.0,
+                        "inference_time": 0.0,
+                        "timings": timer.milliseconds(),
+                        "cached": True
+                    })
+                    return cached
+            
+            if self.single_flight is None:
+                result = self._predict_encoded(
+                    original_image, inference_mode, eye_crop, mask_format, vessel_analytics, timer, request_key
+                )
+            else:
+                # Identical requests already in flight share that computation
+                result, shared = self.single_flight.do(
+                    request_key,
+                    lambda: self._predict_encoded(
+                        original_image, inference_mode, eye_crop, mask_format, vessel_analytics, timer, request_key
+                    )
+                )
+                if shared:
+                    # Own decode timings; the remaining stages are those of the shared computation
+                    result["timings"].update(timer.milliseconds())
             
+            # End to end, including decoding and mask encoding
+            result["processing_time"] = time.time() - start_time
+            return result
+            
+        except ModelNotReadyError:
+            raise
         except Exception as e:
             self.logger.error(f"Prediction and encoding failed: {str(e)}")
             return {
                 "success": False,
                 "segmentation_mask": None,
+                "mask_format": None,
+                "mask_shape": None,
                 "confidence_score": None,
                 "processing_time": None,
+                "queue_time": None,
+                "inference_time": None,
+                "crop_box": None,
+                "prescreen_time": None,
+                "decode_scale": None,
                 "vessel_metrics": None,
+                "timings": None,
+                "cached": False,
                 "message": f"Prediction failed: {str(e)}"
             }
     
+    def _predict_encoded(self, image: DecodedImage, inference_mode: str, eye_crop: bool, mask_format: str,
+                         vessel_analytics: bool, timer: StageTimer, request_key: Optional[tuple] = None,
+                         isolated: bool = False) -> dict:
+        """Run the prediction, encode the mask in ``mask_format`` and cache the result under ``request_key``."""
+        result = self.predict(
+            image, inference_mode=inference_mode, eye_crop=eye_crop, vessel_analytics=vessel_analytics,
+            timer=timer, isolated=isolated
+        )
+        
+        # Encode the mask for the JSON response; the mask itself goes back to the pool
+        mask = result.pop('mask')
+        with timer.stage("mask_encode"):
+            mask_json = mask_to_json(encode_mask(mask, mask_format, self.geojson_tolerance), mask_format)
+        mask_shape = list(mask.shape)
+        self.buffer_pool.release(mask)
+        
+        encoded = {
+            "success": True,
+            "segmentation_mask": mask_json,
+            "mask_format": mask_format,
+            "mask_shape": mask_shape,
+            "confidence_score": result['confidence'],
+            "processing_time": result['processing_time'],
+            "queue_time": result['queue_time'],
+            "inference_time": result['inference_time'],
+            "crop_box": result['crop_box'],
+            "prescreen_time": result['prescreen_time'],
+            "decode_scale": result['decode_scale'],
+            "vessel_metrics": result['vessel_metrics'],
+            "timings": timer.milliseconds(),
+            "cached": False,
+            "message": "Segmentation completed successfully"
+        }
+        if request_key is not None and self.result_cache is not None:
+            # The encoded mask dominates; metrics and keys are a small fixed overhead
+            self.result_cache.put(request_key, encoded, size=estimate_json_size(mask_json) + 1024)
+        return encoded
+    
     def get_model_info(self) -> dict:
         """
         Get information about the loaded model.
@@ -319,50 +1048,84 @@ class ModelService:
             Dictionary containing model information
         """
         info = {
+            "model_name": self.model_name,
+            "model_version": self.model_version,
             "model_loaded": self.model_loaded,
+            "load_state": self.load_state,
+            "load_time": self.load_time,
+            "memory_bytes": self.memory_bytes,
+            "reload": self.get_reload_status(),
             "model_path": self.model_path,
-            "input_size": self.input_size
+            "input_size": self.input_size,
+            "inference_mode": self.inference_mode,
+            "eye_crop": self.eye_crop,
+            "mask_format": self.mask_format,
+            "geojson_tolerance": self.geojson_tolerance,
+            "vessel_analytics": self.vessel_analytics,
+            "vessel_analytics_max_pixels": self.vessel_analytics_max_pixels,
+            "buffer_pool": self.buffer_pool.get_stats(),
+            "tiling": {
+                "tile_size": self.tile_size,
+                "overlap": self.tile_overlap,
+                "batch_size": self.tile_batch_size
+            },
+            "inference": self._backend.describe() if self._backend is not None else {
+                "backend": self.inference_backend
+            },
+            "batching": self.batcher.get_stats() if self.batcher is not None else None,
+            "result_cache": self.result_cache.get_stats() if self.result_cache is not None else None,
+            "single_flight": self.single_flight.get_stats() if self.single_flight is not None else None
         }
         
-        if self.model_loaded and self.model:
-            try:
-                info.update({
-                    "model_type": "U-Net",
-                    "input_shape": str(self.model.input_shape),
-                    "output_shape": str(self.model.output_shape),
-                    "total_params": int(self.model.count_params()),
-                    "trainable_params": int(sum([tf.keras.backend.count_params(w) for w in self.model.trainable_weights]))
-                })
-            except Exception as e:
-                self.logger.warning(f"Could not get detailed model info: {str(e)}")
+        if self.model_loaded and self._backend is not None:
+            info.update(self._backend.model_details())
         
         return info
     
-    def health_check(self) -> dict:
+    def run_probe(self) -> float:
+        """
+        Run the health probe prediction on a dummy image.
+        
+        Returns:
+            Probe latency in seconds
+        """
+        # Create a dummy image (small black square)
+        dummy_image = np.zeros((100, 100, 3), dtype=np.uint8)
+        dummy_base64 = encode_image_to_base64(dummy_image, format="PNG")
+        
+        # Test prediction
+        start_time = time.time()
+        self.buffer_pool.release(self.predict(dummy_base64)["mask"])
+        return time.time() - start_time
+    
+    def health_check(self, probe: bool = True) -> dict:
         """
         Perform a health check on the model service.
         
+        Args:
+            probe: Whether to run a dummy-image prediction when the model is ready
+            
         Returns:
             Dictionary containing health status
         """
+        if self.is_ready:
+            service_status = "healthy"
+        elif self.load_state == "failed":
+            service_status = "unhealthy"
+        else:
+            service_status = "starting"
+        
         status = {
-            "status": "healthy" if self.model_loaded else "unhealthy",
-            "model_loaded": self.model_loaded,
-            "model_path_exists": os.path.exists(self.model_path),
-            "tensorflow_version": tf.__version__
+            "status": service_status,
+            "model_loaded": self.is_ready,
+            "model_path_exists": os.path.exists(self.served_model_path),
+            "tensorflow_version": getattr(sys.modules.get("tensorflow"), "__version__", None)
         }
         
-        # Test prediction with a dummy image if model is loaded
-        if self.model_loaded:
+        # Test prediction with a dummy image if model is ready
+        if probe and self.is_ready:
             try:
-                # Create a dummy image (small black square)
-                dummy_image = np.zeros((100, 100, 3), dtype=np.uint8)
-                dummy_base64 = encode_image_to_base64(dummy_image, format="PNG")
-                
-                # Test prediction
-                start_time = time.time()
-                self.predict(dummy_base64)
-                test_time = time.time() - start_time
+                test_time = self.run_probe()
                 
                 status.update({
                     "test_prediction": "passed",
@@ -375,7 +1138,3 @@ class ModelService:
                 })
         
         return status
-
-
-# Global model service instance
-model_service = ModelService()
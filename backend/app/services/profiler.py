@@ -0,0 +1,177 @@
+import cProfile
+import logging
+import os
+import pstats
+import re
+import shutil
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Callable, Optional, Tuple
+
+# Directory names written by RequestProfiler.run: <date>-<time>-<8 hex digits>
+_PROFILE_ID = re.compile(r"^\d{8}-\d{6}-[0-9a-f]{8}$")
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profiled request is requested while another one is running."""
+
+
+class RequestProfiler:
+    """
+    Profile single requests on demand.
+
+    The request runs under ``cProfile`` on the calling thread and, when
+    TensorFlow is loaded, under the TensorFlow profiler. Both profilers are
+    process-wide resources, so one profiled request runs at a time; other
+    requests are not profiled and keep their normal path. Each run is stored
+    in ``output_dir/<profile_id>/``: ``request.pstats`` (readable with
+    ``pstats``, snakeviz or flameprof) and ``tf_trace/`` (a TensorBoard
+    profile with the TF op trace). Only the newest ``max_profiles`` runs are
+    kept; older ones are deleted when a new one is written.
+    """
+
+    def __init__(self, output_dir: str, tf_trace: bool = True, top_functions: int = 25,
+                 max_profiles: int = 20):
+        self.output_dir = output_dir
+        self.tf_trace = tf_trace
+        self.top_functions = top_functions
+        self.max_profiles = max_profiles
+
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.pruned = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def run(self, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, dict]:
+        """
+        Call ``fn`` under the profilers.
+
+        Args:
+            fn: Callable to profile; it should do all its work on the calling thread
+            *args: Positional arguments for ``fn``
+            **kwargs: Keyword arguments for ``fn``
+
+        Returns:
+            Tuple of (the callable's return value, profile summary)
+
+        Raises:
+            ProfilerBusyError: If another profiled request is running
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("Another request is being profiled; retry shortly")
+
+        try:
+            profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+            profile_dir = os.path.join(self.output_dir, profile_id)
+            os.makedirs(profile_dir, exist_ok=True)
+
+            tf_trace_dir = self._start_tf_trace(profile_dir)
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                profiler.disable()
+                wall_time = time.perf_counter() - start
+                tf_trace_dir = self._stop_tf_trace(tf_trace_dir)
+
+            pstats_path = os.path.join(profile_dir, "request.pstats")
+            profiler.dump_stats(pstats_path)
+            self.runs += 1
+            self._prune(keep=profile_id)
+            self.logger.info(f"Profiled request {profile_id} ({wall_time * 1000:.1f} ms) into {profile_dir}")
+
+            return result, {
+                "profile_id": profile_id,
+                "wall_time": wall_time,
+                "pstats_file": os.path.basename(pstats_path),
+                "tf_trace": tf_trace_dir is not None,
+                "top_functions": self._top_functions(profiler)
+            }
+        finally:
+            self._lock.release()
+
+    def pstats_path(self, profile_id: str) -> Optional[str]:
+        """Path of a stored ``request.pstats``, or None for unknown (or malformed) ids."""
+        if not profile_id or os.path.basename(profile_id) != profile_id or profile_id.startswith("."):
+            return None
+        path = os.path.join(self.output_dir, profile_id, "request.pstats")
+        return path if os.path.isfile(path) else None
+
+    def get_stats(self) -> dict:
+        """Return profiler configuration and counters."""
+        return {
+            "output_dir": self.output_dir,
+            "tf_trace": self.tf_trace,
+            "runs": self.runs,
+            "max_profiles": self.max_profiles,
+            "pruned": self.pruned,
+            "busy": self._lock.locked()
+        }
+
+    def _prune(self, keep: str):
+        """Delete the oldest stored profiles beyond ``max_profiles`` (0 keeps all)."""
+        if self.max_profiles <= 0:
+            return
+        try:
+            names = [name for name in os.listdir(self.output_dir) if _PROFILE_ID.match(name)]
+        except OSError as e:
+            self.logger.warning(f"Could not list stored profiles: {str(e)}")
+            return
+
+        # Ids start with the capture time; mtime orders runs within the same second
+        def capture_order(name):
+            try:
+                return name[:15], os.path.getmtime(os.path.join(self.output_dir, name))
+            except OSError:
+                return name[:15], 0.0
+
+        names.sort(key=capture_order)
+        stale = [name for name in names[:-self.max_profiles] if name != keep]
+        for name in stale:
+            shutil.rmtree(os.path.join(self.output_dir, name), ignore_errors=True)
+        self.pruned += len(stale)
+        if stale:
+            self.logger.info(f"Deleted {len(stale)} old profile(s) from {self.output_dir}")
+
+    def _start_tf_trace(self, profile_dir: str) -> Optional[str]:
+        """Start the TF profiler if TensorFlow is in use (ONNX/TFLite serving never imports it)."""
+        if not self.tf_trace or "tensorflow" not in sys.modules:
+            return None
+        tf = sys.modules["tensorflow"]
+        trace_dir = os.path.join(profile_dir, "tf_trace")
+        try:
+            tf.profiler.experimental.start(trace_dir)
+            return trace_dir
+        except Exception as e:
+            self.logger.warning(f"TensorFlow profiler unavailable: {str(e)}")
+            return None
+
+    def _stop_tf_trace(self, trace_dir: Optional[str]) -> Optional[str]:
+        """Stop the TF profiler, writing the trace; returns None if nothing was traced."""
+        if trace_dir is None:
+            return None
+        try:
+            sys.modules["tensorflow"].profiler.experimental.stop()
+            return trace_dir
+        except Exception as e:
+            self.logger.warning(f"Failed to stop TensorFlow profiler: {str(e)}")
+            return None
+
+    def _top_functions(self, profiler: cProfile.Profile) -> list:
+        """Functions with the most cumulative time, for a quick look without downloading the pstats."""
+        stats = pstats.Stats(profiler)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top_functions]
+        return [
+            {
+                "function": f"{os.path.basename(filename)}:{line}({name})" if line else name,
+                "calls": calls,
+                "total_time": total_time,
+                "cumulative_time": cumulative_time
+            }
+            for (filename, line, name), (_, calls, total_time, cumulative_time, _) in rows
+        ]
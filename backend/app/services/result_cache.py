@@ -0,0 +1,131 @@
+import copy
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+import numpy as np
+
+
+def hash_pixels(image: np.ndarray) -> str:
+    """
+    Content hash of decoded image pixels.
+
+    Shape and dtype are part of the hash, so the same bytes reshaped do not
+    collide; re-encoding an image (PNG vs JPEG metadata, base64 vs upload)
+    does not change it as long as the pixels are identical.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.shape}:{image.dtype}".encode())
+    digest.update(memoryview(np.ascontiguousarray(image)).cast("B"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Byte-budgeted LRU cache with TTL for encoded prediction results.
+
+    Entries are charged their approximate size (mostly the base64 mask) and
+    evicted least-recently-used first once ``max_bytes`` is exceeded; entries
+    older than ``ttl`` seconds are treated as misses and dropped. A budget of
+    0 disables the cache.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 600.0):
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl = ttl
+
+        # key -> (stored_at, size, value), in least-recently-used order
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether results are cached at all."""
+        return self.max_bytes > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            A copy of the cached value, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, size, value = entry
+            if self.ttl > 0 and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.current_bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: Hashable, value: Any, size: int):
+        """
+        Store a value, evicting least-recently-used entries to stay within budget.
+
+        Args:
+            key: Cache key
+            value: Value to cache (copied on ``put`` and on every ``get``)
+            size: Approximate size of the value in bytes
+        """
+        if not self.enabled or size > self.max_bytes:
+            return
+
+        value = copy.deepcopy(value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+
+            self._entries[key] = (time.monotonic(), size, value)
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def get_stats(self) -> dict:
+        """Return cache configuration and counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
@@ -0,0 +1,70 @@
+import copy
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls into one execution.
+
+    The first caller for a key runs the function; callers arriving with the
+    same key while it is still running wait for that result instead of
+    running their own, so a retry storm of N identical requests costs one
+    inference. Exceptions are propagated to every waiter.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run ``fn`` once per in-flight ``key``.
+
+        Args:
+            key: Identity of the call (content hash and parameters)
+            fn: Callable producing the result
+
+        Returns:
+            Tuple of (result, shared); ``shared`` is True when the result came
+            from another caller's execution (each waiter gets its own copy)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None:
+                future = Future()
+                self._calls[key] = future
+                self.executions += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            return copy.deepcopy(future.result()), True
+
+        try:
+            result = fn()
+            future.set_result(copy.deepcopy(result))
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def get_stats(self) -> dict:
+        """Return in-flight and coalescing counters."""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executions": self.executions,
+                "coalesced": self.coalesced
+            }
@@ -3,41 +3,112 @@ import io
 import numpy as np
 from PIL import Image
 import cv2
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 
 
-def decode_base64_image(base64_string: str) -> np.ndarray:
+def decode_base64_bytes(base64_string: str) -> bytes:
     """
-    Decode base64 encoded image string to numpy array.
+    Decode a base64 encoded image string to the encoded image bytes.
     
     Args:
         base64_string: Base64 encoded image (with or without data URI prefix)
         
     Returns:
-        numpy array representing the image in RGB format
+        Encoded image file contents
     """
     try:
         # Remove data URI prefix if present
         if base64_string.startswith('data:'):
             base64_string = base64_string.split(',')[1]
         
-        # Decode base64 to bytes
-        image_bytes = base64.b64decode(base64_string)
+        return base64.b64decode(base64_string)
+    
+    except Exception as e:
+        raise ValueError(f"Failed to decode base64 image: {str(e)}")
+
+
+def decode_base64_image(base64_string: str) -> np.ndarray:
+    """
+    Decode base64 encoded image string to numpy array.
+    
+    Args:
+        base64_string: Base64 encoded image (with or without data URI prefix)
+        
+    Returns:
+        Read-only numpy array representing the image in RGB format (see ``decode_image_bytes``)
+    """
+    try:
+        return decode_image_bytes(decode_base64_bytes(base64_string))
+    
+    except Exception as e:
+        raise ValueError(f"Failed to decode base64 image: {str(e)}")
+
+
+def decode_image_bytes(image_bytes: Union[bytes, bytearray, memoryview]) -> np.ndarray:
+    """
+    Decode raw encoded image bytes (JPEG, PNG, ...) to numpy array.
+    
+    The array wraps the immutable bytes object Pillow exports the decoded
+    pixels into, without a second copy, so it is read-only; callers that
+    modify the image must copy it first.
+    
+    Args:
+        image_bytes: Encoded image file contents
         
-        # Convert bytes to PIL Image
+    Returns:
+        Read-only numpy array representing the image in RGB format
+    """
+    try:
+        # BytesIO copies the encoded bytes; decoding happens lazily below
         image = Image.open(io.BytesIO(image_bytes))
         
         # Convert to RGB if not already
         if image.mode != 'RGB':
             image = image.convert('RGB')
         
-        # Convert to numpy array
-        image_array = np.array(image)
+        # Read-only view of the decoded bytes (np.array would copy them again)
+        image_array = np.asarray(image)
         
         return image_array
     
     except Exception as e:
-        raise ValueError(f"Failed to decode base64 image: {str(e)}")
+        raise ValueError(f"Failed to decode image bytes: {str(e)}")
+
+
+def decode_image_bytes_reduced(image_bytes: Union[bytes, bytearray, memoryview],
+                               min_size: Tuple[int, int]) -> Tuple[np.ndarray, Tuple[int, int], int]:
+    """
+    Decode encoded image bytes at a reduced resolution where the codec allows it.
+    
+    JPEGs are decoded with DCT-domain scaling at the largest power-of-two
+    reduction (1/2, 1/4 or 1/8) that keeps both sides at least ``min_size``,
+    so the full-resolution RGB array is never materialized and most of the
+    IDCT and colour conversion work is skipped. Other formats are decoded at
+    full resolution.
+    
+    Args:
+        image_bytes: Encoded image file contents
+        min_size: Smallest acceptable decoded size (height, width)
+        
+    Returns:
+        Tuple of (read-only RGB numpy array, original size (height, width), decode scale denominator)
+    """
+    try:
+        image = Image.open(io.BytesIO(image_bytes))
+        original_width, original_height = image.size
+        
+        # Only configures the decoder; nothing has been decoded yet
+        if image.format == "JPEG":
+            image.draft('RGB', (min_size[1], min_size[0]))
+        
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        
+        scale = max(1, round(original_width / image.size[0]))
+        return np.asarray(image), (original_height, original_width), scale
+    
+    except Exception as e:
+        raise ValueError(f"Failed to decode image bytes: {str(e)}")
 
 
 def encode_image_to_base64(image: np.ndarray, format: str = "PNG") -> str:
@@ -80,44 +151,138 @@ def encode_image_to_base64(image: np.ndarray, format: str = "PNG") -> str:
         raise ValueError(f"Failed to encode image to base64: {str(e)}")
 
 
-def preprocess_image(image: np.ndarray, target_size: Tuple[int, int] = (512, 512)) -> np.ndarray:
+def locate_eye_region(image: np.ndarray, analysis_size: int = 128, margin: float = 0.1,
+                      min_area_fraction: float = 0.01) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Locate the exposed-eye region of a slit-lamp frame.
+    
+    Works on a downsampled copy: the sclera is the bright, weakly saturated
+    part of the frame. An Otsu threshold on brightness drops the dark
+    background, and a second one on ``value - saturation`` (HSV) over the
+    remaining pixels separates the sclera from eyelid skin. The box around
+    the large sclera components (which also encloses the iris between
+    them) is padded by ``margin`` and mapped back to full resolution.
+    
+    Args:
+        image: RGB image of shape (H, W, 3)
+        analysis_size: Longest side of the downsampled copy
+        margin: Padding added on each side, as a fraction of the box size
+        min_area_fraction: Minimum sclera area (fraction of the frame) to trust the result
+        
+    Returns:
+        Crop box (x, y, width, height) in original pixels, or None to keep the whole frame
+    """
+    try:
+        height, width = image.shape[:2]
+        
+        # Strided view first so the area resize only touches a fraction of the pixels
+        step = max(1, max(height, width) // (2 * analysis_size))
+        small = image[::step, ::step]
+        scale = min(1.0, analysis_size / max(small.shape[:2]))
+        if scale < 1.0:
+            small = cv2.resize(np.ascontiguousarray(small), (max(1, round(small.shape[1] * scale)),
+                               max(1, round(small.shape[0] * scale))), interpolation=cv2.INTER_AREA)
+        scale_x, scale_y = small.shape[1] / width, small.shape[0] / height
+        
+        # Whiteness: bright and unsaturated pixels score high
+        hsv = cv2.cvtColor(np.ascontiguousarray(small[:, :, :3]), cv2.COLOR_RGB2HSV)
+        value = hsv[:, :, 2]
+        whiteness = cv2.subtract(value, hsv[:, :, 1])
+        
+        value_threshold, _ = cv2.threshold(value, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        foreground = value > value_threshold
+        if not foreground.any():
+            return None
+        whiteness_threshold, _ = cv2.threshold(
+            np.ascontiguousarray(whiteness[foreground]).reshape(-1, 1), 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU
+        )
+        sclera = (foreground & (whiteness > whiteness_threshold)).astype(np.uint8) * 255
+        sclera = cv2.morphologyEx(sclera, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+        
+        count, _, stats, _ = cv2.connectedComponentsWithStats(sclera, connectivity=8)
+        if count <= 1:
+            return None
+        
+        # Keep components of at least 10% of the largest (both sides of the iris)
+        areas = stats[1:, cv2.CC_STAT_AREA]
+        keep = stats[1:][areas >= 0.1 * areas.max()]
+        if keep[:, cv2.CC_STAT_AREA].sum() < min_area_fraction * sclera.size:
+            return None
+        
+        x0 = keep[:, cv2.CC_STAT_LEFT].min()
+        y0 = keep[:, cv2.CC_STAT_TOP].min()
+        x1 = (keep[:, cv2.CC_STAT_LEFT] + keep[:, cv2.CC_STAT_WIDTH]).max()
+        y1 = (keep[:, cv2.CC_STAT_TOP] + keep[:, cv2.CC_STAT_HEIGHT]).max()
+        pad_x, pad_y = margin * (x1 - x0), margin * (y1 - y0)
+        
+        # Map back to original pixels
+        left = max(0, int((x0 - pad_x) / scale_x))
+        top = max(0, int((y0 - pad_y) / scale_y))
+        right = min(width, int(np.ceil((x1 + pad_x) / scale_x)))
+        bottom = min(height, int(np.ceil((y1 + pad_y) / scale_y)))
+        
+        # Not worth cropping if the eye fills (nearly) the whole frame
+        if (right - left) * (bottom - top) >= 0.9 * width * height:
+            return None
+        
+        return left, top, right - left, bottom - top
+    
+    except Exception as e:
+        raise ValueError(f"Failed to locate eye region: {str(e)}")
+
+
+def preprocess_image(image: np.ndarray, target_size: Tuple[int, int] = (512, 512),
+                     out: Optional[np.ndarray] = None, resized: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Preprocess image for model inference.
     
+    The resize writes into ``resized`` and the uint8 to float conversion and
+    scaling happen in one pass into ``out``, so with both buffers supplied no
+    array is allocated.
+    
     Args:
         image: Input image as numpy array
         target_size: Target size (height, width) for resizing
+        out: Optional float32 (1, height, width, channels) array to write the result into
+        resized: Optional uint8 (height, width, channels) scratch array for the resized image
         
     Returns:
-        Preprocessed image ready for model inference
+        Preprocessed image ready for model inference (``out`` when given)
     """
     try:
         # Resize image
-        resized = cv2.resize(image, (target_size[1], target_size[0]))
-        
-        # Normalize pixel values to [0, 1]
-        normalized = resized.astype(np.float32) / 255.0
+        resized = cv2.resize(image, (target_size[1], target_size[0]), dst=resized)
         
-        # Add batch dimension
-        preprocessed = np.expand_dims(normalized, axis=0)
+        # Normalize pixel values to [0, 1], straight into the batch of one
+        if out is None:
+            out = np.empty((1, *resized.shape), dtype=np.float32)
+        np.divide(resized, np.float32(255.0), out=out[0])
         
-        return preprocessed
+        return out
     
     except Exception as e:
         raise ValueError(f"Failed to preprocess image: {str(e)}")
 
 
-def postprocess_mask(mask: np.ndarray, original_size: Tuple[int, int], threshold: float = 0.5) -> np.ndarray:
+def postprocess_mask(mask: np.ndarray, original_size: Tuple[int, int], threshold: float = 0.5,
+                     out: Optional[np.ndarray] = None, thresholded: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Postprocess model output mask.
     
+    Thresholding and scaling to 0/255 are one ``cv2.compare`` pass at model
+    resolution; the nearest-neighbour resize then writes the full-size mask
+    once. With ``out`` (and ``thresholded`` when a resize is needed) no
+    array is allocated.
+    
     Args:
         mask: Model output mask
         original_size: Original image size (height, width)
         threshold: Threshold for binary mask creation
+        out: Optional uint8 array of ``original_size`` to write the result into
+        thresholded: Optional uint8 scratch array of the model output size
         
     Returns:
-        Postprocessed binary mask
+        Postprocessed binary mask (``out`` when given)
     """
     try:
         # Remove batch dimension if present
@@ -128,41 +293,42 @@ def postprocess_mask(mask: np.ndarray, original_size: Tuple[int, int], threshold
         if len(mask.shape) == 3 and mask.shape[-1] == 1:
             mask = mask[:, :, 0]
         
-        # Apply threshold to create binary mask
-        binary_mask = (mask > threshold).astype(np.uint8)
-        
-        # Resize to original size
-        resized_mask = cv2.resize(binary_mask, (original_size[1], original_size[0]), 
-                                 interpolation=cv2.INTER_NEAREST)
+        # OpenCV has no float16 comparison
+        if mask.dtype != np.float32 and mask.dtype != np.float64:
+            mask = mask.astype(np.float32)
         
-        # Convert to 0-255 range for better visualization
-        final_mask = (resized_mask * 255).astype(np.uint8)
-        
-        return final_mask
+        # Threshold straight to 0-255, resizing to the original size only if needed
+        if mask.shape == tuple(original_size):
+            return cv2.compare(mask, threshold, cv2.CMP_GT, dst=out)
+        binary_mask = cv2.compare(mask, threshold, cv2.CMP_GT, dst=thresholded)
+        return cv2.resize(binary_mask, (original_size[1], original_size[0]), dst=out,
+                          interpolation=cv2.INTER_NEAREST)
     
     except Exception as e:
         raise ValueError(f"Failed to postprocess mask: {str(e)}")
 
 
-def apply_morphological_operations(mask: np.ndarray) -> np.ndarray:
+# Kernel for morphological mask cleanup
+_MORPH_KERNEL = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+
+
+def apply_morphological_operations(mask: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Apply morphological operations to clean up the segmentation mask.
     
     Args:
         mask: Binary mask
+        dst: Optional output array; may be ``mask`` itself to clean it in place
         
     Returns:
-        Cleaned binary mask
+        Cleaned binary mask (``dst`` when given)
     """
     try:
-        # Define kernel for morphological operations
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-        
         # Apply opening to remove noise
-        opened = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+        opened = cv2.morphologyEx(mask, cv2.MORPH_OPEN, _MORPH_KERNEL, dst=dst)
         
-        # Apply closing to fill gaps
-        closed = cv2.morphologyEx(opened, cv2.MORPH_CLOSE, kernel)
+        # Apply closing to fill gaps, in place
+        closed = cv2.morphologyEx(opened, cv2.MORPH_CLOSE, _MORPH_KERNEL, dst=opened)
         
         return closed
     
@@ -183,7 +349,7 @@ def calculate_vessel_metrics(mask: np.ndarray) -> dict:
     try:
         # Calculate basic metrics
         total_pixels = mask.shape[0] * mask.shape[1]
-        vessel_pixels = np.sum(mask > 0)
+        vessel_pixels = cv2.countNonZero(mask)
         vessel_ratio = vessel_pixels / total_pixels
         
         # Find contours for more detailed analysis
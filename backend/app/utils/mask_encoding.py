@@ -0,0 +1,225 @@
+import base64
+import numpy as np
+import cv2
+from typing import Tuple, Union
+
+# Wire formats for binary (0/255) segmentation masks
+MASK_FORMATS = ("png", "png_fast", "png_1bit", "rle", "packbits", "geojson")
+
+MASK_MEDIA_TYPES = {
+    "png": "image/png",
+    "png_fast": "image/png",
+    "png_1bit": "image/png",
+    "rle": "application/json",
+    "packbits": "application/octet-stream",
+    "geojson": "application/geo+json",
+}
+
+# OpenCV PNG writer settings per format. The Z_RLE zlib strategy suits the long
+# runs of 0 and 255 in a mask; setting the level resets the strategy, so it goes
+# second. "png_fast" is OpenCV's default (level 1, Z_RLE) and "png_1bit" writes
+# a 1-bit greyscale image.
+_PNG_PARAMS = {
+    "png": [cv2.IMWRITE_PNG_COMPRESSION, 9, cv2.IMWRITE_PNG_STRATEGY, cv2.IMWRITE_PNG_STRATEGY_RLE],
+    "png_fast": [],
+    "png_1bit": [cv2.IMWRITE_PNG_BILEVEL, 1, cv2.IMWRITE_PNG_COMPRESSION, 6],
+}
+
+
+def encode_mask_rle(mask: np.ndarray) -> dict:
+    """
+    Encode a binary mask as COCO-style uncompressed RLE.
+
+    Runs are counted in column-major order and start with the number of
+    background pixels (0 when the first pixel is foreground), as expected by
+    ``pycocotools.mask.frPyObjects``.
+
+    Args:
+        mask: 2D mask, nonzero pixels are foreground
+
+    Returns:
+        Dictionary with ``size`` ([height, width]) and ``counts`` (run lengths)
+    """
+    height, width = mask.shape
+    pixels = mask.T.reshape(-1) > 0
+    if pixels.size == 0:
+        return {"size": [height, width], "counts": []}
+
+    # Run boundaries are the positions where the value changes
+    changes = np.flatnonzero(pixels[1:] != pixels[:-1]) + 1
+    counts = np.diff(np.concatenate(([0], changes, [pixels.size])))
+    if pixels[0]:
+        counts = np.concatenate(([0], counts))
+    return {"size": [height, width], "counts": counts.tolist()}
+
+
+def decode_mask_rle(rle: dict) -> np.ndarray:
+    """
+    Decode COCO-style uncompressed RLE back to a 0/255 uint8 mask.
+
+    Args:
+        rle: Dictionary with ``size`` and ``counts`` as produced by ``encode_mask_rle``
+
+    Returns:
+        2D uint8 mask
+    """
+    height, width = rle["size"]
+    counts = np.asarray(rle["counts"], dtype=np.int64)
+    values = np.zeros(len(counts), dtype=np.uint8)
+    values[1::2] = 255
+    return np.repeat(values, counts).reshape(width, height).T
+
+
+def mask_to_geojson(mask: np.ndarray, tolerance: float = 1.0) -> dict:
+    """
+    Vectorize a binary mask into a GeoJSON FeatureCollection.
+
+    Vessel outlines and the holes inside them are traced in one OpenCV pass
+    (two-level contour hierarchy) and simplified with Douglas-Peucker at
+    ``tolerance`` pixels. Outlines that keep at least three vertices become
+    Polygons (exterior ring plus holes); vessels thin enough to collapse to
+    two vertices become LineStrings along their centre line. Single-pixel
+    specks are dropped. Coordinates are ``[x, y]`` in mask pixels, the same
+    convention as the training annotations.
+
+    Args:
+        mask: 2D uint8 mask, nonzero pixels are foreground
+        tolerance: Maximum distance in pixels between an outline and its simplification
+
+    Returns:
+        GeoJSON FeatureCollection dictionary
+    """
+    contours, hierarchy = cv2.findContours(mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+    if tolerance > 0:
+        contours = [cv2.approxPolyDP(contour, tolerance, True) for contour in contours]
+
+    features = []
+    if contours:
+        # hierarchy rows are [next, previous, first child, parent]; holes have a parent
+        hierarchy = hierarchy[0]
+        holes = {}
+        for index in np.flatnonzero(hierarchy[:, 3] >= 0):
+            if len(contours[index]) >= 3:
+                holes.setdefault(hierarchy[index, 3], []).append(_closed_ring(contours[index]))
+
+        for index in np.flatnonzero(hierarchy[:, 3] < 0):
+            contour = contours[index]
+            if len(contour) >= 3:
+                geometry = {"type": "Polygon", "coordinates": [_closed_ring(contour), *holes.get(index, [])]}
+            elif len(contour) == 2:
+                geometry = {"type": "LineString", "coordinates": contour.reshape(-1, 2).tolist()}
+            else:
+                continue
+            features.append({"type": "Feature", "geometry": geometry, "properties": {}})
+
+    return {"type": "FeatureCollection", "features": features}
+
+
+def _closed_ring(contour: np.ndarray) -> list:
+    """GeoJSON linear ring (first position repeated at the end) from an OpenCV contour."""
+    points = contour.reshape(-1, 2)
+    return np.concatenate((points, points[:1])).tolist()
+
+
+def pack_mask_bits(mask: np.ndarray) -> bytes:
+    """
+    Pack a binary mask to one bit per pixel.
+
+    Pixels are packed in row-major order, most significant bit first, with
+    the last byte zero-padded; the height and width are needed to unpack.
+
+    Args:
+        mask: 2D mask, nonzero pixels are foreground
+
+    Returns:
+        ``ceil(height * width / 8)`` bytes
+    """
+    return np.packbits(mask, axis=None).tobytes()
+
+
+def unpack_mask_bits(data: bytes, shape: Tuple[int, int]) -> np.ndarray:
+    """
+    Unpack a ``pack_mask_bits`` buffer back to a 0/255 uint8 mask.
+
+    Args:
+        data: Packed bits
+        shape: Mask (height, width)
+
+    Returns:
+        2D uint8 mask
+    """
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=shape[0] * shape[1])
+    return (bits * 255).reshape(shape)
+
+
+def encode_mask(mask: np.ndarray, mask_format: str = "png", geojson_tolerance: float = 1.0) -> Union[bytes, dict]:
+    """
+    Encode a binary mask in one of ``MASK_FORMATS``.
+
+    Every format works on the mask array directly (OpenCV or numpy), without
+    an intermediate PIL image.
+
+    Args:
+        mask: 2D uint8 mask with values 0 and 255
+        mask_format: One of ``MASK_FORMATS``
+        geojson_tolerance: Simplification tolerance in pixels for ``geojson``
+
+    Returns:
+        Encoded bytes, or a dictionary for ``rle`` and ``geojson``
+    """
+    if mask_format not in MASK_FORMATS:
+        raise ValueError(f"Unknown mask format: {mask_format}")
+    if mask.dtype != np.uint8:
+        mask = (mask * 255).astype(np.uint8)
+
+    if mask_format == "rle":
+        return encode_mask_rle(mask)
+    if mask_format == "packbits":
+        return pack_mask_bits(mask)
+    if mask_format == "geojson":
+        return mask_to_geojson(mask, geojson_tolerance)
+
+    success, encoded = cv2.imencode(".png", mask, _PNG_PARAMS[mask_format])
+    if not success:
+        raise ValueError("OpenCV PNG encoder returned no data")
+    return encoded.tobytes()
+
+
+def mask_to_json(encoded: Union[bytes, dict], mask_format: str) -> Union[str, dict]:
+    """
+    JSON representation of an ``encode_mask`` result.
+
+    RLE and GeoJSON stay dictionaries; byte formats become base64 data URIs.
+
+    Args:
+        encoded: Output of ``encode_mask``
+        mask_format: Format it was encoded in
+
+    Returns:
+        Dictionary or ``data:<media type>;base64,...`` string
+    """
+    if isinstance(encoded, dict):
+        return encoded
+    return f"data:{MASK_MEDIA_TYPES[mask_format]};base64,{base64.b64encode(encoded).decode('ascii')}"
+
+
+def estimate_json_size(payload: Union[str, dict]) -> int:
+    """
+    Approximate in-memory size in bytes of a ``mask_to_json`` result, for cache accounting.
+
+    Dictionaries hold Python ints in lists, roughly 36 bytes per number plus
+    about 64 bytes per coordinate pair list.
+    """
+    if isinstance(payload, str):
+        return len(payload)
+    if "counts" in payload:
+        return 36 * len(payload["counts"])
+
+    vertices = 0
+    for feature in payload["features"]:
+        geometry = feature["geometry"]
+        if geometry["type"] == "Polygon":
+            vertices += sum(len(ring) for ring in geometry["coordinates"])
+        else:
+            vertices += len(geometry["coordinates"])
+    return 136 * vertices
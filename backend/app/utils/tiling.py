@@ -0,0 +1,119 @@
+import numpy as np
+from typing import Callable, Iterator, List, Tuple
+
+
+def tile_starts(length: int, tile_size: int, overlap: int) -> List[int]:
+    """
+    Compute tile start offsets covering ``length`` pixels.
+
+    Tiles advance by ``tile_size - overlap``; the last tile is aligned to the
+    end so every pixel is covered without padding beyond the image.
+
+    Args:
+        length: Image extent along one axis (at least ``tile_size``)
+        tile_size: Tile extent
+        overlap: Pixels shared by neighbouring tiles
+
+    Returns:
+        Sorted list of start offsets
+    """
+    stride = max(1, tile_size - overlap)
+    starts = list(range(0, max(length - tile_size, 0) + 1, stride))
+    if starts[-1] + tile_size < length:
+        starts.append(length - tile_size)
+    return starts
+
+
+def blending_window(tile_size: int, min_weight: float = 1e-3) -> np.ndarray:
+    """
+    Create a 2D weighting window for blending overlapping tiles.
+
+    A separable Hann window down-weights tile borders, where the model sees
+    the least context, so overlaps fade smoothly instead of showing seams.
+    The floor keeps image-edge pixels (covered by a single tile) weighted.
+
+    Args:
+        tile_size: Tile extent
+        min_weight: Smallest weight at the tile border
+
+    Returns:
+        Float32 array of shape (tile_size, tile_size)
+    """
+    ramp = np.sin(np.pi * (np.arange(tile_size) + 0.5) / tile_size) ** 2
+    window = np.outer(ramp, ramp)
+    return np.maximum(window, min_weight).astype(np.float32)
+
+
+def iter_tile_batches(image: np.ndarray, tile_size: int, overlap: int,
+                      batch_size: int) -> Iterator[Tuple[np.ndarray, List[Tuple[int, int]]]]:
+    """
+    Yield normalized tile batches from an image, one batch at a time.
+
+    Only ``batch_size`` tiles are materialized at once, so memory stays
+    bounded regardless of image size.
+
+    Args:
+        image: RGB image of shape (H, W, 3), at least ``tile_size`` on each side
+        tile_size: Tile extent
+        overlap: Pixels shared by neighbouring tiles
+        batch_size: Maximum tiles per batch
+
+    Yields:
+        Tuple of (float32 batch of shape (N, tile_size, tile_size, 3) in [0, 1],
+        list of (y, x) tile origins)
+    """
+    height, width = image.shape[:2]
+    origins = [(y, x) for y in tile_starts(height, tile_size, overlap)
+               for x in tile_starts(width, tile_size, overlap)]
+
+    batch = np.empty((min(batch_size, len(origins)), tile_size, tile_size, 3), dtype=np.float32)
+    for offset in range(0, len(origins), batch_size):
+        batch_origins = origins[offset:offset + batch_size]
+        for index, (y, x) in enumerate(batch_origins):
+            np.multiply(image[y:y + tile_size, x:x + tile_size], 1.0 / 255.0, out=batch[index])
+        yield batch[:len(batch_origins)], batch_origins
+
+
+def count_tiles(image_shape: Tuple[int, int], tile_size: int, overlap: int) -> int:
+    """Number of tiles ``iter_tile_batches`` produces for an image of ``image_shape``."""
+    height, width = (max(extent, tile_size) for extent in image_shape[:2])
+    return len(tile_starts(height, tile_size, overlap)) * len(tile_starts(width, tile_size, overlap))
+
+
+def tiled_predict(image: np.ndarray, infer_fn: Callable[[np.ndarray], np.ndarray],
+                  tile_size: int = 256, overlap: int = 32, batch_size: int = 8) -> np.ndarray:
+    """
+    Predict a full-resolution probability map with overlapping tiles.
+
+    The image is cut into ``tile_size`` tiles at native resolution, tiles
+    are run through ``infer_fn`` in batches, and the per-tile probabilities
+    are blended into full-size accumulators with a Hann window. Images
+    smaller than a tile are reflect-padded.
+
+    Args:
+        image: RGB uint8 image of shape (H, W, 3)
+        infer_fn: Forward pass mapping (N, tile, tile, 3) float32 to (N, tile, tile, 1)
+        tile_size: Tile extent (the model's input size)
+        overlap: Pixels shared by neighbouring tiles
+        batch_size: Maximum tiles per forward pass
+
+    Returns:
+        Float32 probability map of shape (H, W)
+    """
+    height, width = image.shape[:2]
+    pad_y, pad_x = max(0, tile_size - height), max(0, tile_size - width)
+    if pad_y or pad_x:
+        image = np.pad(image, ((0, pad_y), (0, pad_x), (0, 0)), mode="reflect" if min(height, width) > 1 else "edge")
+
+    window = blending_window(tile_size)
+    probabilities = np.zeros(image.shape[:2], dtype=np.float32)
+    weights = np.zeros(image.shape[:2], dtype=np.float32)
+
+    for batch, origins in iter_tile_batches(image, tile_size, overlap, max(1, batch_size)):
+        predictions = infer_fn(batch)
+        for prediction, (y, x) in zip(predictions, origins):
+            probabilities[y:y + tile_size, x:x + tile_size] += prediction[..., 0] * window
+            weights[y:y + tile_size, x:x + tile_size] += window
+
+    np.divide(probabilities, weights, out=probabilities)
+    return probabilities[:height, :width]
@@ -8,6 +8,8 @@ export interface PredictionResponse {
   segmentation_mask?: string;
   confidence_score?: number;
   processing_time?: number;
+  // Per-stage durations in milliseconds (decode, model, encode, ...)
+  timings?: Record<string, number>;
   message?: string;
 }
 
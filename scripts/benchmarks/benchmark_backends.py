@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Backend Benchmark
+Compares the Keras model against its TFLite and ONNX exports side by side:
+latency, throughput, load time, peak process memory, whether TensorFlow was
+imported, and Dice agreement of the thresholded masks with the Keras model.
+
+Each backend runs in a fresh subprocess so memory and import figures are not
+polluted by the other backends.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def time_calls(fn, batch, iterations, warmup=2):
+    """Return per-call latencies in milliseconds after a short warm-up."""
+    for _ in range(warmup):
+        fn(batch)
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(batch)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return np.array(latencies)
+
+
+def dice(reference, candidate, threshold=0.5):
+    """Dice coefficient between two thresholded probability maps."""
+    reference = reference > threshold
+    candidate = candidate > threshold
+    total = reference.sum() + candidate.sum()
+    return 1.0 if total == 0 else float(2.0 * np.logical_and(reference, candidate).sum() / total)
+
+
+def run_worker(args):
+    """Benchmark one backend in this process and print the results as JSON."""
+    from app.services.model_service import ModelService
+
+    backend, artifact = args.worker
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    artifact_kwargs = {"tflite": {"tflite_model_path": artifact}, "onnx": {"onnx_model_path": artifact}}
+
+    start = time.perf_counter()
+    service = ModelService(
+        model_path=args.model_path, batching_enabled=False, inference_batch_sizes=batch_sizes,
+        inference_backend=backend, tflite_num_threads=args.num_threads, onnx_num_threads=args.num_threads,
+        allow_dummy_fallback=False, **artifact_kwargs.get(backend, {})
+    )
+    load_time = time.perf_counter() - start
+    if not service.is_ready:
+        raise SystemExit(f"{backend} failed to load: {service.load_error}")
+
+    height, width = service.input_size
+    rng = np.random.default_rng(0)
+    results, outputs = {}, {}
+    for batch_size in batch_sizes:
+        batch = rng.random((batch_size, height, width, 3), dtype=np.float32)
+        outputs[str(batch_size)] = service._run_inference(batch)
+        latencies = time_calls(service._run_inference, batch, args.iterations)
+        results[str(batch_size)] = {
+            "mean_ms": float(latencies.mean()),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "images_per_second": float(batch_size * 1000.0 / latencies.mean()),
+        }
+    np.savez(args.outputs_file, **outputs)
+
+    print(json.dumps({
+        "load_time_s": load_time,
+        "model_memory_bytes": service.memory_bytes,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        "tensorflow_imported": "tensorflow" in sys.modules,
+        "batches": results,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Keras vs TFLite vs ONNX inference backends")
+    parser.add_argument("--model-path", default=None, help="Path to the .keras model (default: service default)")
+    parser.add_argument("--tflite", nargs="*", default=None,
+                        help="TFLite models to compare (default: <model>_float16/_int8.tflite if present)")
+    parser.add_argument("--onnx", default=None, help="ONNX model to compare (default: <model>.onnx if present)")
+    parser.add_argument("--batch-sizes", default="1,4,8", help="Comma-separated batch sizes")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed iterations per configuration")
+    parser.add_argument("--num-threads", type=int, default=0, help="TFLite/ONNX Runtime threads (0 = all cores)")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    parser.add_argument("--worker", nargs=2, metavar=("BACKEND", "ARTIFACT"), help=argparse.SUPPRESS)
+    parser.add_argument("--outputs-file", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    from app.services.model_service import ModelService
+
+    model_path = ModelService(model_path=args.model_path, load_mode="lazy").model_path
+    stem = Path(model_path).with_suffix("")
+    candidates = [("keras", model_path)]
+    tflite_paths = args.tflite if args.tflite is not None else [
+        str(path) for path in (Path(f"{stem}_float16.tflite"), Path(f"{stem}_int8.tflite")) if path.exists()
+    ]
+    candidates += [("tflite", path) for path in tflite_paths]
+    onnx_path = args.onnx or (f"{stem}.onnx" if Path(f"{stem}.onnx").exists() else None)
+    if onnx_path:
+        candidates.append(("onnx", onnx_path))
+
+    print("⏱️ Backend Benchmark")
+    print("=" * 60)
+
+    results, outputs = {}, {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for backend, artifact in candidates:
+            label = backend if backend == "keras" else f"{backend}:{Path(artifact).name}"
+            outputs_file = os.path.join(tmp_dir, f"{len(results)}.npz")
+            command = [
+                sys.executable, __file__, "--worker", backend, artifact, "--outputs-file", outputs_file,
+                "--model-path", model_path, "--batch-sizes", args.batch_sizes,
+                "--iterations", str(args.iterations), "--num-threads", str(args.num_threads),
+            ]
+            completed = subprocess.run(command, capture_output=True, text=True)
+            if completed.returncode != 0:
+                print(f"❌ {label} failed: {completed.stderr.strip().splitlines()[-1:]}")
+                continue
+            results[label] = json.loads(completed.stdout.strip().splitlines()[-1])
+            with np.load(outputs_file) as data:
+                outputs[label] = {key: data[key] for key in data.files}
+
+    reference = outputs.get("keras")
+    for label, result in results.items():
+        for batch_size, stats in result["batches"].items():
+            stats["dice_vs_keras"] = dice(reference[batch_size], outputs[label][batch_size]) if reference else None
+
+    print(f"{'backend':>32} {'load s':>7} {'RSS MB':>8} {'TF':>4}")
+    for label, result in results.items():
+        print(f"{label:>32} {result['load_time_s']:>7.2f} {result['peak_rss_mb']:>8.0f} "
+              f"{'yes' if result['tensorflow_imported'] else 'no':>4}")
+    print()
+    print(f"{'batch':>5} {'backend':>32} {'mean ms':>10} {'p95 ms':>10} {'img/s':>10} {'dice':>7}")
+    for batch_size in args.batch_sizes.split(","):
+        for label, result in results.items():
+            stats = result["batches"][batch_size]
+            dice_text = f"{stats['dice_vs_keras']:>7.4f}" if stats["dice_vs_keras"] is not None else f"{'-':>7}"
+            print(f"{batch_size:>5} {label:>32} {stats['mean_ms']:>10.2f} {stats['p95_ms']:>10.2f} "
+                  f"{stats['images_per_second']:>10.1f} {dice_text}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Image Processing Benchmark
+Microbenchmarks for the CPU pipeline around the model in
+app/utils/image_processing.py: decode (full and reduced-resolution), encode,
+preprocess, postprocess, morphology, vessel metrics and morphology analytics
+(app/utils/vessel_morphology.py) and overlay rendering,
+across image sizes from 256x256 to 4000x3000 and PNG/JPEG inputs.
+
+Each case records latency percentiles, throughput and peak traced memory
+(numpy/OpenCV arrays and Python objects, via tracemalloc). Results are
+written as JSON and can be compared against a saved baseline to flag
+regressions; the script exits non-zero when one is found.
+"""
+
+import argparse
+import base64
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.utils.image_processing import (  # noqa: E402
+    apply_morphological_operations,
+    calculate_vessel_metrics,
+    create_overlay_visualization,
+    decode_base64_image,
+    decode_image_bytes_reduced,
+    encode_image_to_base64,
+    postprocess_mask,
+    preprocess_image,
+)
+from app.utils.vessel_morphology import calculate_vessel_morphology  # noqa: E402
+
+DEFAULT_SIZES = "256x256,512x512,1280x960,1920x1080,4000x3000"
+MODEL_INPUT_SIZE = (512, 512)
+# Default VESSEL_ANALYTICS_MAX_PIXELS (0 opts in to full resolution)
+ANALYTICS_MAX_PIXELS = 2_000_000
+
+
+def synthetic_eye(width, height, seed=0):
+    """
+    Slit-lamp-like RGB test image with a matching vessel mask.
+
+    Skin-toned background, a bright sclera ellipse, a dark iris and random
+    red vessel polylines plus sensor noise, so PNG/JPEG sizes and mask
+    statistics resemble real captures rather than flat or random images.
+    """
+    rng = np.random.default_rng(seed)
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:] = (176, 120, 100)
+    center = (width // 2, height // 2)
+    cv2.ellipse(image, center, (int(width * 0.4), int(height * 0.3)), 0, 0, 360, (232, 224, 218), -1)
+    cv2.circle(image, center, int(min(width, height) * 0.18), (70, 90, 110), -1)
+
+    mask = np.zeros((height, width), dtype=np.uint8)
+    scale = max(width, height) / 512.0
+    for _ in range(40):
+        points = np.cumsum(rng.normal(0, 12 * scale, size=(8, 2)), axis=0) + (
+            rng.uniform(0.15, 0.85) * width, rng.uniform(0.25, 0.75) * height
+        )
+        points = points.astype(np.int32).reshape(-1, 1, 2)
+        thickness = max(1, int(rng.uniform(1, 3) * scale))
+        cv2.polylines(image, [points], False, (190, 40, 50), thickness)
+        cv2.polylines(mask, [points], False, 255, thickness)
+
+    noise = rng.normal(0, 4, size=image.shape)
+    image = np.clip(image + noise, 0, 255).astype(np.uint8)
+    return image, mask
+
+
+def encoded_base64(image, image_format):
+    """Encode an RGB image the way clients send it to /predict."""
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, format=image_format, **({"quality": 90} if image_format == "JPEG" else {}))
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def build_cases(sizes, formats):
+    """Yield (name, size label, megapixels, callable) for every benchmark case."""
+    for width, height in sizes:
+        label = f"{width}x{height}"
+        megapixels = width * height / 1e6
+        image, mask = synthetic_eye(width, height)
+        prediction = cv2.resize(mask, MODEL_INPUT_SIZE[::-1], interpolation=cv2.INTER_AREA)
+        prediction = (prediction.astype(np.float32) / 255.0)[None, :, :, None]
+
+        for image_format in formats:
+            payload = encoded_base64(image, image_format)
+            yield f"decode_base64_image[{image_format.lower()}]", label, megapixels, \
+                lambda payload=payload: decode_base64_image(payload)
+            if image_format == "JPEG":
+                encoded = base64.b64decode(payload)
+                yield "decode_image_bytes_reduced[jpeg]", label, megapixels, \
+                    lambda encoded=encoded: decode_image_bytes_reduced(encoded, MODEL_INPUT_SIZE)
+
+        yield "encode_image_to_base64[mask_png]", label, megapixels, \
+            lambda mask=mask: encode_image_to_base64(mask, format="PNG")
+        yield "preprocess_image", label, megapixels, \
+            lambda image=image: preprocess_image(image, MODEL_INPUT_SIZE)
+        yield "postprocess_mask", label, megapixels, \
+            lambda prediction=prediction, size=(height, width): postprocess_mask(prediction, size)
+        yield "apply_morphological_operations", label, megapixels, \
+            lambda mask=mask: apply_morphological_operations(mask)
+
+        # The same stages writing into preallocated buffers, as the model service does with its buffer pool
+        tensor = np.empty((1, *MODEL_INPUT_SIZE, 3), dtype=np.float32)
+        resized = np.empty((*MODEL_INPUT_SIZE, 3), dtype=np.uint8)
+        thresholded = np.empty(MODEL_INPUT_SIZE, dtype=np.uint8)
+        full_mask = np.empty((height, width), dtype=np.uint8)
+        yield "preprocess_image[pooled]", label, megapixels, \
+            lambda image=image, tensor=tensor, resized=resized: preprocess_image(
+                image, MODEL_INPUT_SIZE, out=tensor, resized=resized)
+        yield "postprocess_mask[pooled]", label, megapixels, \
+            lambda prediction=prediction, size=(height, width), full_mask=full_mask, thresholded=thresholded: \
+            postprocess_mask(prediction, size, out=full_mask, thresholded=thresholded)
+        yield "apply_morphological_operations[pooled]", label, megapixels, \
+            lambda mask=mask, full_mask=full_mask: apply_morphological_operations(mask, dst=full_mask)
+        yield "calculate_vessel_metrics", label, megapixels, \
+            lambda mask=mask: calculate_vessel_metrics(mask)
+        yield "calculate_vessel_morphology", label, megapixels, \
+            lambda mask=mask: calculate_vessel_morphology(mask)
+        yield "calculate_vessel_morphology[max_pixels]", label, megapixels, \
+            lambda mask=mask: calculate_vessel_morphology(mask, max_pixels=ANALYTICS_MAX_PIXELS)
+        yield "create_overlay_visualization", label, megapixels, \
+            lambda image=image, mask=mask: create_overlay_visualization(image, mask)
+
+
+def measure(fn, min_iterations, min_time, warmup=2):
+    """Time ``fn`` for at least ``min_iterations`` calls and ``min_time`` seconds; return latencies in ms."""
+    for _ in range(warmup):
+        fn()
+
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < min_iterations or time.perf_counter() - started < min_time:
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return np.array(latencies)
+
+
+def peak_memory(fn):
+    """Peak traced allocation of one call in bytes (tracemalloc slows calls down, so it runs separately)."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def compare(results, baseline, threshold, memory_threshold):
+    """Return (key, metric, baseline, current, ratio) rows for cases slower or heavier than the baseline."""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        ratio = current["p50_ms"] / previous["p50_ms"] if previous["p50_ms"] else 1.0
+        if ratio > 1.0 + threshold:
+            regressions.append((key, "p50_ms", previous["p50_ms"], current["p50_ms"], ratio))
+        memory_ratio = current["peak_memory_bytes"] / previous["peak_memory_bytes"] if previous["peak_memory_bytes"] else 1.0
+        if memory_ratio > 1.0 + memory_threshold:
+            regressions.append((key, "peak_memory_bytes", previous["peak_memory_bytes"],
+                                current["peak_memory_bytes"], memory_ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the image_processing CPU pipeline")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated WIDTHxHEIGHT image sizes")
+    parser.add_argument("--formats", default="PNG,JPEG", help="Comma-separated input formats for decoding")
+    parser.add_argument("--filter", default=None, help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--min-iterations", type=int, default=10, help="Minimum timed calls per case")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum timed seconds per case")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    parser.add_argument("--baseline", default=None, help="Compare against a previous --output file")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Flag cases whose p50 latency grew by more than this fraction (default 0.15)")
+    parser.add_argument("--memory-threshold", type=float, default=0.10,
+                        help="Flag cases whose peak memory grew by more than this fraction (default 0.10)")
+    args = parser.parse_args()
+
+    sizes = [tuple(int(value) for value in size.lower().split("x")) for size in args.sizes.split(",")]
+    formats = [image_format.strip().upper() for image_format in args.formats.split(",")]
+
+    print("⏱️ Image Processing Benchmark")
+    print("=" * 60)
+    print(f"{'benchmark':>40} {'size':>10} {'p50 ms':>9} {'p95 ms':>9} {'MP/s':>9} {'peak MB':>8}")
+
+    results = {}
+    for name, label, megapixels, fn in build_cases(sizes, formats):
+        if args.filter and args.filter not in name:
+            continue
+        latencies = measure(fn, args.min_iterations, args.min_time)
+        memory = peak_memory(fn)
+        results[f"{name}/{label}"] = {
+            "benchmark": name,
+            "size": label,
+            "megapixels": megapixels,
+            "iterations": len(latencies),
+            "mean_ms": float(latencies.mean()),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "calls_per_second": float(1000.0 / latencies.mean()),
+            "megapixels_per_second": float(megapixels * 1000.0 / latencies.mean()),
+            "peak_memory_bytes": int(memory),
+        }
+        stats = results[f"{name}/{label}"]
+        print(f"{name:>40} {label:>10} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+              f"{stats['megapixels_per_second']:>9.1f} {memory / 1e6:>8.1f}")
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+            "pillow": Image.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpu_threads": cv2.getNumThreads(),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["results"], args.threshold, args.memory_threshold)
+        missing = sorted(set(baseline["results"]) - set(results))
+        print(f"\n📊 Compared with {args.baseline} ({len(set(baseline['results']) & set(results))} shared cases)")
+        if missing:
+            print(f"   {len(missing)} baseline cases were not run")
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s):")
+            for key, metric, previous, current, ratio in regressions:
+                print(f"   {key:>52} {metric:>18} {previous:>12.2f} -> {current:>12.2f} ({ratio:.2f}x)")
+            sys.exit(1)
+        print("✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
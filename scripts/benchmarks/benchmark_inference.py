@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Inference Benchmark
+Compares the compiled fixed-signature inference functions of ModelService
+against the model.predict fallback across batch sizes.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.model_service import ModelService  # noqa: E402
+
+
+def time_calls(fn, batch, iterations, warmup=2):
+    """Return per-call latencies in milliseconds after a short warm-up."""
+    for _ in range(warmup):
+        fn(batch)
+
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(batch)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return np.array(latencies)
+
+
+def summarize(latencies, batch_size):
+    """Summarize latencies into mean/percentiles/throughput."""
+    return {
+        "mean_ms": float(latencies.mean()),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "images_per_second": float(batch_size * 1000.0 / latencies.mean()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled inference vs model.predict")
+    parser.add_argument("--model-path", default=None, help="Path to the .keras model (default: service default)")
+    parser.add_argument("--batch-sizes", default="1,2,4,8", help="Comma-separated batch sizes")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed iterations per configuration")
+    parser.add_argument("--xla", action="store_true", help="Also benchmark XLA-compiled functions")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    variants = [("compiled", False)] + ([("compiled_xla", True)] if args.xla else [])
+
+    print("⏱️ Inference Benchmark")
+    print("=" * 60)
+
+    results = {}
+    service = None
+    for name, xla in variants:
+        service = ModelService(
+            model_path=args.model_path,
+            batching_enabled=False,
+            compiled_inference=True,
+            xla_compile=xla,
+            inference_batch_sizes=batch_sizes,
+        )
+        height, width = service.input_size
+        for batch_size in batch_sizes:
+            batch = np.random.rand(batch_size, height, width, 3).astype(np.float32)
+            results.setdefault(str(batch_size), {})[name] = summarize(
+                time_calls(service._run_inference, batch, args.iterations), batch_size
+            )
+
+    # model.predict baseline on the same loaded model
+    for batch_size in batch_sizes:
+        height, width = service.input_size
+        batch = np.random.rand(batch_size, height, width, 3).astype(np.float32)
+        results[str(batch_size)]["model_predict"] = summarize(
+            time_calls(lambda x: service.model.predict(x, verbose=0), batch, args.iterations), batch_size
+        )
+
+    print(f"{'batch':>5} {'variant':>14} {'mean ms':>10} {'p95 ms':>10} {'img/s':>10}")
+    for batch_size, variants_result in results.items():
+        for name, stats in variants_result.items():
+            print(f"{batch_size:>5} {name:>14} {stats['mean_ms']:>10.2f} "
+                  f"{stats['p95_ms']:>10.2f} {stats['images_per_second']:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Mask Format Benchmark
+Size and encode time of every mask wire format in app/utils/mask_encoding.py
+(8-bit PNG, fast PNG, 1-bit PNG, COCO RLE, packed bits and GeoJSON), next to
+the PIL PNG data URI the API returned before, for vessel masks from 512x512
+to 4000x3000.
+
+For each format the raw encoded size, the size in a JSON response (base64
+data URI, RLE or GeoJSON object) and that JSON payload gzipped (what a client
+gets with Content-Encoding: gzip) are reported. Every encoding is decoded
+again: lossless formats must reproduce the source mask exactly, GeoJSON is
+rasterized like the training annotations and its IoU with the mask reported.
+"""
+
+import argparse
+import base64
+import gzip
+import io
+import json
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from benchmark_image_processing import BACKEND_DIR, measure, synthetic_eye  # noqa: E402
+
+sys.path.insert(0, str(BACKEND_DIR))
+from app.utils.image_processing import apply_morphological_operations, encode_image_to_base64  # noqa: E402
+from app.utils.mask_encoding import (  # noqa: E402
+    MASK_FORMATS,
+    decode_mask_rle,
+    encode_mask,
+    mask_to_json,
+    unpack_mask_bits,
+)
+
+DEFAULT_SIZES = "512x512,1280x960,1920x1080,4000x3000"
+
+
+def rasterize_geojson(geojson, shape):
+    """Rasterize GeoJSON outlines the way the training script does (holes filled with background)."""
+    mask = np.zeros(shape, dtype=np.uint8)
+    for feature in geojson["features"]:
+        geometry = feature["geometry"]
+        if geometry["type"] == "Polygon":
+            exterior, *holes = geometry["coordinates"]
+            cv2.fillPoly(mask, [np.array(exterior, dtype=np.int32)], 255)
+            for hole in holes:
+                cv2.fillPoly(mask, [np.array(hole, dtype=np.int32)], 0)
+        else:
+            cv2.polylines(mask, [np.array(geometry["coordinates"], dtype=np.int32)], False, 255, 1)
+    return mask
+
+
+def decode_json(payload, mask_format, shape):
+    """Decode a JSON mask payload back to a 0/255 array, the way a client would."""
+    if mask_format == "rle":
+        return decode_mask_rle(payload)
+    if mask_format == "geojson":
+        return rasterize_geojson(payload, shape)
+    data = base64.b64decode(payload.split(",", 1)[1])
+    if mask_format == "packbits":
+        return unpack_mask_bits(data, shape)
+    return np.asarray(Image.open(io.BytesIO(data)).convert("L"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mask wire formats")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated WIDTHxHEIGHT mask sizes")
+    parser.add_argument("--min-iterations", type=int, default=10, help="Minimum timed calls per case")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum timed seconds per case")
+    parser.add_argument("--geojson-tolerance", type=float, default=1.0,
+                        help="GeoJSON simplification tolerance in pixels (default 1.0, like MASK_GEOJSON_TOLERANCE)")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    sizes = [tuple(int(value) for value in size.lower().split("x")) for size in args.sizes.split(",")]
+
+    print("📦 Mask Format Benchmark")
+    print("=" * 60)
+    print(f"{'format':>12} {'size':>10} {'p50 ms':>9} {'raw KB':>9} {'JSON KB':>9} {'gzip KB':>9} {'IoU':>6}")
+
+    results = {}
+    for width, height in sizes:
+        label = f"{width}x{height}"
+        _, mask = synthetic_eye(width, height)
+        mask = apply_morphological_operations(mask)
+
+        cases = [("pil_png", lambda: encode_image_to_base64(mask, format="PNG"))]
+        cases += [
+            (mask_format, lambda mask_format=mask_format: mask_to_json(
+                encode_mask(mask, mask_format, args.geojson_tolerance), mask_format
+            ))
+            for mask_format in MASK_FORMATS
+        ]
+        for name, fn in cases:
+            latencies = measure(fn, args.min_iterations, args.min_time)
+            payload = fn()
+            decoded = decode_json(payload, "png" if name == "pil_png" else name, mask.shape) > 0
+            iou = np.count_nonzero(decoded & (mask > 0)) / max(np.count_nonzero(decoded | (mask > 0)), 1)
+            if name != "geojson" and iou != 1.0:
+                raise SystemExit(f"❌ {name} did not round-trip at {label}")
+
+            raw = payload if isinstance(payload, dict) else base64.b64decode(payload.split(",", 1)[1])
+            json_bytes = json.dumps(payload, separators=(",", ":")).encode()
+            raw_size = len(json_bytes) if isinstance(raw, dict) else len(raw)
+            results[f"{name}/{label}"] = {
+                "format": name,
+                "size": label,
+                "vessel_fraction": float(np.count_nonzero(mask) / mask.size),
+                "p50_ms": float(np.percentile(latencies, 50)),
+                "p95_ms": float(np.percentile(latencies, 95)),
+                "raw_bytes": raw_size,
+                "json_bytes": len(json_bytes),
+                "gzip_bytes": len(gzip.compress(json_bytes, compresslevel=6)),
+                "iou": float(iou),
+            }
+            stats = results[f"{name}/{label}"]
+            print(f"{name:>12} {label:>10} {stats['p50_ms']:>9.2f} {raw_size / 1024:>9.1f} "
+                  f"{stats['json_bytes'] / 1024:>9.1f} {stats['gzip_bytes'] / 1024:>9.1f} {iou:>6.3f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"\n📄 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+HTTP Load Test
+Drives /predict, /predict/file and /health of a running API (or one started
+locally by this script) and reports throughput, latency percentiles, error
+rates and the server-side stage timings from the Server-Timing header.
+
+Two load models are supported:
+- closed loop (--concurrency N): N clients send back-to-back requests;
+- open loop (--rate R): requests arrive as a Poisson process at R/s
+  regardless of how fast the server answers. Latency is measured from the
+  scheduled arrival, so queueing delay is not hidden when the server falls
+  behind (no coordinated omission). Arrivals dropped at the client's
+  --max-in-flight cap count as errors.
+
+Latency percentiles cover successful requests only; failures and drops show
+up in the error rate.
+
+Requires httpx (backend dev dependencies).
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark_image_processing import synthetic_eye  # noqa: E402
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+ENDPOINTS = ("predict", "predict_file", "health")
+
+
+def parse_weights(text, cast=str):
+    """Parse ``key=weight,key=weight`` (or ``key:weight``) into a dict; a bare key has weight 1."""
+    weights = {}
+    for item in text.split(","):
+        key, _, weight = item.replace(":", "=").partition("=")
+        weights[cast(key.strip())] = float(weight) if weight else 1.0
+    return weights
+
+
+def parse_server_timing(header):
+    """Parse a Server-Timing header into {name: milliseconds}."""
+    timings = {}
+    for entry in filter(None, (part.strip() for part in (header or "").split(","))):
+        name, *params = entry.split(";")
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "dur":
+                timings[name.strip()] = float(value)
+    return timings
+
+
+def build_payloads(sizes, variants):
+    """Pre-encode JPEG variants per image size so encoding never runs inside the load loop."""
+    payloads = {}
+    for label in sizes:
+        width, height = (int(value) for value in label.lower().split("x"))
+        encoded = []
+        for seed in range(variants):
+            image, _ = synthetic_eye(width, height, seed=seed)
+            buffer = io.BytesIO()
+            Image.fromarray(image).save(buffer, format="JPEG", quality=90)
+            jpeg = buffer.getvalue()
+            encoded.append((jpeg, base64.b64encode(jpeg).decode()))
+        payloads[label] = encoded
+    return payloads
+
+
+class LoadTest:
+    """Issue requests according to the endpoint and size mixes and collect per-request records."""
+
+    def __init__(self, client, endpoint_weights, size_weights, payloads, timeout):
+        self.client = client
+        self.endpoints = list(endpoint_weights)
+        self.endpoint_weights = list(endpoint_weights.values())
+        self.sizes = list(size_weights)
+        self.size_weights = list(size_weights.values())
+        self.payloads = payloads
+        self.timeout = timeout
+        self.records = []
+        self.in_flight = 0
+        self.dropped = 0
+        self._rng = random.Random(0)
+
+    def _pick(self):
+        endpoint = self._rng.choices(self.endpoints, self.endpoint_weights)[0]
+        size = self._rng.choices(self.sizes, self.size_weights)[0] if endpoint != "health" else None
+        variant = self._rng.randrange(len(self.payloads[size])) if size else None
+        return endpoint, size, variant
+
+    async def request(self, scheduled_at=None):
+        """Send one request; latency counts from ``scheduled_at`` (open loop) or the send time."""
+        endpoint, size, variant = self._pick()
+        started = time.perf_counter()
+        scheduled_at = scheduled_at or started
+        record = {"endpoint": endpoint, "size": size, "status": None, "error": None,
+                  "server_timings": {}, "cached": None}
+        self.in_flight += 1
+        try:
+            if endpoint == "health":
+                response = await self.client.get("/health", timeout=self.timeout)
+            elif endpoint == "predict":
+                response = await self.client.post(
+                    "/predict", json={"image": self.payloads[size][variant][1]}, timeout=self.timeout
+                )
+            else:
+                response = await self.client.post(
+                    "/predict/file", files={"file": ("eye.jpg", self.payloads[size][variant][0], "image/jpeg")},
+                    timeout=self.timeout
+                )
+            record["status"] = response.status_code
+            record["server_timings"] = parse_server_timing(response.headers.get("server-timing"))
+            if endpoint != "health" and response.status_code == 200:
+                record["cached"] = response.json().get("cached")
+        except httpx.HTTPError as e:
+            record["error"] = type(e).__name__
+        finally:
+            self.in_flight -= 1
+        record["latency_ms"] = (time.perf_counter() - scheduled_at) * 1000.0
+        self.records.append(record)
+
+    async def closed_loop(self, concurrency, duration):
+        """``concurrency`` clients each sending back-to-back requests for ``duration`` seconds."""
+        deadline = time.perf_counter() + duration
+
+        async def client():
+            while time.perf_counter() < deadline:
+                await self.request()
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+
+    async def open_loop(self, rate, duration, max_in_flight):
+        """Poisson arrivals at ``rate`` per second for ``duration`` seconds."""
+        rng = np.random.default_rng(0)
+        tasks = []
+        start = time.perf_counter()
+        next_arrival = start
+        while next_arrival - start < duration:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.in_flight >= max_in_flight:
+                # The client itself is saturated; record the arrival as failed instead of queueing it
+                # forever, so overload shows up in the error rate rather than vanishing from it
+                self.dropped += 1
+                endpoint, size, _ = self._pick()
+                self.records.append({"endpoint": endpoint, "size": size, "status": None, "error": "dropped",
+                                     "server_timings": {}, "cached": None, "latency_ms": None})
+            else:
+                tasks.append(asyncio.ensure_future(self.request(scheduled_at=next_arrival)))
+            next_arrival += rng.exponential(1.0 / rate)
+        await asyncio.gather(*tasks)
+
+
+def percentile_summary(values):
+    """p50/p95/p99/max and mean of a list of milliseconds."""
+    values = np.asarray(values)
+    if values.size == 0:
+        return None
+    return {
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max()),
+    }
+
+
+def summarize(records, elapsed):
+    """Aggregate per-request records by endpoint (and overall)."""
+    groups = defaultdict(list)
+    for record in records:
+        groups[record["endpoint"]].append(record)
+        if record["size"]:
+            groups[f"{record['endpoint']}[{record['size']}]"].append(record)
+
+    summary = {}
+    for name, group in sorted(groups.items()) + [("all", records)]:
+        ok = [record for record in group if record["status"] == 200]
+        errors = defaultdict(int)
+        for record in group:
+            if record["status"] != 200:
+                errors[str(record["status"]) if record["status"] else record["error"]] += 1
+        stages = defaultdict(list)
+        for record in ok:
+            for stage, duration in record["server_timings"].items():
+                stages[stage].append(duration)
+        summary[name] = {
+            "requests": len(group),
+            "ok": len(ok),
+            "error_rate": 1.0 - len(ok) / len(group) if group else 0.0,
+            "errors": dict(errors),
+            "throughput_rps": len(ok) / elapsed if elapsed else 0.0,
+            "cached": sum(1 for record in ok if record["cached"]),
+            "latency": percentile_summary([record["latency_ms"] for record in ok]),
+            "server_timings": {stage: percentile_summary(values) for stage, values in stages.items()},
+        }
+    return summary
+
+
+def start_server(port, server_env, ready_timeout, show_logs=False):
+    """Start uvicorn on ``port`` from the backend directory and wait until /health/ready answers 200."""
+    env = {**os.environ, **server_env}
+    output = None if show_logs else subprocess.DEVNULL
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=output, stderr=output
+    )
+    deadline = time.time() + ready_timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health/ready", timeout=2).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise SystemExit(f"Server was not ready within {ready_timeout:.0f}s")
+
+
+def print_summary(summary):
+    print("Latency covers successful requests only; err% includes failed and dropped requests")
+    print(f"{'group':>28} {'reqs':>6} {'ok':>6} {'err%':>6} {'rps':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in summary.items():
+        latency = stats["latency"] or {}
+        print(f"{name:>28} {stats['requests']:>6} {stats['ok']:>6} {stats['error_rate'] * 100:>6.1f} "
+              f"{stats['throughput_rps']:>7.2f} {latency.get('p50_ms', float('nan')):>9.1f} "
+              f"{latency.get('p95_ms', float('nan')):>9.1f} {latency.get('p99_ms', float('nan')):>9.1f}")
+        if stats["errors"]:
+            print(f"{'':>28} errors: {stats['errors']}")
+
+    stages = summary["all"]["server_timings"]
+    if stages:
+        print("\nServer-side stages (successful requests)")
+        print(f"{'stage':>28} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for stage, stats in stages.items():
+            print(f"{stage:>28} {stats['mean_ms']:>9.1f} {stats['p50_ms']:>9.1f} "
+                  f"{stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}")
+
+
+async def run(args, base_url):
+    endpoint_weights = {key: weight for key, weight in parse_weights(args.mix).items() if weight > 0}
+    unknown = set(endpoint_weights) - set(ENDPOINTS)
+    if unknown:
+        raise SystemExit(f"Unknown endpoints in --mix: {sorted(unknown)} (choose from {ENDPOINTS})")
+    size_weights = parse_weights(args.sizes)
+    payloads = build_payloads(size_weights, args.variants)
+
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        load = LoadTest(client, endpoint_weights, size_weights, payloads, args.timeout)
+        if args.warmup:
+            await asyncio.gather(*(load.request() for _ in range(args.warmup)))
+            load.records.clear()
+
+        started = time.perf_counter()
+        if args.rate:
+            await load.open_loop(args.rate, args.duration, args.max_in_flight)
+        else:
+            await load.closed_loop(args.concurrency, args.duration)
+        elapsed = time.perf_counter() - started
+
+    return load, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the segmentation API")
+    parser.add_argument("--url", default=None, help="Target a running API instead of starting one locally")
+    parser.add_argument("--port", type=int, default=8011, help="Port for the locally started server")
+    parser.add_argument("--server-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Extra environment for the local server (repeatable)")
+    parser.add_argument("--keep-cache", action="store_true",
+                        help="Keep the result cache and request coalescing on the local server "
+                             "(off by default so repeated test images are really inferred)")
+    parser.add_argument("--server-logs", action="store_true", help="Show the local server's logs")
+    parser.add_argument("--ready-timeout", type=float, default=180.0, help="Seconds to wait for the local server")
+    parser.add_argument("--mix", default="predict_file=3,predict=1,health=1",
+                        help="Endpoint weights, from predict, predict_file and health")
+    parser.add_argument("--sizes", default="512x512=1,1920x1080=2,4000x3000=1", help="Image size weights")
+    parser.add_argument("--variants", type=int, default=4, help="Distinct images per size")
+    parser.add_argument("--concurrency", type=int, default=8, help="Closed-loop clients")
+    parser.add_argument("--rate", type=float, default=None, help="Open-loop arrivals per second (overrides --concurrency)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=int, default=4, help="Unmeasured requests sent first")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Client-side cap on open requests")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", default=None, help="Write the summary (and settings) as JSON to this file")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server_env = {} if args.keep_cache else {"RESULT_CACHE_MAX_MB": "0", "SINGLE_FLIGHT_ENABLED": "false"}
+        server_env.update(item.split("=", 1) for item in args.server_env)
+        print(f"🚀 Starting local server on port {args.port}")
+        server = start_server(args.port, server_env, args.ready_timeout, args.server_logs)
+        base_url = f"http://127.0.0.1:{args.port}"
+    elif not args.keep_cache:
+        print("ℹ️  Targeting a remote server: repeated images may be served from its result cache")
+
+    load_model = f"open loop at {args.rate}/s" if args.rate else f"closed loop with {args.concurrency} clients"
+    print("🔥 Load Test")
+    print("=" * 60)
+    print(f"{base_url}, {load_model}, {args.duration:.0f}s, mix {args.mix}, sizes {args.sizes}")
+
+    try:
+        load, elapsed = asyncio.run(run(args, base_url))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    summary = summarize(load.records, elapsed)
+    print()
+    print_summary(summary)
+    if load.dropped:
+        print(f"\n⚠️  {load.dropped} arrivals dropped (counted as errors): "
+              f"the client hit --max-in-flight {args.max_in_flight}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"settings": vars(args), "elapsed_s": elapsed, "dropped": load.dropped,
+                       "summary": summary}, f, indent=2)
+        print(f"\n📄 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+ONNX Export
+Converts the Keras U-Net into an ONNX model for the "onnx" inference backend,
+so production workers can serve it with ONNX Runtime without importing
+TensorFlow. The batch dimension is exported as dynamic.
+
+Requires tf2onnx and onnxruntime:
+    pip install tf2onnx onnxruntime
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+DEFAULT_MODEL = BACKEND_DIR / "models" / "unet_eye_segmentation.keras"
+
+
+def verify(tf_model, onnx_path, batch_size=2):
+    """Return the max absolute difference between Keras and ONNX Runtime outputs on random input."""
+    import onnxruntime as ort
+
+    session = ort.InferenceSession(str(onnx_path), providers=["CPUExecutionProvider"])
+    batch = np.random.default_rng(0).random((batch_size, *tf_model.input_shape[1:]), dtype=np.float32)
+    expected = tf_model(batch, training=False).numpy()
+    actual = session.run(None, {session.get_inputs()[0].name: batch})[0]
+    return float(np.abs(expected - actual).max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the U-Net to ONNX")
+    parser.add_argument("--model", default=str(DEFAULT_MODEL), help="Path to the .keras model")
+    parser.add_argument("--output", default=None, help="Output .onnx path (default: next to the model)")
+    parser.add_argument("--opset", type=int, default=17, help="ONNX opset version")
+    parser.add_argument("--no-verify", action="store_true", help="Skip the ONNX Runtime parity check")
+    args = parser.parse_args()
+
+    import tensorflow as tf
+    import tf2onnx
+
+    model_path = Path(args.model)
+    output_path = Path(args.output) if args.output else model_path.with_suffix(".onnx")
+
+    print("📦 ONNX Export")
+    print("=" * 60)
+
+    if not model_path.exists():
+        print(f"❌ Model not found: {model_path}")
+        sys.exit(1)
+    model = tf.keras.models.load_model(model_path, compile=False)
+    print(f"Loaded {model_path} (input {model.input_shape})")
+
+    input_signature = (tf.TensorSpec((None, *model.input_shape[1:]), tf.float32, name="input"),)
+    tf2onnx.convert.from_keras(model, input_signature=input_signature, opset=args.opset,
+                               output_path=str(output_path))
+    print(f"✅ {output_path} ({output_path.stat().st_size / 1e6:.2f} MB, opset {args.opset})")
+
+    if not args.no_verify:
+        max_diff = verify(model, output_path)
+        print(f"🔍 Max abs difference vs Keras: {max_diff:.2e}")
+        if max_diff > 1e-3:
+            print("❌ ONNX output does not match the Keras model")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
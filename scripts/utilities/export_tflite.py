@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+TFLite Export
+Converts the Keras U-Net into TensorFlow Lite models for the "tflite"
+inference backend:
+
+- float16: weights stored as float16, float32 input/output
+- int8: full-integer quantization calibrated on training images, uint8
+  input/output so no float conversion is needed at the model boundary
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+DEFAULT_MODEL = BACKEND_DIR / "models" / "unet_eye_segmentation.keras"
+DEFAULT_CALIBRATION_DIR = Path("dataset/train_dataset_mc")
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp"}
+
+
+def load_calibration_images(calibration_dir, input_size, limit):
+    """Load up to ``limit`` images resized and scaled to [0, 1] like the serving path."""
+    paths = sorted(
+        path for path in Path(calibration_dir).rglob("*")
+        if path.suffix.lower() in IMAGE_EXTENSIONS and "mask" not in path.stem.lower()
+    )[:limit]
+
+    images = []
+    for path in paths:
+        image = Image.open(path).convert("RGB").resize(input_size[::-1], Image.BILINEAR)
+        images.append(np.asarray(image, dtype=np.float32) / 255.0)
+    return images
+
+
+def representative_dataset(images, input_shape):
+    """Yield calibration samples; falls back to random images when no dataset is available."""
+    def generator():
+        if images:
+            for image in images:
+                yield [image[np.newaxis, ...]]
+        else:
+            rng = np.random.default_rng(0)
+            for _ in range(32):
+                yield [rng.random((1, *input_shape), dtype=np.float32)]
+    return generator
+
+
+def export_float16(tf, model, output_path):
+    """Export with float16 weights and float32 I/O."""
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.target_spec.supported_types = [tf.float16]
+    output_path.write_bytes(converter.convert())
+
+
+def export_int8(tf, model, output_path, images):
+    """Export with full-integer int8 kernels and uint8 I/O."""
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset(images, model.input_shape[1:])
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.uint8
+    converter.inference_output_type = tf.uint8
+    output_path.write_bytes(converter.convert())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the U-Net to TensorFlow Lite")
+    parser.add_argument("--model", default=str(DEFAULT_MODEL), help="Path to the .keras model")
+    parser.add_argument("--output-dir", default=None, help="Output directory (default: next to the model)")
+    parser.add_argument("--calibration-dir", default=str(DEFAULT_CALIBRATION_DIR),
+                        help="Images used to calibrate int8 quantization")
+    parser.add_argument("--num-calibration", type=int, default=100, help="Maximum calibration images")
+    parser.add_argument("--variants", default="float16,int8", help="Comma-separated variants to export")
+    args = parser.parse_args()
+
+    import tensorflow as tf
+
+    model_path = Path(args.model)
+    output_dir = Path(args.output_dir) if args.output_dir else model_path.parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+    variants = [variant.strip() for variant in args.variants.split(",") if variant.strip()]
+
+    print("📦 TFLite Export")
+    print("=" * 60)
+
+    if not model_path.exists():
+        print(f"❌ Model not found: {model_path}")
+        sys.exit(1)
+    model = tf.keras.models.load_model(model_path, compile=False)
+    print(f"Loaded {model_path} (input {model.input_shape})")
+
+    for variant in variants:
+        output_path = output_dir / f"{model_path.stem}_{variant}.tflite"
+        if variant == "float16":
+            export_float16(tf, model, output_path)
+        elif variant == "int8":
+            images = load_calibration_images(args.calibration_dir, model.input_shape[1:3], args.num_calibration)
+            if not images:
+                print(f"⚠️ No calibration images in {args.calibration_dir}, calibrating on random data")
+            export_int8(tf, model, output_path, images)
+        else:
+            print(f"❌ Unknown variant: {variant}")
+            sys.exit(1)
+        print(f"✅ {variant}: {output_path} ({output_path.stat().st_size / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
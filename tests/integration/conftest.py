@@ -0,0 +1,25 @@
+"""API fixtures: one TestClient per session, started once the model is ready."""
+import cv2
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services import model_service
+
+    with TestClient(app) as test_client:
+        model_service.wait_until_ready()
+        yield test_client
+
+
+@pytest.fixture
+def png_bytes():
+    """A small random RGB image encoded as PNG."""
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (64, 80, 3), dtype=np.uint8)
+    ok, encoded = cv2.imencode(".png", image)
+    assert ok
+    return encoded.tobytes()
@@ -0,0 +1,45 @@
+"""/predict/batch streams one NDJSON result per upload."""
+import json
+
+import pytest
+
+pytestmark = pytest.mark.integration
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_every_upload_gets_a_mask(client, png_bytes):
+    # Regression: uploads must be read before the streaming body runs, since
+    # FastAPI < 0.118 closes them as soon as the endpoint returns
+    files = [("files", (f"eye_{i}.png", png_bytes, "image/png")) for i in range(3)]
+    response = client.post("/predict/batch", files=files)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = _lines(response)
+    assert sorted(line["index"] for line in lines) == [0, 1, 2]
+    for line in lines:
+        assert line["success"], line["message"]
+        assert line["filename"] == f"eye_{line['index']}.png"
+        assert line["segmentation_mask"]
+
+
+def test_non_image_upload_fails_only_its_line(client, png_bytes):
+    files = [
+        ("files", ("eye.png", png_bytes, "image/png")),
+        ("files", ("notes.txt", b"not an image", "text/plain")),
+    ]
+    lines = {line["index"]: line for line in _lines(client.post("/predict/batch", files=files))}
+
+    assert lines[0]["success"]
+    assert not lines[1]["success"]
+    assert lines[1]["message"] == "File must be an image"
+
+
+def test_unknown_model_is_rejected_up_front(client, png_bytes):
+    files = [("files", ("eye.png", png_bytes, "image/png"))]
+    response = client.post("/predict/batch", params={"model_name": "no-such-model"}, files=files)
+
+    assert response.status_code == 404
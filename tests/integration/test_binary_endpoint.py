@@ -0,0 +1,70 @@
+"""/predict/binary: raw and multipart uploads, binary mask responses and metric headers."""
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+pytestmark = pytest.mark.integration
+
+
+def _decode_png(data):
+    mask = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+    assert mask is not None
+    return mask
+
+
+def test_raw_body_returns_png_mask_with_metric_headers(client, png_bytes):
+    response = client.post("/predict/binary", content=png_bytes, headers={"Content-Type": "image/png"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["x-mask-shape"] == "64,80"
+    assert 0.0 <= float(response.headers["x-confidence-score"]) <= 1.0
+    assert isinstance(json.loads(response.headers["x-vessel-metrics"]), (dict, type(None)))
+    assert "total;dur=" in response.headers["server-timing"]
+    assert _decode_png(response.content).shape == (64, 80)
+
+
+def test_multipart_upload_matches_raw_body(client, png_bytes):
+    raw = client.post("/predict/binary", content=png_bytes, headers={"Content-Type": "image/png"})
+    multipart = client.post("/predict/binary", files={"file": ("eye.png", png_bytes, "image/png")})
+
+    assert multipart.status_code == 200
+    assert multipart.headers["content-type"] == "image/png"
+    np.testing.assert_array_equal(_decode_png(multipart.content), _decode_png(raw.content))
+
+
+def test_accept_multipart_mixed_returns_metadata_and_mask_parts(client, png_bytes):
+    response = client.post(
+        "/predict/binary", content=png_bytes,
+        headers={"Content-Type": "image/png", "Accept": "multipart/mixed"}
+    )
+
+    assert response.status_code == 200
+    media_type, _, boundary = response.headers["content-type"].partition("; boundary=")
+    assert media_type == "multipart/mixed"
+    parts = response.content.split(f"--{boundary}".encode())
+    assert parts[-1].strip() == b"--"
+    metadata_part, mask_part = (part.split(b"\r\n\r\n", 1) for part in parts[1:3])
+    assert metadata_part[0].strip() == b"Content-Type: application/json"
+    assert mask_part[0].strip() == b"Content-Type: image/png"
+    metadata = json.loads(metadata_part[1])
+    assert metadata["success"] and metadata["mask_shape"] == [64, 80]
+    assert _decode_png(mask_part[1][:-2]).shape == (64, 80)
+
+
+@pytest.mark.parametrize("kwargs, status", [
+    ({"content": b"{}", "headers": {"Content-Type": "application/json"}}, 415),
+    ({"content": b"", "headers": {"Content-Type": "image/png"}}, 400),
+    ({"files": {"file": ("notes.txt", b"hello", "text/plain")}}, 400),
+    ({"files": {"other": ("eye.png", b"\x89PNG", "image/png")}}, 400),
+])
+def test_rejects_unusable_uploads(client, kwargs, status):
+    assert client.post("/predict/binary", **kwargs).status_code == status
+
+
+def test_undecodable_image_is_a_client_error(client):
+    response = client.post("/predict/binary", content=b"not an image", headers={"Content-Type": "image/png"})
+
+    assert response.status_code == 400
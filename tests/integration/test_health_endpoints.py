@@ -0,0 +1,38 @@
+"""Health endpoints: liveness, readiness and the cached health probe."""
+import time
+
+import pytest
+
+pytestmark = pytest.mark.integration
+
+
+def test_liveness_does_not_depend_on_the_model(client):
+    response = client.get("/health/live")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+def test_readiness_reports_a_loaded_model(client):
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["ready"] is True
+    assert body["state"] == "ready"
+    assert body["progress"] == 1.0
+    assert body["error"] is None
+
+
+def test_health_is_served_from_the_background_probe(client):
+    # The monitor re-probes every second until its first probe of the ready model
+    deadline = time.monotonic() + 10.0
+    first = client.get("/health").json()
+    while first["status"] == "starting" and time.monotonic() < deadline:
+        time.sleep(0.1)
+        first = client.get("/health").json()
+    second = client.get("/health").json()
+
+    assert first["status"] == "healthy" and first["model_loaded"] is True
+    # Both calls return the same cached probe instead of running inference
+    assert first["checked_at"] == second["checked_at"]
@@ -0,0 +1,92 @@
+"""Mask formats on the prediction endpoints: media types and lossless round trips."""
+import base64
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from app.utils.mask_encoding import decode_mask_rle, unpack_mask_bits
+
+pytestmark = pytest.mark.integration
+
+LOSSLESS_FORMATS = ("png", "png_fast", "png_1bit", "rle", "packbits")
+
+
+def _decode(data, mask_format, shape):
+    """Decode a binary or JSON mask payload to a 0/255 array."""
+    if mask_format == "rle":
+        return decode_mask_rle(data if isinstance(data, dict) else json.loads(data))
+    if mask_format == "packbits":
+        return unpack_mask_bits(data, shape)
+    mask = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    return np.where(mask > 0, 255, 0).astype(np.uint8)
+
+
+@pytest.fixture(scope="module")
+def reference_mask(client):
+    def predict(png_bytes):
+        response = client.post("/predict/binary", params={"mask_format": "png"}, content=png_bytes,
+                               headers={"Content-Type": "image/png"})
+        assert response.status_code == 200
+        return _decode(response.content, "png", None)
+    return predict
+
+
+@pytest.mark.parametrize("mask_format, media_type", [
+    ("png", "image/png"),
+    ("png_fast", "image/png"),
+    ("png_1bit", "image/png"),
+    ("rle", "application/json"),
+    ("packbits", "application/octet-stream"),
+    ("geojson", "application/geo+json"),
+])
+def test_binary_endpoint_media_type_follows_mask_format(client, png_bytes, mask_format, media_type):
+    response = client.post("/predict/binary", params={"mask_format": mask_format}, content=png_bytes,
+                           headers={"Content-Type": "image/png"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].split(";")[0] == media_type
+
+
+@pytest.mark.parametrize("mask_format", LOSSLESS_FORMATS)
+def test_binary_endpoint_formats_decode_to_the_same_mask(client, png_bytes, reference_mask, mask_format):
+    response = client.post("/predict/binary", params={"mask_format": mask_format}, content=png_bytes,
+                           headers={"Content-Type": "image/png"})
+
+    mask = _decode(response.content, mask_format, (64, 80))
+    np.testing.assert_array_equal(mask, reference_mask(png_bytes))
+
+
+@pytest.mark.parametrize("mask_format", LOSSLESS_FORMATS)
+def test_file_endpoint_json_formats_decode_to_the_same_mask(client, png_bytes, reference_mask, mask_format):
+    response = client.post("/predict/file", params={"mask_format": mask_format},
+                           files={"file": ("eye.png", png_bytes, "image/png")})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["mask_format"] == mask_format
+    assert body["mask_shape"] == [64, 80]
+    payload = body["segmentation_mask"]
+    if isinstance(payload, str):
+        header, _, data = payload.partition(",")
+        assert header.endswith(";base64")
+        payload = base64.b64decode(data)
+    np.testing.assert_array_equal(_decode(payload, mask_format, (64, 80)), reference_mask(png_bytes))
+
+
+def test_file_endpoint_geojson_is_a_feature_collection(client, png_bytes):
+    response = client.post("/predict/file", params={"mask_format": "geojson"},
+                           files={"file": ("eye.png", png_bytes, "image/png")})
+
+    assert response.status_code == 200
+    geojson = response.json()["segmentation_mask"]
+    assert geojson["type"] == "FeatureCollection"
+    assert all(feature["geometry"]["type"] in ("Polygon", "LineString") for feature in geojson["features"])
+
+
+def test_unknown_mask_format_is_rejected(client, png_bytes):
+    response = client.post("/predict/binary", params={"mask_format": "jpeg"}, content=png_bytes,
+                           headers={"Content-Type": "image/png"})
+
+    assert response.status_code == 422
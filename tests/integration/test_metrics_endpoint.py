@@ -0,0 +1,27 @@
+"""/metrics: Prometheus exposition of the request and pipeline stage histograms."""
+import pytest
+
+pytestmark = pytest.mark.integration
+
+
+def test_metrics_expose_stage_and_endpoint_latencies(client, png_bytes):
+    assert client.post("/predict/file", files={"file": ("eye.png", png_bytes, "image/png")}).status_code == 200
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert "# TYPE vessel_stage_duration_seconds histogram" in text
+    assert 'vessel_stage_duration_seconds_count{stage="image_decode"' in text
+    assert 'method="POST",endpoint="/predict/file",status="200"' in text
+
+
+def test_unmatched_routes_share_one_series(client):
+    client.get("/no-such-route-1")
+    client.get("/no-such-route-2")
+
+    text = client.get("/metrics").text
+
+    assert 'endpoint="unmatched",status="404"' in text
+    assert "/no-such-route" not in text
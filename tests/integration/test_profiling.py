@@ -0,0 +1,61 @@
+"""On-demand request profiling: admin gating and downloadable cProfile stats."""
+import base64
+import marshal
+
+import pytest
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def admin(monkeypatch, tmp_path):
+    """Enable admin endpoints with a known token and keep profiles (without TF traces) in tmp_path."""
+    from app import config
+    from app.services import request_profiler
+
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(request_profiler, "output_dir", str(tmp_path))
+    monkeypatch.setattr(request_profiler, "tf_trace", False)
+    return {"X-Admin-Token": "secret"}
+
+
+def test_profiling_is_disabled_without_an_admin_token(client, png_bytes, monkeypatch):
+    from app import config
+
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "")
+    response = client.post("/predict/file", params={"profile": True}, files={"file": ("eye.png", png_bytes, "image/png")})
+
+    assert response.status_code == 403
+
+
+def test_wrong_admin_token_is_rejected(client, png_bytes, admin):
+    response = client.post("/predict", params={"profile": True}, headers={"X-Admin-Token": "guess"},
+                           json={"image": base64.b64encode(png_bytes).decode()})
+
+    assert response.status_code == 401
+
+
+def test_profiled_request_can_be_downloaded(client, png_bytes, admin):
+    response = client.post("/predict/file", params={"profile": True}, headers=admin,
+                           files={"file": ("eye.png", png_bytes, "image/png")})
+
+    assert response.status_code == 200
+    body = response.json()
+    # Profiled requests run isolated, never from the result cache
+    assert body["cached"] is False
+    profile_id = body["profile"]["profile_id"]
+
+    download = client.get(f"/admin/profiles/{profile_id}", headers=admin)
+    assert download.status_code == 200
+    assert isinstance(marshal.loads(download.content), dict)
+
+    assert client.get(f"/admin/profiles/{profile_id}").status_code == 401
+    assert client.get("/admin/profiles/20990101-000000-deadbeef", headers=admin).status_code == 404
+
+
+def test_binary_endpoint_returns_the_profile_id_header(client, png_bytes, admin):
+    response = client.post("/predict/binary", params={"profile": True},
+                           headers={**admin, "Content-Type": "image/png"}, content=png_bytes)
+
+    assert response.status_code == 200
+    assert client.get(f"/admin/profiles/{response.headers['x-profile-id']}", headers=admin).status_code == 200
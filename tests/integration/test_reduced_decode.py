@@ -0,0 +1,34 @@
+"""Reduced-resolution decoding of oversized JPEG uploads."""
+import cv2
+import numpy as np
+import pytest
+
+pytestmark = pytest.mark.integration
+
+
+def _encode(extension, height=1200, width=1600, seed=21):
+    image = np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return cv2.imencode(extension, cv2.GaussianBlur(image, (9, 9), 0))[1].tobytes()
+
+
+def _predict(client, data, media_type, **params):
+    response = client.post("/predict/file", params={"eye_crop": False, **params},
+                           files={"file": ("eye", data, media_type)})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_large_jpeg_is_decoded_reduced_but_masked_at_full_size(client):
+    body = _predict(client, _encode(".jpg"), "image/jpeg", inference_mode="resize")
+
+    # 1600x1200 reduced by 4 is 400x300, the smallest that still covers the 256px model input
+    assert body["decode_scale"] == 4
+    assert body["mask_shape"] == [1200, 1600]
+
+
+def test_png_and_tiled_requests_decode_at_full_resolution(client):
+    png = _predict(client, _encode(".png", seed=22), "image/png", inference_mode="resize")
+    tiled = _predict(client, _encode(".jpg", seed=23), "image/jpeg", inference_mode="tiled")
+
+    assert png["decode_scale"] == 1 and png["mask_shape"] == [1200, 1600]
+    assert tiled["decode_scale"] == 1 and tiled["mask_shape"] == [1200, 1600]
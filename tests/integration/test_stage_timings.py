@@ -0,0 +1,30 @@
+"""Per-stage timings in prediction responses and their Server-Timing header."""
+import cv2
+import numpy as np
+import pytest
+
+pytestmark = pytest.mark.integration
+
+
+def _header_stages(value):
+    return {entry.split(";dur=")[0]: float(entry.split(";dur=")[1]) for entry in value.split(", ")}
+
+
+def test_json_timings_match_the_server_timing_header(client):
+    # An image no other test sends, so the result cache cannot short-circuit the pipeline
+    image = np.random.default_rng(17).integers(0, 256, (48, 72, 3), dtype=np.uint8)
+    png_bytes = cv2.imencode(".png", image)[1].tobytes()
+
+    response = client.post("/predict/file", params={"eye_crop": False},
+                           files={"file": ("eye.png", png_bytes, "image/png")})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["cached"] is False
+    stages = _header_stages(response.headers["server-timing"])
+    total = stages.pop("total")
+    assert stages == pytest.approx(body["timings"], abs=0.001)
+    assert {"image_decode", "mask_encode"} <= set(body["timings"])
+    assert all(duration >= 0 for duration in body["timings"].values())
+    assert total == pytest.approx(body["processing_time"] * 1000.0, abs=0.001)
+    assert sum(body["timings"].values()) <= total + 1.0
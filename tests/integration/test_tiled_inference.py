@@ -0,0 +1,48 @@
+"""Tiled inference: native-resolution masks through the prediction endpoints."""
+import cv2
+import numpy as np
+import pytest
+
+pytestmark = pytest.mark.integration
+
+
+def _png(height, width, seed):
+    image = np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return cv2.imencode(".png", image)[1].tobytes()
+
+
+@pytest.mark.parametrize("height, width", [(300, 520), (100, 180)])
+def test_tiled_mask_matches_the_input_resolution(client, height, width):
+    response = client.post("/predict/file", params={"inference_mode": "tiled", "eye_crop": False},
+                           files={"file": ("eye.png", _png(height, width, seed=width), "image/png")})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["mask_shape"] == [height, width]
+    assert body["decode_scale"] == 1
+    # Tiles go to the model as they are, without the resize-mode preprocess stage
+    assert "model" in body["timings"] and "preprocess" not in body["timings"]
+
+
+def test_tiled_and_resized_results_are_cached_separately(client):
+    png = _png(280, 300, seed=7)
+
+    def predict(mode):
+        response = client.post("/predict/file", params={"inference_mode": mode, "eye_crop": False},
+                               files={"file": ("eye.png", png, "image/png")})
+        assert response.status_code == 200
+        return response.json()
+
+    resized, tiled = predict("resize"), predict("tiled")
+
+    assert not tiled["cached"]
+    assert "preprocess" in resized["timings"] and "preprocess" not in tiled["timings"]
+    assert tiled["mask_shape"] == resized["mask_shape"] == [280, 300]
+    assert predict("tiled")["cached"]
+
+
+def test_unknown_inference_mode_is_rejected(client, png_bytes):
+    response = client.post("/predict/file", params={"inference_mode": "mosaic"},
+                           files={"file": ("eye.png", png_bytes, "image/png")})
+
+    assert response.status_code == 422
@@ -0,0 +1,70 @@
+"""Image-processing microbenchmark suite: every case runs, and baseline comparison flags regressions."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+BENCHMARK_DIR = Path(__file__).resolve().parents[2] / "scripts" / "benchmarks"
+sys.path.insert(0, str(BENCHMARK_DIR))
+
+from benchmark_image_processing import build_cases, compare, measure, peak_memory  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+
+def _result(p50_ms, peak_memory_bytes):
+    return {"p50_ms": p50_ms, "peak_memory_bytes": peak_memory_bytes}
+
+
+def test_every_case_runs_on_a_small_image():
+    cases = list(build_cases([(96, 64)], ["PNG", "JPEG"]))
+
+    names = [name for name, _, _, _ in cases]
+    assert len(names) == len(set(names))
+    assert {"decode_base64_image[png]", "decode_image_bytes_reduced[jpeg]", "calculate_vessel_morphology"} <= set(names)
+    for name, label, megapixels, fn in cases:
+        assert label == "96x64" and megapixels == pytest.approx(0.006144)
+        fn()
+
+
+def test_measure_and_peak_memory():
+    latencies = measure(lambda: None, min_iterations=5, min_time=0.0, warmup=0)
+
+    assert len(latencies) == 5 and (latencies >= 0).all()
+    assert peak_memory(lambda: np.ones(1_000_000, dtype=np.uint8)) >= 1_000_000
+
+
+def test_compare_flags_latency_and_memory_regressions():
+    baseline = {"a/1x1": _result(10.0, 1000), "b/1x1": _result(10.0, 1000), "c/1x1": _result(0.0, 0)}
+    results = {
+        "a/1x1": _result(11.0, 1050),
+        "b/1x1": _result(12.0, 1200),
+        "c/1x1": _result(5.0, 10),
+        "new/1x1": _result(99.0, 99),
+    }
+
+    regressions = compare(results, baseline, threshold=0.15, memory_threshold=0.10)
+
+    assert [(key, metric) for key, metric, *_ in regressions] == [("b/1x1", "p50_ms"), ("b/1x1", "peak_memory_bytes")]
+    assert regressions[0][2:] == (10.0, 12.0, 1.2)
+
+
+def test_cli_exits_non_zero_on_regression(tmp_path):
+    command = [sys.executable, str(BENCHMARK_DIR / "benchmark_image_processing.py"), "--sizes", "64x64",
+               "--formats", "PNG", "--filter", "preprocess_image", "--min-iterations", "1", "--min-time", "0"]
+    output = tmp_path / "results.json"
+
+    subprocess.run(command + ["--output", str(output)], check=True, capture_output=True)
+    report = json.loads(output.read_text())
+    assert sorted(report["results"]) == ["preprocess_image/64x64", "preprocess_image[pooled]/64x64"]
+
+    for result in report["results"].values():
+        result["p50_ms"] /= 100.0
+    output.write_text(json.dumps(report))
+    completed = subprocess.run(command + ["--baseline", str(output)], capture_output=True, text=True)
+
+    assert completed.returncode == 1
+    assert "regression(s)" in completed.stdout
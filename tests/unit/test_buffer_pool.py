@@ -0,0 +1,82 @@
+"""BufferPool reuse rules, and pipeline stages writing into pooled buffers."""
+import numpy as np
+import pytest
+
+from app.services.buffer_pool import BufferPool
+from app.utils.image_processing import apply_morphological_operations, postprocess_mask, preprocess_image
+
+pytestmark = pytest.mark.unit
+
+
+def test_released_buffer_is_handed_out_again():
+    pool = BufferPool(max_bytes=1024)
+    buffer = pool.acquire((4, 4), np.float32)
+    pool.release(buffer)
+
+    assert pool.acquire((4, 4), np.float32) is buffer
+    assert pool.acquire((4, 4), np.float32) is not buffer
+    assert (pool.reuses, pool.allocations) == (1, 2)
+
+
+def test_shape_and_dtype_are_part_of_the_key():
+    pool = BufferPool(max_bytes=1024)
+    buffer = pool.acquire((4, 4), np.uint8)
+    pool.release(buffer)
+
+    assert pool.acquire((4, 4), np.float32) is not buffer
+    assert pool.acquire((2, 8), np.uint8) is not buffer
+    assert pool.acquire((4, 4), np.uint8) is buffer
+
+
+def test_views_and_double_releases_are_ignored():
+    pool = BufferPool(max_bytes=1024)
+    buffer = pool.acquire((8, 8), np.uint8)
+    pool.release(buffer[:4])
+    pool.release(np.empty((8, 8), dtype=np.uint8, order="F")[:, :4].copy(order="F"))
+    pool.release(buffer)
+    pool.release(buffer)
+
+    assert pool.get_stats()["free_buffers"] == 1
+    assert pool.acquire((8, 8), np.uint8) is buffer
+    assert pool.acquire((8, 8), np.uint8) is not buffer
+
+
+def test_least_recently_released_shapes_are_evicted_over_budget():
+    pool = BufferPool(max_bytes=200)
+    first, second, third = (pool.acquire((size,), np.uint8) for size in (100, 90, 80))
+    pool.release(first)
+    pool.release(second)
+    pool.release(third)
+
+    assert pool.free_bytes == 170
+    assert pool.evictions == 1
+    assert pool.acquire((100,), np.uint8) is not first
+    assert pool.acquire((90,), np.uint8) is second
+
+
+def test_zero_budget_disables_pooling():
+    pool = BufferPool(max_bytes=0)
+    buffer = pool.acquire((4,), np.uint8)
+    pool.release(buffer)
+
+    assert pool.acquire((4,), np.uint8) is not buffer
+    assert pool.free_bytes == 0
+
+
+def test_pooled_pipeline_stages_match_the_allocating_ones():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (120, 90, 3), dtype=np.uint8)
+    prediction = rng.random((1, 64, 64, 1), dtype=np.float32)
+    pool = BufferPool(max_bytes=1 << 20)
+
+    tensor = preprocess_image(image, (64, 64), out=pool.acquire((1, 64, 64, 3), np.float32),
+                              resized=pool.acquire((64, 64, 3), np.uint8))
+    mask = postprocess_mask(prediction, (120, 90), out=pool.acquire((120, 90), np.uint8),
+                            thresholded=pool.acquire((64, 64), np.uint8))
+    expected_mask = postprocess_mask(prediction, (120, 90))
+
+    np.testing.assert_array_equal(tensor, preprocess_image(image, (64, 64)))
+    np.testing.assert_array_equal(mask, expected_mask)
+    # In-place cleanup gives the same result as writing to a new array
+    np.testing.assert_array_equal(apply_morphological_operations(mask, dst=mask),
+                                  apply_morphological_operations(expected_mask))
@@ -0,0 +1,88 @@
+"""InferenceExecutor: bounded admission and slot accounting."""
+import asyncio
+import threading
+
+import pytest
+
+from app.services.executor import ExecutorSaturatedError, InferenceExecutor
+
+pytestmark = pytest.mark.unit
+
+
+def test_runs_blocking_calls_off_the_event_loop():
+    executor = InferenceExecutor(max_workers=2, max_pending=2)
+
+    async def main():
+        loop_thread = threading.get_ident()
+        return await executor.run(lambda a, b=0: (a + b, threading.get_ident() != loop_thread), 1, b=2)
+
+    try:
+        assert asyncio.run(main()) == (3, True)
+        assert executor.pending == 0
+    finally:
+        executor.shutdown()
+
+
+def test_rejects_jobs_beyond_max_pending():
+    executor = InferenceExecutor(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def main():
+        running = asyncio.ensure_future(executor.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(lambda: None)
+        release.set()
+        await running
+
+    try:
+        asyncio.run(main())
+        assert executor.rejected == 1
+        assert executor.pending == 0
+    finally:
+        executor.shutdown()
+
+
+def test_cancelled_caller_keeps_the_slot_until_the_job_finishes():
+    executor = InferenceExecutor(max_workers=1, max_pending=1)
+    started, release = threading.Event(), threading.Event()
+
+    def job():
+        started.set()
+        release.wait(5)
+
+    async def main():
+        caller = asyncio.ensure_future(executor.run(job))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        caller.cancel()
+        await asyncio.sleep(0.05)
+        # The thread is still busy, so the slot must still be taken
+        assert executor.pending == 1
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(lambda: None)
+        release.set()
+        for _ in range(100):
+            if executor.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert executor.pending == 0
+        assert await executor.run(lambda: "free") == "free"
+
+    try:
+        asyncio.run(main())
+    finally:
+        executor.shutdown()
+
+
+def test_errors_propagate_and_release_the_slot():
+    executor = InferenceExecutor(max_workers=1, max_pending=1)
+
+    async def main():
+        with pytest.raises(ZeroDivisionError):
+            await executor.run(lambda: 1 / 0)
+
+    try:
+        asyncio.run(main())
+        assert executor.pending == 0
+    finally:
+        executor.shutdown()
@@ -0,0 +1,67 @@
+"""Eye-region pre-screen: the sclera box on synthetic slit-lamp frames."""
+import cv2
+import numpy as np
+import pytest
+
+from app.utils.image_processing import locate_eye_region
+
+pytestmark = pytest.mark.unit
+
+
+def _slit_lamp_frame(height=600, width=800, center=(420, 280), axes=(160, 70)):
+    """Dark background, eyelid skin, a white sclera ellipse and a dark iris."""
+    rng = np.random.default_rng(0)
+    frame = np.full((height, width, 3), 15, dtype=np.uint8)
+    cv2.ellipse(frame, center, (axes[0] + 80, axes[1] + 60), 0, 0, 360, (205, 135, 110), -1)
+    cv2.ellipse(frame, center, axes, 0, 0, 360, (240, 232, 226), -1)
+    cv2.circle(frame, center, axes[1] - 5, (70, 50, 40), -1)
+    noise = rng.integers(-6, 7, frame.shape)
+    return np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def test_box_encloses_the_sclera_and_iris():
+    center, axes = (420, 280), (160, 70)
+
+    box = locate_eye_region(_slit_lamp_frame(center=center, axes=axes), margin=0.0)
+
+    assert box is not None
+    x, y, width, height = box
+    # Both sclera sides are found, so the iris between them is inside the box
+    assert x <= center[0] - axes[0] + 10 and x + width >= center[0] + axes[0] - 10
+    assert y <= center[1] - axes[1] + 10 and y + height >= center[1] + axes[1] - 10
+    # ... and the eyelid skin around them is not
+    assert width * height < 0.5 * 800 * 600
+
+
+def test_margin_grows_the_box_within_the_frame():
+    frame = _slit_lamp_frame()
+
+    tight = locate_eye_region(frame, margin=0.0)
+    padded = locate_eye_region(frame, margin=0.2)
+
+    assert padded[0] < tight[0] and padded[1] < tight[1]
+    assert padded[2] > tight[2] and padded[3] > tight[3]
+    assert padded[0] + padded[2] <= 800 and padded[1] + padded[3] <= 600
+
+
+def test_box_scales_with_the_input_resolution():
+    small = locate_eye_region(_slit_lamp_frame(), margin=0.0)
+    large = locate_eye_region(cv2.resize(_slit_lamp_frame(), (1600, 1200), interpolation=cv2.INTER_NEAREST),
+                              margin=0.0)
+
+    np.testing.assert_allclose(large, np.multiply(small, 2), atol=12)
+
+
+@pytest.mark.parametrize("frame", [
+    np.zeros((300, 400, 3), dtype=np.uint8),
+    np.full((300, 400, 3), 128, dtype=np.uint8),
+    np.full((300, 400, 3), 240, dtype=np.uint8),
+])
+def test_featureless_frames_are_not_cropped(frame):
+    assert locate_eye_region(frame) is None
+
+
+def test_eye_filling_the_frame_is_not_cropped():
+    frame = _slit_lamp_frame(height=300, width=400, center=(200, 150), axes=(230, 180))
+
+    assert locate_eye_region(frame) is None
@@ -0,0 +1,94 @@
+"""HealthMonitor: cached background probes instead of inference per health call."""
+import threading
+
+import pytest
+
+from app.services.health_monitor import HealthMonitor
+
+pytestmark = pytest.mark.unit
+
+
+class _FakeService:
+    """Records health checks; the probe fails while ``error`` is set."""
+
+    def __init__(self, is_ready=True):
+        self.is_ready = is_ready
+        self.error = None
+        self.calls = []
+        self.probed = threading.Event()
+
+    def health_check(self, probe=True):
+        self.calls.append(probe)
+        status = {"status": "healthy" if self.is_ready else "starting", "model_loaded": self.is_ready}
+        if probe and self.is_ready:
+            status.update({"test_prediction": "failed", "test_error": self.error} if self.error
+                          else {"test_prediction": "passed", "test_time": 0.01})
+            self.probed.set()
+        return status
+
+
+def test_status_is_served_from_the_last_probe():
+    service = _FakeService()
+    monitor = HealthMonitor(service)
+
+    monitor.probe()
+    for _ in range(5):
+        status = monitor.get_status()
+
+    assert service.calls == [True]
+    assert status["test_prediction"] == "passed"
+    assert status["checked_at"] is not None and status["probe_latency"] >= 0
+
+
+def test_status_before_the_first_probe_never_runs_inference():
+    service = _FakeService()
+
+    status = HealthMonitor(service).get_status()
+
+    assert service.calls == [False]
+    assert status["checked_at"] is None and status["probe_latency"] is None
+    assert "test_prediction" not in status
+
+
+def test_model_that_is_not_ready_is_checked_without_inference():
+    service = _FakeService(is_ready=False)
+
+    status = HealthMonitor(service).probe()
+
+    assert service.calls == [False]
+    assert status["status"] == "starting" and status["probe_latency"] is None
+
+
+def test_failed_probe_is_cached():
+    service = _FakeService()
+    service.error = "model returned NaN"
+    monitor = HealthMonitor(service)
+
+    monitor.probe()
+
+    assert monitor.get_status()["test_prediction"] == "failed"
+    assert monitor.get_status()["test_error"] == "model returned NaN"
+
+
+def test_returned_status_is_a_copy():
+    monitor = HealthMonitor(_FakeService())
+    monitor.probe()
+
+    monitor.get_status()["status"] = "tampered"
+
+    assert monitor.get_status()["status"] == "healthy"
+
+
+def test_background_thread_probes_and_stops():
+    service = _FakeService()
+    monitor = HealthMonitor(service, interval=60.0)
+
+    monitor.start()
+    try:
+        assert service.probed.wait(5.0)
+        monitor.start()
+    finally:
+        monitor.stop()
+
+    assert service.calls == [True]
+    assert monitor.get_status()["test_prediction"] == "passed"
@@ -0,0 +1,65 @@
+"""Image decoding: RGB conversion, the read-only contract and reduced JPEG decoding."""
+import base64
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.utils.image_processing import decode_base64_image, decode_image_bytes, decode_image_bytes_reduced
+
+pytestmark = pytest.mark.unit
+
+
+def _encode(image, image_format):
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def test_png_decodes_to_the_same_rgb_pixels():
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, (30, 40, 3), dtype=np.uint8)
+
+    decoded = decode_image_bytes(_encode(Image.fromarray(pixels), "PNG"))
+
+    np.testing.assert_array_equal(decoded, pixels)
+
+
+def test_greyscale_is_converted_to_rgb():
+    decoded = decode_image_bytes(_encode(Image.new("L", (8, 6), 100), "PNG"))
+
+    assert decoded.shape == (6, 8, 3)
+    assert (decoded == 100).all()
+
+
+def test_decoded_array_is_read_only():
+    decoded = decode_image_bytes(_encode(Image.new("RGB", (4, 4)), "PNG"))
+
+    assert not decoded.flags.writeable
+    with pytest.raises(ValueError):
+        decoded[0, 0, 0] = 1
+    writable = decoded.copy()
+    writable[0, 0, 0] = 1
+
+
+def test_base64_data_uri_is_accepted():
+    payload = "data:image/png;base64," + base64.b64encode(_encode(Image.new("RGB", (5, 3)), "PNG")).decode()
+
+    assert decode_base64_image(payload).shape == (3, 5, 3)
+
+
+def test_invalid_bytes_raise_value_error():
+    with pytest.raises(ValueError, match="Failed to decode image bytes"):
+        decode_image_bytes(b"not an image")
+
+
+def test_reduced_jpeg_decode_keeps_the_model_input_covered():
+    jpeg = _encode(Image.new("RGB", (2400, 1800), (120, 60, 30)), "JPEG")
+
+    pixels, original_size, scale = decode_image_bytes_reduced(jpeg, (256, 256))
+
+    assert original_size == (1800, 2400)
+    assert scale == 4
+    assert pixels.shape == (450, 600, 3)
+    assert min(pixels.shape[:2]) >= 256
@@ -0,0 +1,75 @@
+"""KerasBackend: fixed-signature compiled inference against model.predict, and batch padding."""
+import numpy as np
+import pytest
+
+from app.services.backends import KerasBackend
+from app.services.model_service import ModelService
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    """A small random convolutional model with the service's input and output shapes."""
+    tf = pytest.importorskip("tensorflow")
+    tf.keras.utils.set_random_seed(0)
+    inputs = tf.keras.Input((256, 256, 3))
+    x = tf.keras.layers.Conv2D(4, 3, padding="same", activation="relu")(inputs)
+    outputs = tf.keras.layers.Conv2D(1, 1, activation="sigmoid")(x)
+    path = str(tmp_path_factory.mktemp("models") / "small.keras")
+    tf.keras.Model(inputs, outputs).save(path)
+    return path
+
+
+def _batch(size, seed=0):
+    return np.random.default_rng(seed).random((size, 256, 256, 3), dtype=np.float32)
+
+
+def test_compiled_functions_match_model_predict(model_path):
+    backend = KerasBackend(model_path, allow_dummy_fallback=False)
+    backend.load()
+    backend.warm_up((1, 2))
+
+    assert backend.fixed_batch_sizes
+    assert backend.describe()["compiled"] is True
+    assert backend.describe()["batch_sizes"] == [1, 2]
+    for size in (1, 2):
+        batch = _batch(size)
+        np.testing.assert_allclose(backend.run(batch), backend.model.predict(batch, verbose=0), atol=1e-5)
+
+
+def test_unwarmed_batch_size_falls_back_to_model_predict(model_path):
+    backend = KerasBackend(model_path, allow_dummy_fallback=False)
+    backend.load()
+    backend.warm_up((1,))
+
+    assert backend.run(_batch(3)).shape == (3, 256, 256, 1)
+
+
+def test_uncompiled_backend_serves_any_batch_size(model_path):
+    backend = KerasBackend(model_path, compiled=False, allow_dummy_fallback=False)
+    backend.load()
+    backend.warm_up((1, 2))
+
+    assert not backend.fixed_batch_sizes
+    assert backend.describe()["compiled"] is False
+    assert backend.run(_batch(3)).shape == (3, 256, 256, 1)
+
+
+def test_missing_model_without_fallback_fails_to_load(tmp_path):
+    backend = KerasBackend(str(tmp_path / "missing.keras"), allow_dummy_fallback=False)
+
+    with pytest.raises(RuntimeError):
+        backend.load()
+
+
+def test_service_pads_batches_to_the_compiled_sizes(model_path):
+    service = ModelService(model_path=model_path, batching_enabled=False, inference_batch_sizes=(1, 4),
+                           max_batch_size=4, inference_mode="resize", eye_crop=False, allow_dummy_fallback=False)
+    reference = KerasBackend(model_path, compiled=False, allow_dummy_fallback=False)
+    reference.load()
+
+    # 3 pads up to 4; 6 runs as 4 plus 2 padded to 4
+    for size in (3, 6):
+        batch = _batch(size, seed=size)
+        np.testing.assert_allclose(service._run_inference(batch), reference.run(batch), atol=1e-5)
@@ -0,0 +1,87 @@
+"""HTTP load-test harness: header parsing, summaries, and open-loop drops counted as errors."""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts" / "benchmarks"))
+
+from load_test import LoadTest, parse_server_timing, parse_weights, summarize  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+
+def _record(endpoint="predict", status=200, latency_ms=10.0, error=None, **kwargs):
+    record = {"endpoint": endpoint, "size": None, "status": status, "error": error,
+              "server_timings": {}, "cached": None, "latency_ms": latency_ms}
+    record.update(kwargs)
+    return record
+
+
+def test_parse_weights():
+    assert parse_weights("predict=3,health:1,predict_file") == {"predict": 3.0, "health": 1.0, "predict_file": 1.0}
+    assert parse_weights("512x512=1", cast=str.upper) == {"512X512": 1.0}
+
+
+def test_parse_server_timing():
+    header = "image_decode;dur=1.5, model;desc=\"forward\";dur=40, total;dur=45.25, marker"
+
+    assert parse_server_timing(header) == {"image_decode": 1.5, "model": 40.0, "total": 45.25}
+    assert parse_server_timing(None) == {}
+
+
+def test_summary_counts_drops_as_errors_but_not_in_latency():
+    records = [
+        _record(latency_ms=10.0, server_timings={"model": 8.0}, cached=True),
+        _record(latency_ms=30.0, server_timings={"model": 20.0}),
+        _record(status=503, latency_ms=5.0),
+        _record(status=None, error="dropped", latency_ms=None),
+    ]
+
+    summary = summarize(records, elapsed=2.0)["predict"]
+
+    assert summary["requests"] == 4 and summary["ok"] == 2
+    assert summary["error_rate"] == 0.5
+    assert summary["errors"] == {"503": 1, "dropped": 1}
+    assert summary["throughput_rps"] == 1.0
+    assert summary["cached"] == 1
+    assert summary["latency"]["max_ms"] == 30.0 and summary["latency"]["p50_ms"] == 20.0
+    assert summary["server_timings"]["model"]["mean_ms"] == 14.0
+
+
+def test_summary_groups_by_endpoint_and_size():
+    records = [_record(size="512x512"), _record(size="1024x1024"), _record(endpoint="health")]
+
+    summary = summarize(records, elapsed=1.0)
+
+    assert sorted(summary) == ["all", "health", "predict", "predict[1024x1024]", "predict[512x512]"]
+    assert summary["all"]["requests"] == 3
+    assert summary["health"]["latency"]["p99_ms"] == 10.0
+
+
+def test_open_loop_records_arrivals_over_the_in_flight_cap_as_dropped():
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200, json={"status": "healthy"})
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test") as client:
+            load_test = LoadTest(client, {"health": 1.0}, {}, {}, timeout=5.0)
+            asyncio.get_running_loop().call_later(0.3, release.set)
+            await load_test.open_loop(rate=200.0, duration=0.2, max_in_flight=2)
+            return load_test
+
+    load_test = asyncio.run(main())
+
+    summary = summarize(load_test.records, elapsed=0.2)["all"]
+    assert load_test.dropped > 0
+    assert summary["ok"] == 2
+    assert summary["errors"] == {"dropped": load_test.dropped}
+    assert summary["requests"] == 2 + load_test.dropped
+    # Latency of the admitted requests includes the time they were held
+    assert summary["latency"]["max_ms"] >= 100.0
@@ -0,0 +1,104 @@
+"""Mask wire formats decode back to the mask they were encoded from."""
+import base64
+
+import cv2
+import numpy as np
+import pytest
+
+from app.utils.mask_encoding import (
+    MASK_FORMATS, MASK_MEDIA_TYPES, decode_mask_rle, encode_mask, encode_mask_rle, mask_to_geojson, mask_to_json,
+    pack_mask_bits, unpack_mask_bits
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _random_mask(height, width, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.random((height, width)) < 0.3).astype(np.uint8) * 255
+
+
+MASKS = [
+    _random_mask(37, 53),
+    np.zeros((16, 16), dtype=np.uint8),
+    np.full((9, 7), 255, dtype=np.uint8),
+    np.pad(np.full((3, 3), 255, dtype=np.uint8), 2),
+]
+
+
+@pytest.mark.parametrize("mask", MASKS)
+def test_rle_round_trip(mask):
+    rle = encode_mask_rle(mask)
+
+    assert rle["size"] == list(mask.shape)
+    assert sum(rle["counts"]) == mask.size
+    np.testing.assert_array_equal(decode_mask_rle(rle), mask)
+
+
+def test_rle_starts_with_background_run():
+    mask = np.full((2, 2), 255, dtype=np.uint8)
+
+    assert encode_mask_rle(mask)["counts"] == [0, 4]
+
+
+@pytest.mark.parametrize("mask", MASKS)
+def test_packbits_round_trip(mask):
+    data = pack_mask_bits(mask)
+
+    assert len(data) == -(-mask.size // 8)
+    np.testing.assert_array_equal(unpack_mask_bits(data, mask.shape), mask)
+
+
+@pytest.mark.parametrize("mask_format", ["png", "png_fast", "png_1bit"])
+@pytest.mark.parametrize("mask", MASKS)
+def test_png_formats_round_trip(mask, mask_format):
+    encoded = encode_mask(mask, mask_format)
+
+    decoded = cv2.imdecode(np.frombuffer(encoded, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    np.testing.assert_array_equal(decoded, mask)
+
+
+def test_geojson_polygon_covers_the_mask():
+    mask = np.zeros((40, 40), dtype=np.uint8)
+    cv2.rectangle(mask, (5, 5), (30, 20), 255, -1)
+    cv2.rectangle(mask, (12, 10), (18, 14), 0, -1)
+
+    collection = mask_to_geojson(mask, tolerance=0)
+
+    assert collection["type"] == "FeatureCollection"
+    (feature,) = collection["features"]
+    exterior, hole = feature["geometry"]["coordinates"]
+    assert feature["geometry"]["type"] == "Polygon"
+    assert exterior[0] == exterior[-1] and hole[0] == hole[-1]
+    redrawn = np.zeros_like(mask)
+    cv2.fillPoly(redrawn, [np.array(exterior, dtype=np.int32)], 255)
+    cv2.fillPoly(redrawn, [np.array(hole, dtype=np.int32)], 0)
+    # Contours run through the outermost pixels, so only the hole's rim can differ
+    assert np.count_nonzero(redrawn != mask) <= 2 * (7 + 5)
+
+
+def test_geojson_thin_line_becomes_linestring():
+    mask = np.zeros((20, 20), dtype=np.uint8)
+    mask[10, 3:15] = 255
+
+    (feature,) = mask_to_geojson(mask)["features"]
+
+    assert feature["geometry"]["type"] == "LineString"
+
+
+@pytest.mark.parametrize("mask_format", MASK_FORMATS)
+def test_mask_to_json_matches_media_type(mask_format):
+    encoded = encode_mask(MASKS[0], mask_format)
+    payload = mask_to_json(encoded, mask_format)
+
+    if isinstance(encoded, dict):
+        assert payload is encoded
+    else:
+        prefix = f"data:{MASK_MEDIA_TYPES[mask_format]};base64,"
+        assert payload.startswith(prefix)
+        assert base64.b64decode(payload[len(prefix):]) == encoded
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        encode_mask(MASKS[0], "jpeg")
@@ -0,0 +1,85 @@
+"""Prometheus metrics: counters, gauges, histograms and text exposition."""
+import pytest
+
+from app.services.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+pytestmark = pytest.mark.unit
+
+
+def _samples(metric):
+    """Map each rendered sample name (with labels) to its value."""
+    return dict(line.rsplit(" ", 1) for line in metric.render() if not line.startswith("#"))
+
+
+def test_counter_renders_help_type_and_labelled_series():
+    counter = Counter("jobs_total", "Jobs run", ("status",))
+    counter.inc("ok")
+    counter.inc("ok", amount=2)
+    counter.inc("failed")
+
+    lines = counter.render()
+
+    assert lines[:2] == ["# HELP jobs_total Jobs run", "# TYPE jobs_total counter"]
+    assert _samples(counter) == {'jobs_total{status="ok"}': "3", 'jobs_total{status="failed"}': "1"}
+
+
+def test_callback_counter_is_read_at_scrape_time():
+    totals = {"hits": 1}
+    counter = Counter("cache_hits_total", "Cache hits", callback=lambda: [((), totals["hits"])])
+
+    totals["hits"] = 5
+
+    assert _samples(counter) == {"cache_hits_total": "5"}
+
+
+def test_gauge_goes_down_and_keeps_fractions():
+    gauge = Gauge("queue_depth", "Queued jobs")
+    gauge.inc(amount=2.5)
+    gauge.dec()
+
+    assert _samples(gauge) == {"queue_depth": "1.5"}
+
+
+def test_label_values_are_escaped():
+    counter = Counter("requests_total", "Requests", ("path",))
+    counter.inc('a"b\\c\nd')
+
+    assert _samples(counter) == {'requests_total{path="a\\"b\\\\c\\nd"}': "1"}
+
+
+def test_histogram_buckets_are_cumulative_with_sum_and_count():
+    histogram = Histogram("latency_seconds", "Latency", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "model")
+
+    assert _samples(histogram) == {
+        'latency_seconds_bucket{stage="model",le="0.1"}': "2",
+        'latency_seconds_bucket{stage="model",le="1"}': "3",
+        'latency_seconds_bucket{stage="model",le="+Inf"}': "4",
+        'latency_seconds_sum{stage="model"}': "3.65",
+        'latency_seconds_count{stage="model"}': "4",
+    }
+    assert histogram.render()[1] == "# TYPE latency_seconds histogram"
+
+
+def test_histogram_time_observes_even_when_the_block_raises():
+    histogram = Histogram("block_seconds", "Block duration", buckets=(60.0,))
+
+    with pytest.raises(RuntimeError):
+        with histogram.time():
+            raise RuntimeError("boom")
+
+    assert _samples(histogram)["block_seconds_count"] == "1"
+
+
+def test_registry_renders_every_family_and_replaces_by_name():
+    registry = MetricsRegistry()
+    registry.register(Counter("a_total", "First")).inc()
+    registry.register(Counter("b_total", "Stale")).inc()
+    registry.register(Counter("b_total", "Second"))
+
+    text = registry.render()
+
+    assert text.endswith("\n")
+    assert "a_total 1" in text
+    assert "# HELP b_total Second" in text and "Stale" not in text
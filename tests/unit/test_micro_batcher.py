@@ -0,0 +1,102 @@
+"""MicroBatcher: batching, error fan-out and shutdown while requests arrive."""
+import queue
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.services.model_service import MicroBatcher
+
+pytestmark = pytest.mark.unit
+
+
+def _double(batch):
+    return batch * 2
+
+
+def _tensor(value):
+    return np.full((1, 2, 2, 1), value, dtype=np.float32)
+
+
+class _SlowQueue(queue.Queue):
+    """Queue that pauses before accepting a request, widening the submit/stop race window."""
+
+    def put(self, item, *args, **kwargs):
+        if item is not MicroBatcher._STOP:
+            time.sleep(0.001)
+        super().put(item, *args, **kwargs)
+
+
+def test_concurrent_requests_share_a_batch_and_get_their_own_rows():
+    batcher = MicroBatcher(_double, max_batch_size=4, max_wait_ms=200)
+    try:
+        futures = [batcher.submit(_tensor(i)) for i in range(4)]
+        results = [future.result(timeout=5) for future in futures]
+    finally:
+        batcher.stop()
+
+    for i, result in enumerate(results):
+        np.testing.assert_array_equal(result.prediction, _tensor(2 * i))
+        assert result.batch_size == 4
+    assert batcher.get_stats()["batches_run"] == 1
+
+
+def test_inference_errors_reach_every_caller():
+    def fail(batch):
+        raise ValueError("boom")
+
+    batcher = MicroBatcher(fail, max_batch_size=2, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(_tensor(i)) for i in range(2)]
+        for future in futures:
+            with pytest.raises(ValueError, match="boom"):
+                future.result(timeout=5)
+    finally:
+        batcher.stop()
+
+
+def test_submit_after_stop_runs_inline_without_restarting_the_worker():
+    batcher = MicroBatcher(_double, max_batch_size=4, max_wait_ms=1)
+    batcher.stop()
+
+    future = batcher.submit(_tensor(3))
+
+    assert future.done()
+    np.testing.assert_array_equal(future.result().prediction, _tensor(6))
+    batcher.start()
+    assert batcher._thread is None
+
+
+@pytest.mark.parametrize("attempt", range(10))
+def test_every_future_resolves_when_stop_races_submit(attempt):
+    batcher = MicroBatcher(_double, max_batch_size=3, max_wait_ms=2)
+    batcher._queue = _SlowQueue()
+    futures = []
+    futures_lock = threading.Lock()
+    go = threading.Barrier(5)
+
+    def submit_many(offset):
+        go.wait()
+        for i in range(20):
+            future = batcher.submit(_tensor(offset + i))
+            with futures_lock:
+                futures.append((offset + i, future))
+
+    def stop():
+        go.wait()
+        # Land somewhere inside the submit stream
+        time.sleep(0.002 * attempt)
+        batcher.stop()
+
+    threads = [threading.Thread(target=submit_many, args=(k * 1000,)) for k in range(4)]
+    threads.append(threading.Thread(target=stop))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert len(futures) == 80
+    for value, future in futures:
+        np.testing.assert_array_equal(future.result(timeout=2).prediction, _tensor(2 * value))
+    assert batcher._thread is None
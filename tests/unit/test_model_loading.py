@@ -0,0 +1,56 @@
+"""ModelService load modes and the readiness report behind /health/ready."""
+import pytest
+
+from app.services.model_service import ModelNotReadyError, ModelService
+
+pytestmark = pytest.mark.unit
+
+
+def _service(tmp_path, **kwargs):
+    options = dict(model_path=str(tmp_path / "missing.keras"), batching_enabled=False,
+                   inference_batch_sizes=(1,), max_batch_size=1, inference_mode="resize",
+                   eye_crop=False, ready_timeout=120.0)
+    options.update(kwargs)
+    return ModelService(**options)
+
+
+def test_lazy_service_loads_on_first_wait(tmp_path):
+    service = _service(tmp_path, load_mode="lazy")
+
+    assert not service.is_ready
+    assert service.get_readiness() == {
+        "ready": False, "state": "pending", "progress": 0.0, "elapsed_seconds": None, "error": None
+    }
+
+    assert service.wait_until_ready()
+    readiness = service.get_readiness()
+    assert readiness["ready"] and readiness["state"] == "ready" and readiness["progress"] == 1.0
+    assert readiness["elapsed_seconds"] == service.load_time
+
+
+def test_background_service_waits_for_start_loading(tmp_path):
+    service = _service(tmp_path, load_mode="background")
+
+    assert service.load_state == "pending"
+    service.start_loading()
+    service.start_loading()
+
+    assert service.wait_until_ready()
+    assert service.is_ready
+
+
+def test_failed_load_is_reported_and_rejects_predictions(tmp_path):
+    service = _service(tmp_path, load_mode="eager", allow_dummy_fallback=False, ready_timeout=1.0)
+
+    readiness = service.get_readiness()
+    assert readiness["ready"] is False
+    assert readiness["state"] == "failed"
+    assert readiness["error"]
+    assert service.health_check(probe=False)["status"] == "unhealthy"
+    with pytest.raises(ModelNotReadyError):
+        service.predict(b"\x89PNG", inference_mode="resize")
+
+
+def test_unknown_load_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="load mode"):
+        _service(tmp_path, load_mode="sometimes")
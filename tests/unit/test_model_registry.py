@@ -0,0 +1,110 @@
+"""ModelRegistry: model name resolution, on-demand loading and LRU eviction under the memory budget."""
+import importlib
+import os
+
+import pytest
+
+from app.services.model_registry import ModelRegistry, UnknownModelError
+from app.services.model_service import ModelNotReadyError
+
+pytestmark = pytest.mark.unit
+
+# app.services re-exports a registry instance under the module's name
+registry_module = importlib.import_module("app.services.model_registry")
+
+MB = 1024 * 1024
+
+
+class _FakeService:
+    """Stands in for ModelService: records closes and loads instantly."""
+
+    loaded = []
+
+    def __init__(self, model_path, model_name, model_version="latest", memory_bytes=10 * MB, **kwargs):
+        self.model_path = model_path
+        self.model_name = model_name
+        self.model_version = model_version
+        self.memory_bytes = memory_bytes
+        self.is_ready = not model_path.endswith("broken.keras")
+        self.load_error = None if self.is_ready else "bad weights"
+        self.load_time = 0.1
+        self.buffer_pool = self.result_cache = self.single_flight = None
+        self.closed = False
+        _FakeService.loaded.append(self)
+
+    @property
+    def model_key(self):
+        return f"{self.model_name}@{self.model_version}"
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry_module, "ModelService", _FakeService)
+    _FakeService.loaded = []
+    for filename in ("base.keras", "fine@v1.keras", "fine@v2.keras", "other.keras", "broken.keras", "notes.txt"):
+        (tmp_path / filename).write_bytes(b"")
+    default = _FakeService(str(tmp_path / "base.keras"), "base")
+    _FakeService.loaded = []
+    return ModelRegistry(default, memory_budget_mb=25)
+
+
+def test_available_models_lists_keras_files_by_key(registry):
+    assert sorted(registry.available_models()) == [
+        "base@latest", "broken@latest", "fine@v1", "fine@v2", "other@latest"
+    ]
+
+
+@pytest.mark.parametrize("model_name, key", [
+    (None, "base@latest"),
+    ("base", "base@latest"),
+    ("base@latest", "base@latest"),
+    ("fine", "fine@v2"),
+    ("fine@v1", "fine@v1"),
+    ("other", "other@latest"),
+])
+def test_resolve(registry, model_name, key):
+    assert registry.resolve(model_name)[0] == key
+
+
+@pytest.mark.parametrize("model_name", ["missing", "fine@v3", "other@v1"])
+def test_unknown_models_are_rejected(registry, model_name):
+    with pytest.raises(UnknownModelError):
+        registry.get(model_name)
+
+
+def test_default_model_is_served_without_loading(registry):
+    assert registry.get() is registry.default_service
+    assert registry.get("base") is registry.default_service
+    assert _FakeService.loaded == []
+
+
+def test_models_load_once_and_stay_resident(registry):
+    first = registry.get("fine@v1")
+
+    assert registry.get("fine@v1") is first
+    assert os.path.basename(first.model_path) == "fine@v1.keras"
+    assert len(_FakeService.loaded) == 1
+
+
+def test_least_recently_used_model_is_evicted_over_budget(registry):
+    # Budget 25 MB: the default plus one other 10 MB model fit, a second does not
+    fine = registry.get("fine@v1")
+    other = registry.get("other")
+
+    assert fine.closed and not other.closed
+    assert [key for key, _ in registry.resident_services()] == ["base@latest", "other@latest"]
+    assert registry.get_info()["evictions"] == 1
+    assert registry.get_info()["memory_used_bytes"] == 20 * MB
+
+    # The evicted model is loaded again on its next request
+    assert registry.get("fine@v1") is not fine
+
+
+def test_failed_load_is_not_kept(registry):
+    with pytest.raises(ModelNotReadyError, match="bad weights"):
+        registry.get("broken")
+
+    assert [key for key, _ in registry.resident_services()] == ["base@latest"]
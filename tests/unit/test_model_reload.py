@@ -0,0 +1,90 @@
+"""Hot model reload: staged load, validation and atomic swap, keeping the old model on failure."""
+import os
+import time
+
+import numpy as np
+import pytest
+
+from app.services.model_service import ModelNotReadyError, ModelService
+
+pytestmark = pytest.mark.unit
+
+
+def _save_model(path, bias):
+    """Save a minimal model with the service's input and output shapes and a constant output."""
+    tf = pytest.importorskip("tensorflow")
+    inputs = tf.keras.Input((256, 256, 3))
+    outputs = tf.keras.layers.Conv2D(
+        1, 1, activation="sigmoid", kernel_initializer="zeros", bias_initializer=tf.keras.initializers.Constant(bias)
+    )(inputs)
+    tf.keras.Model(inputs, outputs).save(path)
+
+
+def _confidence(service):
+    image = np.full((1, 256, 256, 3), 0.5, dtype=np.float32)
+    return float(service.infer(image, batched=False).prediction.mean())
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    path = str(tmp_path / "reloadable.keras")
+    _save_model(path, bias=-2.0)
+    return path
+
+
+@pytest.fixture
+def service(model_path):
+    service = ModelService(model_path=model_path, batching_enabled=False, inference_batch_sizes=(1,),
+                           max_batch_size=1, inference_mode="resize", eye_crop=False, allow_dummy_fallback=False)
+    assert service.is_ready
+    yield service
+    service.close()
+
+
+def test_reload_swaps_in_the_new_model(service, model_path):
+    before = _confidence(service)
+    _save_model(model_path, bias=2.0)
+
+    status = service.reload(wait=True)
+
+    assert status["state"] == "idle" and status["error"] is None
+    assert status["generation"] == 1 and status["last_reload_time"] > 0
+    assert _confidence(service) > 0.5 > before
+
+
+def test_failed_reload_keeps_serving_the_current_model(service, model_path):
+    before = _confidence(service)
+    with open(model_path, "wb") as model_file:
+        model_file.write(b"not a model")
+
+    status = service.reload(wait=True)
+
+    assert status["state"] == "failed" and status["error"]
+    assert status["generation"] == 0
+    assert service.is_ready
+    assert _confidence(service) == pytest.approx(before)
+
+
+def test_reload_requires_a_loaded_model(model_path):
+    service = ModelService(model_path=model_path, batching_enabled=False, load_mode="lazy")
+
+    with pytest.raises(ModelNotReadyError):
+        service.reload()
+
+
+def test_watcher_reloads_when_the_model_file_changes(service, model_path):
+    service.start_watching(interval=0.05)
+    assert service.get_reload_status()["watching"]
+
+    _save_model(model_path, bias=2.0)
+    # Make sure the signature changes even on filesystems with coarse timestamps
+    os.utime(model_path, (time.time() + 5, time.time() + 5))
+
+    deadline = time.monotonic() + 60.0
+    while service.generation == 0 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    service.stop_watching()
+
+    assert service.generation >= 1
+    assert _confidence(service) > 0.5
+    assert not service.get_reload_status()["watching"]
@@ -0,0 +1,82 @@
+"""OnnxBackend: dynamic-batch ONNX Runtime inference and serving through ModelService."""
+import cv2
+import numpy as np
+import pytest
+
+from app.services.backends import OnnxBackend
+from app.services.model_service import ModelService
+
+pytestmark = pytest.mark.unit
+
+WEIGHTS = np.array([[0.5], [-1.0], [2.0]], dtype=np.float32)
+BIAS = np.array([-0.25], dtype=np.float32)
+
+
+def _reference(batch):
+    return 1.0 / (1.0 + np.exp(-(batch @ WEIGHTS + BIAS)))
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    """A per-pixel logistic model on NHWC input with a dynamic batch dimension."""
+    onnx = pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    helper = onnx.helper
+    graph = helper.make_graph(
+        [
+            helper.make_node("MatMul", ["input", "weights"], ["logits"]),
+            helper.make_node("Add", ["logits", "bias"], ["shifted"]),
+            helper.make_node("Sigmoid", ["shifted"], ["output"]),
+        ],
+        "pixel_logistic",
+        [helper.make_tensor_value_info("input", onnx.TensorProto.FLOAT, ["batch", 256, 256, 3])],
+        [helper.make_tensor_value_info("output", onnx.TensorProto.FLOAT, ["batch", 256, 256, 1])],
+        initializer=[onnx.numpy_helper.from_array(WEIGHTS, "weights"), onnx.numpy_helper.from_array(BIAS, "bias")],
+    )
+    # IR version 8 (opset 17) loads in every onnxruntime release the backend supports
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)], ir_version=8)
+    path = str(tmp_path_factory.mktemp("onnx") / "pixel_logistic.onnx")
+    onnx.save(model, path)
+    return path
+
+
+def test_runs_any_batch_size_without_padding(model_path):
+    backend = OnnxBackend(model_path, num_threads=1)
+    backend.load()
+    backend.warm_up((1, 4))
+
+    assert backend.input_shape == (256, 256, 3)
+    assert not backend.fixed_batch_sizes
+    assert backend.describe()["providers"] == ["CPUExecutionProvider"]
+    for size in (1, 3):
+        batch = np.random.default_rng(size).random((size, 256, 256, 3), dtype=np.float32)
+        output = backend.run(batch)
+        assert output.dtype == np.float32
+        np.testing.assert_allclose(output, _reference(batch), atol=1e-5)
+
+
+def test_service_serves_predictions_from_the_onnx_model(model_path):
+    service = ModelService(inference_backend="onnx", onnx_model_path=model_path, batching_enabled=False,
+                           inference_batch_sizes=(1,), max_batch_size=1, inference_mode="resize",
+                           eye_crop=False, vessel_analytics=False)
+    image = np.zeros((40, 60, 3), dtype=np.uint8)
+    image[:, :30] = (255, 0, 0)  # BGR blue: logit 1.75, vessel
+    image[:, 30:] = (0, 255, 0)  # BGR green: logit -1.25, background
+
+    result = service.predict(cv2.imencode(".png", image)[1].tobytes())
+
+    assert service.served_model_path == model_path
+    assert service.get_model_info()["inference"]["backend"] == "onnx"
+    mask = result["mask"]
+    assert mask.shape == (40, 60)
+    assert mask[:, :25].all() and not mask[:, 35:].any()
+
+
+def test_missing_model_fails_the_service_load(tmp_path):
+    pytest.importorskip("onnxruntime")
+
+    service = ModelService(inference_backend="onnx", onnx_model_path=str(tmp_path / "missing.onnx"),
+                           batching_enabled=False, inference_batch_sizes=(1,), max_batch_size=1)
+
+    assert not service.is_ready
+    assert service.get_readiness()["state"] == "failed"
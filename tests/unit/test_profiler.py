@@ -0,0 +1,70 @@
+"""RequestProfiler: profile capture, retention of the newest runs and busy handling."""
+import os
+import threading
+
+import pytest
+
+from app.services.profiler import ProfilerBusyError, RequestProfiler
+
+pytestmark = pytest.mark.unit
+
+
+def _work(n):
+    return sum(i * i for i in range(n))
+
+
+def test_run_returns_result_and_stores_pstats(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), tf_trace=False)
+
+    result, summary = profiler.run(_work, 1000)
+
+    assert result == _work(1000)
+    assert os.path.isfile(profiler.pstats_path(summary["profile_id"]))
+    assert summary["top_functions"]
+
+
+def test_only_the_newest_profiles_are_kept(tmp_path):
+    unrelated = tmp_path / "notes"
+    unrelated.mkdir()
+    profiler = RequestProfiler(str(tmp_path), tf_trace=False, max_profiles=3)
+
+    ids = [profiler.run(_work, 10)[1]["profile_id"] for _ in range(5)]
+
+    kept = sorted(name for name in os.listdir(tmp_path) if name != "notes")
+    assert kept == sorted(ids[-3:])
+    assert profiler.pstats_path(ids[0]) is None
+    assert profiler.get_stats()["pruned"] == 2
+    assert unrelated.is_dir()
+
+
+def test_zero_keeps_every_profile(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), tf_trace=False, max_profiles=0)
+
+    for _ in range(4):
+        profiler.run(_work, 10)
+
+    assert len(os.listdir(tmp_path)) == 4
+
+
+def test_concurrent_profile_is_rejected(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), tf_trace=False)
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    thread = threading.Thread(target=profiler.run, args=(block,))
+    thread.start()
+    started.wait(5)
+    try:
+        with pytest.raises(ProfilerBusyError):
+            profiler.run(_work, 10)
+    finally:
+        release.set()
+        thread.join()
+
+
+@pytest.mark.parametrize("profile_id", ["", "..", "../etc", ".hidden", "a/b"])
+def test_malformed_ids_are_not_resolved(tmp_path, profile_id):
+    assert RequestProfiler(str(tmp_path), tf_trace=False).pstats_path(profile_id) is None
@@ -0,0 +1,129 @@
+"""ResultCache: LRU byte budget, TTL, defensive copies; request keys that separate settings."""
+import importlib
+
+import numpy as np
+import pytest
+
+from app.services.result_cache import ResultCache, hash_pixels
+
+# app.services.result_cache is also the name of the shared cache instance
+result_cache_module = importlib.import_module("app.services.result_cache")
+
+pytestmark = pytest.mark.unit
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(result_cache_module.time, "monotonic", fake)
+    return fake
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = ResultCache(max_bytes=30, ttl=0)
+    cache.put("a", 1, 10)
+    cache.put("b", 2, 10)
+    cache.put("c", 3, 10)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+
+    cache.put("d", 4, 10)
+
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == [1, 3, 4]
+    assert cache.current_bytes == 30
+    assert cache.evictions == 1
+
+
+def test_replacing_a_key_recharges_its_size():
+    cache = ResultCache(max_bytes=100, ttl=0)
+    cache.put("a", "old", 60)
+    cache.put("a", "new", 20)
+
+    assert cache.current_bytes == 20
+    assert cache.get("a") == "new"
+
+
+def test_values_larger_than_the_budget_are_not_cached():
+    cache = ResultCache(max_bytes=10, ttl=0)
+    cache.put("small", 1, 5)
+    cache.put("huge", 2, 11)
+
+    assert cache.get("huge") is None
+    assert cache.get("small") == 1
+
+
+def test_zero_budget_disables_the_cache():
+    cache = ResultCache(max_bytes=0)
+    cache.put("a", 1, 1)
+
+    assert not cache.enabled
+    assert cache.get("a") is None
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = ResultCache(max_bytes=100, ttl=60)
+    cache.put("a", 1, 10)
+
+    clock.now += 59
+    assert cache.get("a") == 1
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+    assert cache.current_bytes == 0
+
+
+def test_put_and_get_hand_out_copies():
+    cache = ResultCache(max_bytes=100, ttl=0)
+    value = {"vessel_metrics": {"vessel_percentage": 7.5}}
+    cache.put("a", value, 10)
+    value["vessel_metrics"]["vessel_percentage"] = 0.0
+
+    first = cache.get("a")
+    first["vessel_metrics"]["vessel_percentage"] = -1.0
+
+    assert cache.get("a") == {"vessel_metrics": {"vessel_percentage": 7.5}}
+
+
+def test_stats_count_hits_and_misses():
+    cache = ResultCache(max_bytes=100, ttl=0)
+    cache.put("a", 1, 10)
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+
+def test_pixel_hash_depends_on_pixels_shape_and_dtype():
+    image = np.arange(24, dtype=np.uint8).reshape(2, 4, 3)
+
+    assert hash_pixels(image) == hash_pixels(image.copy())
+    assert hash_pixels(image) != hash_pixels(image.reshape(4, 2, 3))
+    assert hash_pixels(image) != hash_pixels(image.astype(np.uint16))
+    changed = image.copy()
+    changed[0, 0, 0] += 1
+    assert hash_pixels(image) != hash_pixels(changed)
+    # Non-contiguous views hash like their contiguous copies
+    assert hash_pixels(image[:, ::2]) == hash_pixels(np.ascontiguousarray(image[:, ::2]))
+
+
+def test_request_keys_separate_eye_crop_with_zero_margin():
+    from app.services.model_service import DecodedImage, ModelService
+
+    service = ModelService(load_mode="lazy", eye_crop_margin=0.0)
+    image = DecodedImage(np.zeros((8, 8, 3), dtype=np.uint8), (8, 8))
+
+    cropped = service._request_key(image, "resize", True, "png", False)
+    uncropped = service._request_key(image, "resize", False, "png", False)
+
+    assert cropped != uncropped
+    assert hash(cropped) != hash(uncropped)
+    assert cropped == service._request_key(image, "resize", True, "png", False)
@@ -0,0 +1,94 @@
+"""SingleFlight: identical concurrent calls share one execution."""
+import threading
+import time
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+pytestmark = pytest.mark.unit
+
+
+def _coalesced_calls(group, fn, count, after=None):
+    """
+    Call ``group.do("key", fn)`` from ``count`` threads while the first call is still running.
+
+    ``fn`` is held until the other ``count - 1`` callers are waiting on it;
+    ``after`` post-processes each caller's result on its own thread. Returns
+    each caller's outcome (result or raised exception) and the number of
+    times ``fn`` ran.
+    """
+    entered, release = threading.Event(), threading.Event()
+    runs = []
+
+    def leader_fn():
+        runs.append(1)
+        entered.set()
+        release.wait(5)
+        return fn()
+
+    outcomes = [None] * count
+
+    def call(i):
+        if i:
+            entered.wait(5)
+        try:
+            outcome = group.do("key", leader_fn)
+            outcomes[i] = after(outcome, i) if after else outcome
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while group.coalesced < count - 1 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=10)
+    return outcomes, len(runs)
+
+
+def test_identical_concurrent_calls_run_once():
+    group = SingleFlight()
+
+    outcomes, runs = _coalesced_calls(group, lambda: {"mask": [1, 2, 3]}, 5)
+
+    assert runs == 1
+    assert all(result == {"mask": [1, 2, 3]} for result, _ in outcomes)
+    assert [shared for _, shared in outcomes].count(False) == 1
+    assert group.get_stats() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+
+def test_each_waiter_gets_its_own_copy():
+    def mutate(outcome, i):
+        result, _ = outcome
+        result["mask"].append(i)
+        return result
+
+    outcomes, _ = _coalesced_calls(SingleFlight(), lambda: {"mask": [1, 2, 3]}, 3, after=mutate)
+
+    assert sorted(result["mask"] for result in outcomes) == [[1, 2, 3, 0], [1, 2, 3, 1], [1, 2, 3, 2]]
+
+
+def test_errors_reach_every_waiter():
+    group = SingleFlight()
+
+    def fail():
+        raise RuntimeError("inference failed")
+
+    outcomes, runs = _coalesced_calls(group, fail, 3)
+
+    assert runs == 1
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert group.get_stats()["in_flight"] == 0
+
+
+def test_finished_calls_and_other_keys_run_again():
+    group = SingleFlight()
+
+    assert group.do("a", lambda: 1) == (1, False)
+    assert group.do("a", lambda: 2) == (2, False)
+    assert group.do("b", lambda: 3) == (3, False)
+    assert group.get_stats() == {"in_flight": 0, "executions": 3, "coalesced": 0}
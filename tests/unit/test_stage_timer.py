@@ -0,0 +1,49 @@
+"""Per-stage timing breakdown: StageTimer and the Server-Timing header."""
+import pytest
+
+from app.services.metrics import STAGE_SECONDS, StageTimer, server_timing_header
+
+pytestmark = pytest.mark.unit
+
+
+def _stage_count(stage, model):
+    for line in STAGE_SECONDS.render():
+        if line.startswith(f'vessel_stage_duration_seconds_count{{stage="{stage}",model="{model}"}}'):
+            return int(line.rsplit(" ", 1)[1])
+    return 0
+
+
+def test_repeated_stages_accumulate_in_first_run_order():
+    timer = StageTimer("unit-test")
+    timer.record("decode", 0.002)
+    timer.record("model", 0.010)
+    timer.record("decode", 0.0005)
+
+    assert timer.milliseconds() == {"decode": 2.5, "model": 10.0}
+
+
+def test_stages_are_observed_in_the_histogram():
+    before = _stage_count("encode", "unit-test-histogram")
+    timer = StageTimer("unit-test-histogram")
+
+    with timer.stage("encode"):
+        pass
+    timer.record("encode", 0.001)
+
+    assert _stage_count("encode", "unit-test-histogram") == before + 2
+
+
+def test_stage_is_recorded_when_the_block_raises():
+    timer = StageTimer("unit-test")
+
+    with pytest.raises(ValueError):
+        with timer.stage("decode"):
+            raise ValueError("bad image")
+
+    assert list(timer.milliseconds()) == ["decode"]
+
+
+def test_server_timing_header():
+    assert server_timing_header({"decode": 1.25, "model": 40.0}, total_ms=45.5) == \
+        "decode;dur=1.250, model;dur=40.000, total;dur=45.500"
+    assert server_timing_header({}) == ""
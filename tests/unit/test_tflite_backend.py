@@ -0,0 +1,86 @@
+"""TFLiteBackend: float16 and int8 exports of a small model against Keras, and batch handling."""
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.services.backends import TFLiteBackend
+
+pytestmark = pytest.mark.unit
+
+EXPORT_SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "utilities" / "export_tflite.py"
+
+
+@pytest.fixture(scope="module")
+def exported(tmp_path_factory):
+    """A small Keras model and its float16 and int8 TFLite exports."""
+    tf = pytest.importorskip("tensorflow")
+    spec = importlib.util.spec_from_file_location("export_tflite", EXPORT_SCRIPT)
+    export_tflite = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(export_tflite)
+
+    tf.keras.utils.set_random_seed(0)
+    inputs = tf.keras.Input((64, 64, 3))
+    x = tf.keras.layers.Conv2D(4, 3, padding="same", activation="relu")(inputs)
+    model = tf.keras.Model(inputs, tf.keras.layers.Conv2D(1, 1, activation="sigmoid")(x))
+
+    directory = tmp_path_factory.mktemp("tflite")
+    export_tflite.export_float16(tf, model, directory / "small_float16.tflite")
+    export_tflite.export_int8(tf, model, directory / "small_int8.tflite", images=[])
+    return model, directory
+
+
+def _batch(size):
+    return np.random.default_rng(size).random((size, 64, 64, 3), dtype=np.float32)
+
+
+def _backend(path):
+    backend = TFLiteBackend(str(path), num_threads=1)
+    backend.load()
+    return backend
+
+
+def test_float16_export_matches_keras(exported):
+    model, directory = exported
+    backend = _backend(directory / "small_float16.tflite")
+    batch = _batch(2)
+
+    output = backend.run(batch)
+
+    assert backend.input_shape == (64, 64, 3)
+    assert output.dtype == np.float32 and output.shape == (2, 64, 64, 1)
+    np.testing.assert_allclose(output, model.predict(batch, verbose=0), atol=1e-2)
+
+
+def test_int8_export_quantizes_at_the_model_boundary(exported):
+    model, directory = exported
+    backend = _backend(directory / "small_int8.tflite")
+    batch = _batch(1)
+
+    output = backend.run(batch)
+
+    assert backend.input_dtype == np.uint8 and backend.output_dtype == np.uint8
+    assert backend.describe()["input_dtype"] == "uint8"
+    assert output.dtype == np.float32
+    np.testing.assert_allclose(output, model.predict(batch, verbose=0), atol=0.05)
+
+
+def test_one_interpreter_per_batch_size(exported):
+    _, directory = exported
+    backend = _backend(directory / "small_float16.tflite")
+
+    backend.warm_up((1, 3))
+
+    assert backend.fixed_batch_sizes
+    assert backend.describe()["batch_sizes"] == [1, 3]
+    assert sorted(backend._interpreters) == [1, 3]
+    np.testing.assert_allclose(backend.run(_batch(3))[1:2], backend.run(_batch(3)[1:2]), atol=1e-6)
+
+
+def test_missing_model_fails_to_load(tmp_path):
+    pytest.importorskip("tensorflow")
+
+    # tf.lite raises ValueError; the standalone runtimes raise RuntimeError
+    with pytest.raises((ValueError, RuntimeError)):
+        _backend(tmp_path / "missing.tflite")
@@ -0,0 +1,60 @@
+"""Tiled inference: tile layout, Hann-window blending and tile size validation."""
+import numpy as np
+import pytest
+
+from app.utils.tiling import blending_window, count_tiles, iter_tile_batches, tile_starts, tiled_predict
+
+pytestmark = pytest.mark.unit
+
+
+def _first_channel(batch):
+    """Stand-in model that "predicts" the red channel, so blending must reproduce it."""
+    return batch[..., :1].copy()
+
+
+@pytest.mark.parametrize("length", [64, 65, 100, 191, 300])
+def test_tiles_cover_every_pixel_and_end_at_the_edge(length):
+    starts = tile_starts(length, 64, 16)
+
+    covered = np.zeros(length, dtype=bool)
+    for start in starts:
+        covered[start:start + 64] = True
+    assert covered.all()
+    assert starts[-1] + 64 == length
+    assert all(later - earlier <= 64 - 16 for earlier, later in zip(starts, starts[1:]))
+
+
+def test_window_peaks_in_the_centre_and_keeps_the_border_weighted():
+    window = blending_window(64)
+
+    assert window.shape == (64, 64) and window.dtype == np.float32
+    assert window[31, 31] == pytest.approx(window.max())
+    assert window.min() >= 1e-3
+    np.testing.assert_allclose(window, window.T)
+
+
+def test_batches_match_count_tiles():
+    image = np.zeros((150, 210, 3), dtype=np.uint8)
+
+    batches = list(iter_tile_batches(image, 64, 16, batch_size=5))
+
+    assert sum(len(origins) for _, origins in batches) == count_tiles(image.shape, 64, 16)
+    assert all(len(batch) == len(origins) <= 5 for batch, origins in batches)
+
+
+@pytest.mark.parametrize("shape", [(150, 210), (64, 64), (40, 90)])
+def test_blending_reproduces_a_consistent_prediction(shape):
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, (*shape, 3), dtype=np.uint8)
+
+    probabilities = tiled_predict(image, _first_channel, tile_size=64, overlap=16, batch_size=3)
+
+    assert probabilities.shape == shape
+    np.testing.assert_allclose(probabilities, image[..., 0] / 255.0, atol=1e-5)
+
+
+def test_service_rejects_tile_size_other_than_the_model_input():
+    from app.services.model_service import ModelService
+
+    with pytest.raises(ValueError, match="TILE_SIZE"):
+        ModelService(load_mode="lazy", tile_size=512)
@@ -0,0 +1,88 @@
+"""Vessel morphology: Guo-Hall thinning against scikit-image and metrics on known shapes."""
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from app.utils.vessel_morphology import calculate_vessel_morphology, skeletonize_mask
+
+pytestmark = pytest.mark.unit
+
+
+def _vessel_mask(height, width, seed, min_width=1):
+    """Random polylines of varying width, like a vessel tree."""
+    rng = np.random.default_rng(seed)
+    mask = np.zeros((height, width), dtype=np.uint8)
+    for _ in range(6):
+        points = np.cumsum(rng.normal(0, 12, (8, 2)), axis=0) + rng.uniform(0, [width, height])
+        cv2.polylines(mask, [points.astype(np.int32)], False, 255, int(rng.integers(min_width, 9)))
+    return mask
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_thinning_matches_scikit_image(seed):
+    thin = pytest.importorskip("skimage.morphology").thin
+    mask = _vessel_mask(120, 160, seed)
+    # Include shapes touching the image border and single-pixel specks
+    mask[0:6, 40:90] = 255
+    mask[100, 5] = 255
+
+    expected = thin(mask > 0)
+
+    np.testing.assert_array_equal(skeletonize_mask(mask) > 0, expected)
+
+
+def test_straight_vessel():
+    mask = np.zeros((40, 140), dtype=np.uint8)
+    cv2.rectangle(mask, (20, 18), (119, 22), 255, -1)
+
+    metrics = calculate_vessel_morphology(mask)
+
+    assert (metrics["end_points"], metrics["branch_points"], metrics["segments"]) == (2, 0, 1)
+    assert metrics["vessel_length"] == pytest.approx(96, abs=4)
+    assert metrics["mean_caliber"] == pytest.approx(5, abs=0.5)
+    assert metrics["mean_tortuosity"] == pytest.approx(1.0, abs=0.01)
+    assert metrics["analysis_scale"] == 1
+
+
+def test_crossing_vessels_form_one_branch_point():
+    mask = np.zeros((101, 101), dtype=np.uint8)
+    mask[48:53, 10:91] = 255
+    mask[10:91, 48:53] = 255
+
+    metrics = calculate_vessel_morphology(mask)
+
+    assert metrics["branch_points"] == 1
+    assert metrics["end_points"] == 4
+    assert metrics["segments"] == 4
+
+
+def test_curved_vessel_is_tortuous():
+    mask = np.zeros((80, 200), dtype=np.uint8)
+    x = np.arange(10, 190)
+    y = (40 + 25 * np.sin(x / 15.0)).astype(np.int32)
+    cv2.polylines(mask, [np.stack([x, y], axis=1)], False, 255, 3)
+
+    metrics = calculate_vessel_morphology(mask)
+
+    assert metrics["branch_points"] == 0
+    assert metrics["mean_tortuosity"] > 1.3
+
+
+def test_empty_and_full_masks_stay_json_serializable():
+    for mask in (np.zeros((32, 32), dtype=np.uint8), np.full((64, 64), 255, dtype=np.uint8)):
+        metrics = calculate_vessel_morphology(mask)
+        json.dumps(metrics, allow_nan=False)
+        assert np.isfinite(metrics["max_caliber"])
+
+
+def test_downscaled_analysis_reports_its_scale():
+    # Vessels must stay wider than the downscale factor to survive it
+    mask = _vessel_mask(400, 600, seed=1, min_width=5)
+
+    full = calculate_vessel_morphology(mask)
+    reduced = calculate_vessel_morphology(mask, max_pixels=60_000)
+
+    assert reduced["analysis_scale"] == 2
+    assert reduced["vessel_length"] == pytest.approx(full["vessel_length"], rel=0.1)